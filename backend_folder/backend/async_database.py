@@ -0,0 +1,115 @@
+"""
+Async data access for the API routes (asyncpg).
+
+Routes `await` the database instead of parking a threadpool thread on
+it. asyncpg prepares every statement server-side on first use and keeps
+it in a per-connection cache, so the fixed hot queries (logins, profile,
+dashboards) are parsed and planned once per pooled connection, not on
+every call.
+
+The psycopg2 pool in database.py stays for the similarity workers,
+schema setup and the CLI scripts.
+"""
+import os
+import json
+import time
+import asyncio
+from contextlib import asynccontextmanager
+import asyncpg
+from fastapi import HTTPException
+from dotenv import load_dotenv
+from metrics import observe_query, observe_pool_wait
+
+load_dotenv()
+
+# --- POOL SETTINGS ---
+ASYNC_POOL_MIN_SIZE = int(os.getenv("DB_ASYNC_POOL_MIN_SIZE", "2"))
+ASYNC_POOL_MAX_SIZE = int(os.getenv("DB_ASYNC_POOL_MAX_SIZE", "20"))
+ASYNC_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+# Prepared statements kept per connection. Set to 0 behind PgBouncer in
+# transaction mode, where a connection's prepared statements can vanish.
+STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "256"))
+
+_pool = None
+_pool_lock = asyncio.Lock()
+
+def _log_query(record):
+    observe_query("asyncpg", record.query, record.elapsed, record.exception is not None)
+
+async def _init_connection(conn):
+    # JSON/JSONB come back as Python objects, like psycopg2 returns them
+    for type_name in ("json", "jsonb"):
+        await conn.set_type_codec(type_name, encoder=json.dumps, decoder=json.loads, schema="pg_catalog")
+    # Every statement's duration goes to /metrics
+    conn.add_query_logger(_log_query)
+
+def _connect_kwargs():
+    return {
+        "database": os.getenv("DB_NAME"),
+        "user": os.getenv("DB_USER"),
+        "password": os.getenv("DB_PASSWORD"),
+        "host": os.getenv("DB_HOST"),
+        "port": os.getenv("DB_PORT"),
+    }
+
+async def open_async_pool():
+    global _pool
+    async with _pool_lock:
+        if _pool is None:
+            _pool = await asyncpg.create_pool(
+                **_connect_kwargs(),
+                min_size=ASYNC_POOL_MIN_SIZE,
+                max_size=ASYNC_POOL_MAX_SIZE,
+                statement_cache_size=STATEMENT_CACHE_SIZE,
+                init=_init_connection,
+            )
+    return _pool
+
+async def close_async_pool():
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+def async_pool_stats():
+    if _pool is None:
+        return {"open": 0, "in_use": 0, "idle": 0}
+    size, idle = _pool.get_size(), _pool.get_idle_size()
+    return {
+        "max_size": _pool.get_max_size(),
+        "open": size,
+        "in_use": size - idle,
+        "idle": idle,
+        "statement_cache_size": STATEMENT_CACHE_SIZE
+    }
+
+async def acquire_connection():
+    """Takes a pooled connection; pair with release_connection(). Raises HTTPException 503/500."""
+    start = time.perf_counter()
+    try:
+        pool = _pool or await open_async_pool()
+        conn = await pool.acquire(timeout=ASYNC_POOL_TIMEOUT)
+        observe_pool_wait("async", time.perf_counter() - start)
+        return conn
+    except asyncio.TimeoutError:
+        print(f"Async database pool exhausted after {ASYNC_POOL_TIMEOUT}s")
+        raise HTTPException(status_code=503, detail="Database busy, please retry")
+    except Exception as e:
+        print(f"Database connection failed: {e}")
+        raise HTTPException(status_code=500, detail="Database connection failed")
+
+async def release_connection(conn):
+    await _pool.release(conn)
+
+async def open_listener_connection():
+    """A dedicated connection outside the pool, for LISTEN (it stays open for the app's lifetime)."""
+    return await asyncpg.connect(**_connect_kwargs())
+
+@asynccontextmanager
+async def async_db_connection():
+    """Borrows a pooled asyncpg connection for the duration of the block."""
+    conn = await acquire_connection()
+    try:
+        yield conn
+    finally:
+        await release_connection(conn)
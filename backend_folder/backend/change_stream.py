@@ -0,0 +1,173 @@
+"""
+Live dashboard updates over Server-Sent Events.
+
+Triggers on submitted_projects, project_phases and teams NOTIFY on
+CHANGE_EVENTS_CHANNEL (see schema.py) with the list of affected users.
+One LISTEN connection per process receives them and fans each event out
+to that user's open /events/{email} streams, so dashboards refetch only
+when something of theirs actually changed instead of polling.
+
+Events carry ids and the new status, not the data itself. A "resync"
+event means some events may have been missed (listener reconnected or
+the client fell behind) and the client should refetch everything.
+"""
+import os
+import json
+import asyncio
+from collections import defaultdict
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+from async_database import open_listener_connection
+from schema import CHANGE_EVENTS_CHANNEL
+
+router = APIRouter()
+
+# --- SETTINGS ---
+# Events buffered per open stream before the client is told to resync
+QUEUE_SIZE = int(os.getenv("CHANGE_STREAM_QUEUE_SIZE", "100"))
+# SSE comment sent on idle streams (keeps proxies from closing them); also the listener health-check interval
+KEEPALIVE_SECONDS = float(os.getenv("CHANGE_STREAM_KEEPALIVE_SECONDS", "15"))
+RECONNECT_SECONDS = float(os.getenv("CHANGE_STREAM_RECONNECT_SECONDS", "2"))
+
+_subscribers = defaultdict(set)  # email -> {asyncio.Queue}
+_listener_task = None
+_stats = {"connected": False, "reconnects": 0, "events": 0, "delivered": 0, "resyncs": 0}
+
+# --------------------------
+# FAN-OUT
+# --------------------------
+
+def _deliver(queue, event):
+    try:
+        queue.put_nowait(event)
+    except asyncio.QueueFull:
+        # Slow client: replace its backlog with a single resync
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait({"type": "resync"})
+        _stats["resyncs"] += 1
+
+def _broadcast(event):
+    for queues in _subscribers.values():
+        for queue in queues:
+            _deliver(queue, event)
+
+def _on_notify(conn, pid, channel, payload):
+    _stats["events"] += 1
+    try:
+        event = json.loads(payload)
+    except ValueError:
+        print(f"⚠️ Ignoring malformed change event: {payload[:200]}")
+        return
+
+    recipients = event.pop("recipients", None) or []
+    event["type"] = "change"
+    for email in recipients:
+        for queue in _subscribers.get(email, ()):
+            _deliver(queue, event)
+            _stats["delivered"] += 1
+
+def subscribe(email):
+    queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    _subscribers[email].add(queue)
+    return queue
+
+def unsubscribe(email, queue):
+    queues = _subscribers.get(email)
+    if queues is not None:
+        queues.discard(queue)
+        if not queues:
+            del _subscribers[email]
+
+# --------------------------
+# LISTENER
+# --------------------------
+
+async def _listen_forever():
+    """Keeps one LISTEN connection open, reconnecting (and telling clients to resync) after failures."""
+    first = True
+    while True:
+        conn = None
+        try:
+            conn = await open_listener_connection()
+            closed = asyncio.Event()
+            conn.add_termination_listener(lambda _: closed.set())
+            await conn.add_listener(CHANGE_EVENTS_CHANNEL, _on_notify)
+            _stats["connected"] = True
+            print(f"📡 Listening for dashboard changes on '{CHANGE_EVENTS_CHANNEL}'.")
+            if not first:
+                _broadcast({"type": "resync"})
+            first = False
+
+            # A silently dropped connection never terminates; probe it while idle
+            while not closed.is_set():
+                try:
+                    await asyncio.wait_for(closed.wait(), timeout=KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    await conn.fetchval("SELECT 1", timeout=KEEPALIVE_SECONDS)
+            print("⚠️ Change stream listener connection closed.")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"⚠️ Change stream listener lost: {e}")
+        finally:
+            _stats["connected"] = False
+            if conn is not None and not conn.is_closed():
+                await conn.close()
+
+        _stats["reconnects"] += 1
+        await asyncio.sleep(RECONNECT_SECONDS)
+
+def start_change_stream():
+    global _listener_task
+    if _listener_task is None:
+        _listener_task = asyncio.get_running_loop().create_task(_listen_forever())
+
+async def stop_change_stream():
+    global _listener_task
+    if _listener_task is not None:
+        _listener_task.cancel()
+        try:
+            await _listener_task
+        except asyncio.CancelledError:
+            pass
+        _listener_task = None
+
+def change_stream_stats():
+    return {
+        **_stats,
+        "users": len(_subscribers),
+        "streams": sum(len(q) for q in _subscribers.values())
+    }
+
+# --------------------------
+# API ENDPOINT
+# --------------------------
+
+def _sse(event):
+    return f"data: {json.dumps(event)}\n\n"
+
+@router.get("/events/{email}")
+async def stream_events(email: str, request: Request):
+    """Server-Sent Events for one user's dashboard (use with EventSource)."""
+
+    async def stream():
+        # Subscribed inside the generator: a response that is never streamed
+        # leaves no queue behind collecting events
+        queue = subscribe(email)
+        try:
+            yield _sse({"type": "ready"})
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keepalive\n\n"
+                    continue
+                yield _sse(event)
+        finally:
+            unsubscribe(email, queue)
+
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
@@ -1,81 +1,222 @@
 import os
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
 import psycopg2
+from psycopg2 import extensions
 from psycopg2.extras import RealDictCursor
 from fastapi import HTTPException
 from dotenv import load_dotenv
+from schema import apply_schema
+from metrics import observe_query, observe_pool_wait
 
 load_dotenv()
 
-def get_db_connection():
-    try:
-        conn = psycopg2.connect(
-            dbname=os.getenv("DB_NAME"),
-            user=os.getenv("DB_USER"),
-            password=os.getenv("DB_PASSWORD"),
-            client_encoding='UTF8',
-            host=os.getenv("DB_HOST"),
-            port=os.getenv("DB_PORT"),
-            cursor_factory=RealDictCursor
-        )
+# --- POOL SETTINGS ---
+POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+# Connections idle longer than this are pinged before being handed out
+POOL_CHECK_AFTER = float(os.getenv("DB_POOL_CHECK_AFTER", "30"))
+
+class TimedCursor(RealDictCursor):
+    """RealDictCursor that reports every statement's duration to /metrics."""
+
+    def execute(self, query, vars=None):
+        start = time.perf_counter()
+        failed = False
+        try:
+            return super().execute(query, vars)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            observe_query("psycopg2", query, time.perf_counter() - start, failed)
+
+def _connect():
+    return psycopg2.connect(
+        dbname=os.getenv("DB_NAME"),
+        user=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASSWORD"),
+        client_encoding='UTF8',
+        host=os.getenv("DB_HOST"),
+        port=os.getenv("DB_PORT"),
+        cursor_factory=TimedCursor
+    )
+
+class PoolTimeout(Exception):
+    pass
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of psycopg2 connections."""
+
+    def __init__(self, min_size, max_size, timeout, check_after):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check_after = check_after
+
+        self._cond = threading.Condition()
+        self._idle = deque()       # (conn, returned_at)
+        self._open = 0             # idle + checked out
+        self._in_use = 0
+        self._stats = {"checkouts": 0, "waits": 0, "timeouts": 0, "created": 0, "discarded": 0}
+
+        for _ in range(min_size):
+            self._idle.append((_connect(), time.monotonic()))
+            self._open += 1
+            self._stats["created"] += 1
+
+    def _is_healthy(self, conn, returned_at):
+        if conn.closed:
+            return False
+        if time.monotonic() - returned_at < self.check_after:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _drop(self, conn):
+        """Forgets a checked-out slot (broken connection or failed connect)."""
+        with self._cond:
+            self._open -= 1
+            self._in_use -= 1
+            self._stats["discarded"] += 1
+            self._cond.notify()
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def getconn(self):
+        start = time.perf_counter()
+        conn = self._getconn()
+        observe_pool_wait("sync", time.perf_counter() - start)
         return conn
+
+    def _getconn(self):
+        deadline = time.monotonic() + self.timeout
+        waited = False
+
+        while True:
+            conn, returned_at = None, None
+
+            # 1. Reserve a slot: an idle connection, or room to open a new one
+            with self._cond:
+                while not self._idle and self._open >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        raise PoolTimeout(f"No database connection available after {self.timeout}s")
+                    waited = True
+                    self._cond.wait(remaining)
+
+                if self._idle:
+                    conn, returned_at = self._idle.pop() # Most recently used first
+                else:
+                    self._open += 1
+                self._in_use += 1
+
+            # 2. Connect / health-check outside the lock so other threads aren't blocked
+            if conn is None:
+                try:
+                    conn = _connect()
+                except Exception:
+                    self._drop(None)
+                    raise
+                with self._cond:
+                    self._stats["created"] += 1
+            elif not self._is_healthy(conn, returned_at):
+                self._drop(conn)
+                continue
+
+            with self._cond:
+                self._stats["checkouts"] += 1
+                if waited:
+                    self._stats["waits"] += 1
+            return conn
+
+    def putconn(self, conn):
+        try:
+            # Never hand out a connection with a half-finished transaction
+            if not conn.closed and conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+        except Exception:
+            pass
+
+        if conn.closed:
+            self._drop(conn)
+            return
+
+        with self._cond:
+            self._in_use -= 1
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def closeall(self):
+        with self._cond:
+            while self._idle:
+                conn, _ = self._idle.pop()
+                self._open -= 1
+                conn.close()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "max_size": self.max_size,
+                "open": self._open,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "utilization": round(self._in_use / self.max_size, 3) if self.max_size else 0,
+                **self._stats
+            }
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(POOL_MIN_SIZE, POOL_MAX_SIZE, POOL_TIMEOUT, POOL_CHECK_AFTER)
+    return _pool
+
+def pool_stats():
+    return get_pool().stats() if _pool else {"open": 0, "in_use": 0, "idle": 0}
+
+def close_pool():
+    if _pool:
+        _pool.closeall()
+
+@contextmanager
+def db_connection():
+    """Borrows a pooled connection and always gives it back (rolled back if uncommitted)."""
+    try:
+        pool = get_pool()
+        conn = pool.getconn()
+    except PoolTimeout as e:
+        print(f"Database pool exhausted: {e}")
+        raise HTTPException(status_code=503, detail="Database busy, please retry")
     except Exception as e:
         print(f"Database connection failed: {e}")
         raise HTTPException(status_code=500, detail="Database connection failed")
 
+    try:
+        yield conn
+    finally:
+        pool.putconn(conn)
+
 def init_db():
-    """Creates tables if they don't exist."""
+    """Creates / upgrades tables, indexes and triggers (see schema.py)."""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # 1. Students Table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS students (
-                id SERIAL PRIMARY KEY,
-                name TEXT NOT NULL,
-                usn TEXT UNIQUE NOT NULL,
-                year INTEGER NOT NULL,
-                sem INTEGER NOT NULL,
-                dept TEXT NOT NULL,
-                email TEXT UNIQUE NOT NULL,
-                password TEXT NOT NULL
-            )
-        ''')
-        
-        # 2. Teachers Table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS teachers (
-                id SERIAL PRIMARY KEY,
-                name TEXT NOT NULL,
-                dept TEXT NOT NULL,
-                email TEXT UNIQUE NOT NULL,
-                password TEXT NOT NULL
-            )
-        ''')
-
-        # 3. Teams Table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS teams (
-                team_id SERIAL PRIMARY KEY,
-                team_name TEXT UNIQUE NOT NULL,
-                team_size INTEGER NOT NULL,
-                team_members JSONB NOT NULL
-            )
-        ''')
-
-        # 4. Submitted Projects Table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS submitted_projects (
-                project_id SERIAL PRIMARY KEY,
-                team_id INTEGER REFERENCES teams(team_id),
-                project_title TEXT NOT NULL,
-                project_synopsis TEXT NOT NULL,
-                status TEXT DEFAULT 'not approved'
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        with db_connection() as conn:
+            apply_schema(conn)
         print("Database initialized.")
     except Exception as e:
         print(f"Initialization error: {e}")
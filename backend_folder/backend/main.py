@@ -1,14 +1,24 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+import metrics
 from fastapi.middleware.cors import CORSMiddleware
-from database import init_db
+from database import init_db, pool_stats, close_pool
+from async_database import open_async_pool, close_async_pool, async_pool_stats
+from similarity_service import start_warm_up, readiness, shut_down as shut_down_similarity
+from similarity_jobs import start_workers, stop_workers
+from change_stream import start_change_stream, stop_change_stream, change_stream_stats
 
 # Import routers
 from auth import router as auth_router
+from onboarding import router as onboarding_router
 from users_data import router as users_router
+from mentored_projects import router as mentored_projects_router
 from teams import router as teams_router
 from projects import router as projects_router
 from project_phases import router as phases_router
 from project_status import router as status_router
+from similarity_jobs import router as similarity_jobs_router
+from screening import router as screening_router
+from change_stream import router as change_stream_router
 
 app = FastAPI()
 
@@ -23,17 +33,63 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],    # Allow all methods (POST, GET, etc.)
     allow_headers=["*"],
+    # Paginated lists return the next page cursor in a header
+    expose_headers=["X-Next-Cursor", "Link"],
 )
 
+# Request latency histograms + /metrics collector
+metrics.install(app)
+
 # --- ROUTES ---
 app.include_router(auth_router)
+app.include_router(onboarding_router)
 app.include_router(users_router)
+app.include_router(mentored_projects_router)
 app.include_router(teams_router)
 app.include_router(projects_router)
 app.include_router(phases_router)
 app.include_router(status_router)
+app.include_router(similarity_jobs_router)
+app.include_router(screening_router)
+app.include_router(change_stream_router)
 
 # --- STARTUP ---
 @app.on_event("startup")
-def on_startup():
+async def on_startup():
     init_db()
+    # Routes use the asyncpg pool; workers and scripts keep the psycopg2 one
+    await open_async_pool()
+    # Load the embedding model + FAISS index once, in the background
+    start_warm_up()
+    # Background similarity checks (resumes jobs queued before a restart)
+    start_workers()
+    # One LISTEN connection feeds every /events stream
+    start_change_stream()
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await stop_change_stream()
+    stop_workers()
+    shut_down_similarity()
+    await close_async_pool()
+    close_pool()
+
+# --- HEALTH ---
+@app.get("/ready")
+def readiness_check(response: Response):
+    """Reports whether the similarity model and index are warm."""
+    status = readiness()
+    if not status["ready"]:
+        response.status_code = 503
+    return status
+
+@app.get("/db-pool")
+def db_pool_status():
+    """Connection pool utilization (open / in use / idle / waits / timeouts) and the change listener."""
+    return {"sync": pool_stats(), "async": async_pool_stats(), "listener": change_stream_stats()}
+
+@app.get("/metrics")
+def metrics_endpoint():
+    """Prometheus metrics: per-route latency, pipeline stages, DB timings, LLM outcomes, index size."""
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
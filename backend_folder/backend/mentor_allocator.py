@@ -0,0 +1,132 @@
+"""
+Mentor allocation.
+
+Picks the least-loaded teacher in a department that is still under
+MAX_PROJECTS_PER_MENTOR. Concurrent requests skip rows another
+transaction has locked instead of queueing on them, and the capacity
+check is part of the UPDATE itself, so a teacher can never be
+over-allocated.
+"""
+import os
+import time
+import heapq
+import random
+from psycopg2.extras import execute_values
+
+MAX_PROJECTS_PER_MENTOR = int(os.getenv("MAX_PROJECTS_PER_MENTOR", "5"))
+# How long a request keeps retrying while every eligible mentor is mid-allocation
+ALLOCATE_MAX_WAIT = float(os.getenv("MENTOR_ALLOCATE_MAX_WAIT", "5"))
+
+class NoMentorAvailable(Exception):
+    pass
+
+# Served by idx_teachers_dept_load (dept, total_projects, teacher_id)
+ALLOCATE_QUERY = """
+    UPDATE teachers
+    SET total_projects = total_projects + 1
+    WHERE teacher_id = (
+        SELECT teacher_id FROM teachers
+        WHERE dept = %(dept)s AND total_projects < %(cap)s
+        ORDER BY total_projects, teacher_id
+        LIMIT 1
+        FOR UPDATE SKIP LOCKED
+    )
+    AND total_projects < %(cap)s
+    RETURNING teacher_id, name, total_projects
+"""
+
+_HAS_CAPACITY_QUERY = """
+    SELECT EXISTS (
+        SELECT 1 FROM teachers WHERE dept = %(dept)s AND total_projects < %(cap)s
+    ) AS has_capacity
+"""
+
+def allocate_mentor(cursor, dept, submitted_project_id=None, cap=None):
+    """
+    Reserves one mentor slot inside the caller's transaction and, if given,
+    assigns the mentor to the project. Returns the teacher row.
+    Raises NoMentorAvailable when every teacher in `dept` is at capacity.
+    """
+    params = {"dept": dept, "cap": MAX_PROJECTS_PER_MENTOR if cap is None else cap}
+    deadline = time.monotonic() + ALLOCATE_MAX_WAIT
+    attempt = 0
+
+    while True:
+        # 1. Take the least-loaded teacher nobody else is holding
+        cursor.execute(ALLOCATE_QUERY, params)
+        mentor = cursor.fetchone()
+        if mentor:
+            break
+
+        # 2. Nothing free: either the department is full, or every eligible
+        #    teacher is held by an in-flight request. Only the first is final.
+        #    (No blocking FOR UPDATE here: rows that fail the recheck after a
+        #    wait stay locked, and two waiters can deadlock on each other.)
+        cursor.execute(_HAS_CAPACITY_QUERY, params)
+        if not cursor.fetchone()['has_capacity']:
+            raise NoMentorAvailable(f"No mentor available in {dept}.")
+        if time.monotonic() >= deadline:
+            raise NoMentorAvailable(f"All mentors in {dept} are busy, please retry.")
+
+        time.sleep(random.uniform(0, min(0.5, 0.01 * 2 ** attempt)))
+        attempt += 1
+
+    if submitted_project_id is not None:
+        cursor.execute("UPDATE submitted_projects SET mentor_id = %s WHERE submitted_project_id = %s",
+                       (mentor['teacher_id'], submitted_project_id))
+    return mentor
+
+def allocate_mentors(cursor, projects, cap=None):
+    """
+    Batch allocation for bulk imports. `projects` is [(submitted_project_id, dept)].
+    Locks the eligible teachers of every involved department once (in id
+    order, so concurrent batches cannot deadlock), spreads projects
+    least-loaded-first, and writes counters and assignments in two
+    statements. Returns {submitted_project_id: teacher_id or None}.
+    """
+    cap = MAX_PROJECTS_PER_MENTOR if cap is None else cap
+    depts = sorted({dept for _, dept in projects})
+    if not depts:
+        return {}
+
+    # 1. Lock candidate mentors
+    cursor.execute("""
+        SELECT teacher_id, dept, total_projects
+        FROM teachers
+        WHERE dept = ANY(%s) AND total_projects < %s
+        ORDER BY teacher_id
+        FOR UPDATE
+    """, (depts, cap))
+    heaps = {dept: [] for dept in depts}
+    for row in cursor.fetchall():
+        heaps[row['dept']].append((row['total_projects'], row['teacher_id']))
+    for heap in heaps.values():
+        heapq.heapify(heap)
+
+    # 2. Water-fill: each project goes to the currently least-loaded mentor
+    assignments = {}
+    added = {}
+    for project_id, dept in projects:
+        heap = heaps[dept]
+        if not heap:
+            assignments[project_id] = None
+            continue
+        load, teacher_id = heapq.heappop(heap)
+        assignments[project_id] = teacher_id
+        added[teacher_id] = added.get(teacher_id, 0) + 1
+        if load + 1 < cap:
+            heapq.heappush(heap, (load + 1, teacher_id))
+
+    # 3. Apply counters and assignments set-based
+    if added:
+        execute_values(cursor, """
+            UPDATE teachers t SET total_projects = t.total_projects + v.n
+            FROM (VALUES %s) AS v(teacher_id, n)
+            WHERE t.teacher_id = v.teacher_id
+        """, list(added.items()))
+        execute_values(cursor, """
+            UPDATE submitted_projects sp SET mentor_id = v.teacher_id
+            FROM (VALUES %s) AS v(submitted_project_id, teacher_id)
+            WHERE sp.submitted_project_id = v.submitted_project_id
+        """, [(pid, tid) for pid, tid in assignments.items() if tid is not None])
+    return assignments
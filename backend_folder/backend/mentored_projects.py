@@ -0,0 +1,117 @@
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from async_database import async_db_connection
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, select_fields, set_next_cursor
+
+router = APIRouter()
+
+# Public field name -> SQL expression over submitted_projects sp / teams t / project_phases pp
+MENTORED_FIELDS = {
+    "submitted_project_id": "sp.submitted_project_id",
+    "project_title": "sp.project_title",
+    "status": "sp.status",
+    "similarity_score": "sp.similarity_score",
+    "similar_projects_id": "sp.similar_projects_id",
+    "similar_project_titles": "sp.similar_project_titles",
+    "project_synopsis": "sp.project_synopsis",
+    "team_details": """jsonb_build_object(
+        'team_id', t.team_id,
+        'team_name', t.team_name,
+        'team_size', t.team_size,
+        'team_members', t.team_members
+    )""",
+    # Phases only exist for approved projects
+    "project_phases": """CASE WHEN sp.status = 'approved' THEN jsonb_build_object(
+        'phase_id', pp.phase_id,
+        'phase1', jsonb_build_object('marks', COALESCE(pp.phase1_marks, 0), 'remarks', pp.phase1_remarks),
+        'phase2', jsonb_build_object('marks', COALESCE(pp.phase2_marks, 0), 'remarks', pp.phase2_remarks),
+        'phase3', jsonb_build_object('marks', COALESCE(pp.phase3_marks, 0), 'remarks', pp.phase3_remarks)
+    ) END""",
+}
+# What the dashboard table needs; synopsis and match lists are opt-in via ?fields=
+DEFAULT_LIST_FIELDS = ["submitted_project_id", "project_title", "status", "similarity_score", "team_details", "project_phases"]
+
+# The raw LLM report is only served by the detail endpoint
+DETAIL_FIELDS = {**MENTORED_FIELDS, "similarity_description": "sp.similarity_description"}
+
+# Keyset page over idx_submitted_projects_mentor_page; $3 = optional status list
+MENTORED_PAGE_QUERY = """
+    SELECT {columns}
+    FROM submitted_projects sp
+    JOIN teams t ON t.team_id = sp.team_id
+    LEFT JOIN project_phases pp ON pp.submitted_project_id = sp.submitted_project_id
+    WHERE sp.mentor_id = $1
+      AND sp.submitted_project_id > $2
+      AND ($3::text[] IS NULL OR sp.status = ANY($3::text[]))
+    ORDER BY sp.submitted_project_id
+    LIMIT $4
+"""
+
+MENTORED_DETAIL_QUERY = """
+    SELECT {columns}
+    FROM submitted_projects sp
+    JOIN teachers te ON te.teacher_id = sp.mentor_id
+    JOIN teams t ON t.team_id = sp.team_id
+    LEFT JOIN project_phases pp ON pp.submitted_project_id = sp.submitted_project_id
+    WHERE sp.submitted_project_id = $1 AND te.email = $2
+"""
+
+def _status_filter(status):
+    if not status:
+        return None
+    return [s.strip().lower() for s in status.split(",") if s.strip()] or None
+
+@router.get("/mentors/{email}/projects")
+async def get_mentored_projects(
+    email: str,
+    request: Request,
+    response: Response,
+    status: Optional[str] = Query(None, description="Comma-separated statuses, e.g. pending,approved"),
+    after: Optional[int] = Query(None, description="submitted_project_id of the last row already received"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = Query(None, description=f"Comma-separated subset of {','.join(MENTORED_FIELDS)}")
+):
+    """One keyset page of a mentor's projects; the next cursor is in X-Next-Cursor."""
+    _, columns = select_fields(fields, MENTORED_FIELDS, required=["submitted_project_id"], default=DEFAULT_LIST_FIELDS)
+
+    async with async_db_connection() as conn:
+        try:
+            # 1. Resolve the mentor
+            teacher_id = await conn.fetchval("SELECT teacher_id FROM teachers WHERE email = $1", email)
+            if teacher_id is None:
+                raise HTTPException(status_code=404, detail="Mentor not found")
+
+            # 2. One extra row tells us whether another page exists
+            rows = await conn.fetch(
+                MENTORED_PAGE_QUERY.format(columns=columns),
+                teacher_id, after if after is not None else -1, _status_filter(status), limit + 1
+            )
+        except HTTPException:
+            raise
+        except Exception as e:
+            print(f"Error in get_mentored_projects: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+    page = [dict(r) for r in rows[:limit]]
+    set_next_cursor(response, request, page[-1]['submitted_project_id'] if len(rows) > limit else None)
+    return page
+
+@router.get("/mentors/{email}/projects/{submitted_project_id}")
+async def get_mentored_project(
+    email: str,
+    submitted_project_id: int,
+    fields: Optional[str] = Query(None, description=f"Comma-separated subset of {','.join(DETAIL_FIELDS)}")
+):
+    """Everything about one mentored project, including the similarity report."""
+    _, columns = select_fields(fields, DETAIL_FIELDS, required=["submitted_project_id"])
+
+    async with async_db_connection() as conn:
+        try:
+            row = await conn.fetchrow(MENTORED_DETAIL_QUERY.format(columns=columns), submitted_project_id, email)
+        except Exception as e:
+            print(f"Error in get_mentored_project: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+    if not row:
+        raise HTTPException(status_code=404, detail="Project not found for this mentor")
+    return dict(row)
@@ -0,0 +1,209 @@
+"""
+Prometheus metrics for the API (GET /metrics).
+
+Hot paths only record into in-process histograms: a perf_counter pair
+and a labelled observe. Numbers that are already kept elsewhere (pool
+stats, LLM outcomes, index size, cache hit rates) are read once per
+scrape by a collector instead of being counted twice.
+
+Metrics are per process; with several uvicorn workers, scrape each one.
+"""
+import re
+import time
+from functools import lru_cache
+from contextlib import contextmanager
+from prometheus_client import Histogram, Counter, REGISTRY, CONTENT_TYPE_LATEST, generate_latest
+from prometheus_client.core import GaugeMetricFamily, CounterMetricFamily
+
+# 1ms .. 60s: covers indexed lookups through LLM calls
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Time until the response headers were sent, per route",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS
+)
+STAGE_LATENCY = Histogram(
+    "stage_duration_seconds", "Time spent in one stage of a request or similarity check",
+    ["stage"], buckets=LATENCY_BUCKETS
+)
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds", "Statement execution time, by driver and statement shape",
+    ["driver", "query"], buckets=LATENCY_BUCKETS
+)
+DB_QUERY_ERRORS = Counter(
+    "db_query_errors_total", "Statements that raised, by driver and statement shape",
+    ["driver", "query"]
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_acquire_seconds", "Time to get a connection from a pool (includes connect/health check)",
+    ["pool"], buckets=LATENCY_BUCKETS
+)
+
+# --------------------------
+# RECORDING
+# --------------------------
+
+def observe_stage(stage, seconds):
+    STAGE_LATENCY.labels(stage).observe(seconds)
+
+@contextmanager
+def stage_timer(stage):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_LATENCY.labels(stage).observe(time.perf_counter() - start)
+
+_DML = {"select", "insert", "update", "delete", "with", "copy"}
+_TARGET = re.compile(r"\b(?:FROM|INTO|UPDATE|COPY)\s+([a-z_][a-z0-9_]*)", re.IGNORECASE)
+
+@lru_cache(maxsize=1024)
+def query_label(sql):
+    """'select students', 'update submitted_projects', ... - bounded by the schema, not by parameters."""
+    words = sql.split(None, 1)
+    if not words:
+        return "empty"
+    verb = words[0].lower()
+    target = _TARGET.search(sql) if verb in _DML else None
+    return f"{verb} {target.group(1).lower()}" if target else verb
+
+def observe_query(driver, sql, seconds, failed=False):
+    if isinstance(sql, bytes):
+        sql = sql.decode("utf-8", "replace")
+    label = query_label(sql)
+    DB_QUERY_LATENCY.labels(driver, label).observe(seconds)
+    if failed:
+        DB_QUERY_ERRORS.labels(driver, label).inc()
+
+def observe_pool_wait(pool, seconds):
+    DB_POOL_WAIT.labels(pool).observe(seconds)
+
+# --------------------------
+# REQUEST MIDDLEWARE
+# --------------------------
+
+class MetricsMiddleware:
+    """Plain ASGI middleware (no body buffering). Routes are labelled by template, e.g. /user/{email}."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        recorded = False
+
+        def record(status):
+            nonlocal recorded
+            recorded = True
+            route = scope.get("route")
+            REQUEST_LATENCY.labels(
+                scope["method"], getattr(route, "path", "unmatched"), str(status)
+            ).observe(time.perf_counter() - start)
+
+        async def send_and_record(message):
+            # Streams (NDJSON export, SSE) are measured to their first byte
+            if message["type"] == "http.response.start" and not recorded:
+                record(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_and_record)
+        except Exception:
+            if not recorded:
+                record(500)
+            raise
+
+# --------------------------
+# SCRAPE-TIME COLLECTOR
+# --------------------------
+
+class _SnapshotCollector:
+    """Turns the existing stats dicts into gauges/counters when /metrics is scraped."""
+
+    def collect(self):
+        from database import pool_stats
+        from async_database import async_pool_stats
+        from change_stream import change_stream_stats
+        from similarity_service import telemetry_snapshot
+
+        # 1. Connection pools
+        sync = pool_stats()
+        in_use = GaugeMetricFamily("db_pool_connections", "Pool connections by state", labels=["pool", "state"])
+        for pool, stats in (("sync", sync), ("async", async_pool_stats())):
+            for state in ("in_use", "idle"):
+                in_use.add_metric([pool, state], stats.get(state, 0))
+        yield in_use
+        for key in ("waits", "timeouts", "created", "discarded"):
+            family = CounterMetricFamily(f"db_pool_{key}", f"Sync pool {key}", labels=["pool"])
+            family.add_metric(["sync"], sync.get(key, 0))
+            yield family
+
+        # 2. Dashboard change stream
+        listener = change_stream_stats()
+        yield GaugeMetricFamily("change_stream_connected", "LISTEN connection is up", value=int(listener["connected"]))
+        yield GaugeMetricFamily("change_stream_subscribers", "Open /events streams", value=listener["streams"])
+        events = CounterMetricFamily("change_stream_events", "NOTIFY events received")
+        events.add_metric([], listener["events"])
+        yield events
+
+        # 3. Similarity engine: index size/load time, caches, LLM outcomes
+        snapshot = telemetry_snapshot()
+        yield GaugeMetricFamily("similarity_engine_ready", "Model and index are loaded", value=int(snapshot["ready"]))
+        if snapshot["load_seconds"] is not None:
+            yield GaugeMetricFamily("similarity_index_load_seconds", "Warm-up time (model + index)", value=snapshot["load_seconds"])
+
+        index = snapshot["index"]
+        if index:
+            vectors = GaugeMetricFamily("similarity_index_vectors", "Vectors by segment", labels=["segment"])
+            vectors.add_metric(["total"], index["vectors"])
+            vectors.add_metric(["delta"], index["delta"])
+            vectors.add_metric(["tombstones"], index["tombstones"])
+            yield vectors
+            if index["embedding_cache"]:
+                yield from _cache_metrics("embedding", index["embedding_cache"])
+
+        judge = snapshot["judge"]
+        if judge:
+            outcomes = CounterMetricFamily("llm_judge_calls", "LLM verdict requests by outcome", labels=["outcome"])
+            for outcome, count in judge["outcomes"].items():
+                outcomes.add_metric([outcome], count)
+            yield outcomes
+            breaker = judge["breaker"]
+            state = GaugeMetricFamily("llm_breaker_state", "Circuit breaker state (1 = current)", labels=["state"])
+            for name in ("closed", "open", "half-open"):
+                state.add_metric([name], int(breaker["state"] == name))
+            yield state
+            if judge["cache"]:
+                yield from _cache_metrics("verdict", judge["cache"])
+
+def _cache_metrics(name, stats):
+    entries = GaugeMetricFamily(f"{name}_cache_entries", f"Rows in the {name} cache", value=stats["entries"])
+    lookups = CounterMetricFamily(f"{name}_cache_lookups", f"{name.title()} cache lookups by result", labels=["result"])
+    lookups.add_metric(["hit"], stats["hits"])
+    lookups.add_metric(["miss"], stats["misses"])
+    return [entries, lookups]
+
+_installed = False
+
+def install(app):
+    """Adds the request middleware, the scrape-time collector and the similarity stage observer."""
+    global _installed
+    app.add_middleware(MetricsMiddleware)
+    if _installed:
+        return
+    _installed = True
+    REGISTRY.register(_SnapshotCollector())
+
+    # similarity_check stages (minhash, embedding_cache, encode, faiss_search, llm_call)
+    # (importing similarity_service puts similarity_check on sys.path)
+    import similarity_service
+    from src.telemetry import set_observer
+    set_observer(observe_stage)
+
+def render():
+    """(body, content type) for the /metrics response."""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,218 @@
+"""
+Bulk student/teacher registration (semester onboarding).
+
+One pass over a CSV or NDJSON file validates every row against the same
+models as /register/*, then the valid rows are COPY'd into a temp staging
+table and merged in a single INSERT ... ON CONFLICT DO NOTHING. Rows that
+collide with an existing email/USN (or with an earlier row in the file)
+are reported back by line instead of failing the batch.
+
+    POST /register/students/bulk   (Content-Type: text/csv or application/x-ndjson)
+    python onboarding.py students roster.csv [--dry-run] [--report conflicts.json]
+"""
+import io
+import csv
+import json
+import time
+import argparse
+import tempfile
+from fastapi import APIRouter, HTTPException, Query, Request
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+from database import db_connection
+from auth import StudentRegister, TeacherRegister
+
+router = APIRouter()
+
+# Valid rows are staged in memory up to this size, then spill to disk
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+# kind -> (model, target table, columns, unique columns)
+KINDS = {
+    "students": (StudentRegister, "students", ["name", "usn", "year", "sem", "dept", "email", "password"], ["email", "usn"]),
+    "teachers": (TeacherRegister, "teachers", ["name", "dept", "email", "password"], ["email"]),
+}
+
+NDJSON_TYPES = ("application/x-ndjson", "application/jsonl", "application/json")
+
+# --- PARSING ---
+def _read_rows(text, fmt):
+    """Yields (line number, dict) for every record; unparsable NDJSON lines yield (line, None)."""
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for record in reader:
+            yield reader.line_num, record
+        return
+    for line_num, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            record = None
+        yield line_num, record if isinstance(record, dict) else None
+
+def _validate(text, fmt, kind, staging):
+    """
+    Streaming pass: valid rows go to `staging` as CSV (line first), bad rows
+    and in-file duplicates are returned. Returns (received, staged, invalid, conflicts).
+    """
+    model, _, columns, unique = KINDS[kind]
+    writer = csv.writer(staging)
+    seen = {column: {} for column in unique}
+    received, staged, invalid, conflicts = 0, 0, [], []
+
+    for line, record in _read_rows(text, fmt):
+        received += 1
+        if record is None:
+            invalid.append({"line": line, "errors": ["not a JSON object"]})
+            continue
+        try:
+            row = model(**{k.strip(): v.strip() if isinstance(v, str) else v for k, v in record.items() if k and v is not None})
+        except ValidationError as e:
+            invalid.append({"line": line, "errors": [f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()]})
+            continue
+
+        duplicate = next((c for c in unique if getattr(row, c) in seen[c]), None)
+        if duplicate:
+            conflicts.append({"line": line, "email": row.email, "usn": getattr(row, "usn", None),
+                              "reason": f"{duplicate} repeats line {seen[duplicate][getattr(row, duplicate)]}"})
+            continue
+        for c in unique:
+            seen[c][getattr(row, c)] = line
+
+        writer.writerow([line] + [getattr(row, c) for c in columns])
+        staged += 1
+
+    staging.seek(0)
+    return received, staged, invalid, conflicts
+
+# --- MERGE ---
+def _merge(cursor, kind, staging):
+    """COPYs the staged rows and inserts them; returns the rows that hit an existing email/USN."""
+    _, table, columns, unique = KINDS[kind]
+    column_list = ", ".join(columns)
+
+    # 1. Staging table shaped like the target, dropped at commit
+    cursor.execute(f"""
+        CREATE TEMP TABLE onboarding_stage ON COMMIT DROP AS
+        SELECT 0 AS line, {column_list} FROM {table} WITH NO DATA
+    """)
+    cursor.copy_expert(f"COPY onboarding_stage (line, {column_list}) FROM STDIN WITH (FORMAT csv)", staging)
+
+    # 2. One INSERT for the whole batch. The outer SELECT still sees the
+    #    pre-insert snapshot, so "taken" means taken before this batch.
+    taken = ", ".join(f"EXISTS (SELECT 1 FROM {table} x WHERE x.{c} = s.{c}) AS {c}_taken" for c in unique)
+    cursor.execute(f"""
+        WITH inserted AS (
+            INSERT INTO {table} ({column_list})
+            SELECT {column_list} FROM onboarding_stage ORDER BY line
+            ON CONFLICT DO NOTHING
+            RETURNING email
+        )
+        SELECT s.line, s.email, {"s.usn" if "usn" in unique else "NULL"} AS usn, {taken}
+        FROM onboarding_stage s
+        WHERE NOT EXISTS (SELECT 1 FROM inserted i WHERE i.email = s.email)
+        ORDER BY s.line
+    """)
+
+    conflicts = []
+    for row in cursor.fetchall():
+        reasons = [f"{c} already registered" for c in unique if row[f"{c}_taken"]]
+        conflicts.append({"line": row['line'], "email": row['email'], "usn": row['usn'],
+                          "reason": ", ".join(reasons) or "registered concurrently"})
+    return conflicts
+
+def onboard(text, fmt, kind, dry_run=False):
+    """Validates, stages and merges one file. Returns the per-row report."""
+    start = time.perf_counter()
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES, mode="w+", newline="") as staging:
+        # 1. Streaming validation
+        received, staged, invalid, conflicts = _validate(text, fmt, kind, staging)
+
+        # 2. COPY + merge in one transaction
+        with db_connection() as conn:
+            try:
+                existing = _merge(conn.cursor(), kind, staging) if staged else []
+                if dry_run:
+                    conn.rollback()
+                else:
+                    conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    conflicts = sorted(conflicts + existing, key=lambda c: c['line'])
+    return {
+        "kind": kind,
+        "received": received,
+        "inserted": staged - len(existing),
+        "invalid": invalid,
+        "conflicts": conflicts,
+        "dry_run": dry_run,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1)
+    }
+
+def _format_for(content_type):
+    return "ndjson" if content_type.split(";")[0].strip().lower() in NDJSON_TYPES else "csv"
+
+# --- API ENDPOINT ---
+@router.post("/register/{kind}/bulk")
+async def bulk_register(
+    kind: str,
+    request: Request,
+    dry_run: bool = Query(False, description="Validate and report conflicts without inserting")
+):
+    """Body is the raw file: text/csv (with a header row) or application/x-ndjson."""
+    if kind not in KINDS:
+        raise HTTPException(status_code=404, detail=f"Unknown kind '{kind}'. Use one of: {', '.join(KINDS)}")
+
+    # Spool the upload, then validate + COPY off the event loop
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as body:
+        async for chunk in request.stream():
+            body.write(chunk)
+        body.seek(0)
+        text = io.TextIOWrapper(body, encoding="utf-8-sig", newline="")
+        try:
+            report = await run_in_threadpool(onboard, text, _format_for(request.headers.get("content-type", "")), kind, dry_run)
+        except HTTPException:
+            raise
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=400, detail="File must be UTF-8 encoded")
+        except Exception as e:
+            print(f"Error in bulk_register: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+        finally:
+            text.detach()
+
+    print(f"📥 Bulk {kind}: {report['inserted']}/{report['received']} inserted, "
+          f"{len(report['invalid'])} invalid, {len(report['conflicts'])} conflicts in {report['elapsed_ms']}ms")
+    return report
+
+# --- CLI ---
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-register students or teachers from CSV/NDJSON.")
+    parser.add_argument("kind", choices=list(KINDS))
+    parser.add_argument("path", help="CSV with a header row, or NDJSON (.ndjson/.jsonl)")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="Default: from the file extension")
+    parser.add_argument("--dry-run", action="store_true", help="Validate and report conflicts without inserting")
+    parser.add_argument("--report", help="Write the full JSON report here")
+    args = parser.parse_args()
+
+    fmt = args.format or ("ndjson" if args.path.endswith((".ndjson", ".jsonl")) else "csv")
+    with open(args.path, encoding="utf-8-sig", newline="") as f:
+        report = onboard(f, fmt, args.kind, dry_run=args.dry_run)
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+    for entry in report['invalid'][:20]:
+        print(f"⚠️ line {entry['line']}: {'; '.join(entry['errors'])}")
+    for entry in report['conflicts'][:20]:
+        print(f"⚠️ line {entry['line']}: {entry['email']} - {entry['reason']}")
+    print(f"{'🧪 Dry run' if args.dry_run else '✅ Done'}: {report['inserted']}/{report['received']} {args.kind} "
+          f"{'would be ' if args.dry_run else ''}inserted, {len(report['invalid'])} invalid, "
+          f"{len(report['conflicts'])} conflicts in {report['elapsed_ms']}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Shared helpers for keyset-paginated, field-selectable list endpoints.
+
+Pages are addressed by the last key seen (`after`), never by OFFSET, so
+every page is one index range scan no matter how deep the client goes.
+The body stays a plain JSON array; the next cursor travels in the
+X-Next-Cursor header (and a Link: rel="next" header).
+"""
+import os
+from fastapi import HTTPException
+
+DEFAULT_PAGE_SIZE = int(os.getenv("API_DEFAULT_PAGE_SIZE", "100"))
+MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", "1000"))
+# Rows per chunk written to an NDJSON export stream
+EXPORT_CHUNK_ROWS = int(os.getenv("API_EXPORT_CHUNK_ROWS", "500"))
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def select_fields(fields, allowed, required, default=None):
+    """
+    Turns ?fields=a,b into a validated column list. `required` columns
+    (the keyset key) are always included; unknown names are a 400.
+    `allowed` maps public field name -> SQL expression; without ?fields
+    the `default` subset (or every allowed field) is returned.
+    """
+    if not fields:
+        names = list(default or allowed)
+    else:
+        names = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [f for f in names if f not in allowed]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}")
+    for key in reversed(required):
+        if key not in names:
+            names.insert(0, key)
+    return names, ", ".join(f"{allowed[name]} AS {name}" for name in names)
+
+def set_next_cursor(response, request, next_cursor):
+    """Advertises the next page, if any, on the response headers."""
+    if next_cursor is None:
+        return
+    response.headers[NEXT_CURSOR_HEADER] = str(next_cursor)
+    next_url = request.url.include_query_params(after=next_cursor)
+    response.headers["Link"] = f'<{next_url}>; rel="next"'
@@ -1,10 +1,13 @@
-from typing import Optional
+from typing import List, Optional
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from database import get_db_connection
+from pydantic import BaseModel, Field
+from async_database import async_db_connection
 
 router = APIRouter()
 
+# Largest list accepted by the batch grading endpoints
+MAX_BATCH_ITEMS = 1000
+
 # --- Pydantic Model ---
 class ProjectPhaseUpdate(BaseModel):
     submitted_project_id: int
@@ -15,64 +18,106 @@ class ProjectPhaseUpdate(BaseModel):
     phase3_marks: Optional[int] = None
     phase3_remarks: Optional[str] = None
 
+class ProjectPhaseBatch(BaseModel):
+    updates: List[ProjectPhaseUpdate] = Field(..., min_length=1, max_length=MAX_BATCH_ITEMS)
+
+PHASE_FIELDS = ["phase1_marks", "phase1_remarks", "phase2_marks", "phase2_remarks", "phase3_marks", "phase3_remarks"]
+
+UPSERT_PHASES_QUERY = """
+    INSERT INTO project_phases (
+        submitted_project_id,
+        phase1_marks, phase1_remarks,
+        phase2_marks, phase2_remarks,
+        phase3_marks, phase3_remarks
+    ) VALUES ($1, COALESCE($2, 0), COALESCE($3, ''), COALESCE($4, 0), COALESCE($5, ''), COALESCE($6, 0), COALESCE($7, ''))
+    ON CONFLICT (submitted_project_id) DO UPDATE SET
+        phase1_marks = COALESCE($2, project_phases.phase1_marks),
+        phase1_remarks = COALESCE($3, project_phases.phase1_remarks),
+        phase2_marks = COALESCE($4, project_phases.phase2_marks),
+        phase2_remarks = COALESCE($5, project_phases.phase2_remarks),
+        phase3_marks = COALESCE($6, project_phases.phase3_marks),
+        phase3_remarks = COALESCE($7, project_phases.phase3_remarks)
+    RETURNING (xmax = 0) AS created
+"""
+
+# Rows for projects that have none yet, with the same defaults the single route uses
+CREATE_MISSING_PHASES_QUERY = """
+    INSERT INTO project_phases (
+        submitted_project_id,
+        phase1_marks, phase1_remarks,
+        phase2_marks, phase2_remarks,
+        phase3_marks, phase3_remarks
+    )
+    SELECT submitted_project_id, 0, '', 0, '', 0, ''
+    FROM submitted_projects
+    WHERE submitted_project_id = ANY($1::int[])
+    ORDER BY submitted_project_id
+    ON CONFLICT (submitted_project_id) DO NOTHING
+    RETURNING submitted_project_id
+"""
+
+# One statement for the whole batch; NULL keeps the stored value
+APPLY_PHASES_QUERY = """
+    UPDATE project_phases pp
+    SET
+        phase1_marks = COALESCE(v.phase1_marks, pp.phase1_marks),
+        phase1_remarks = COALESCE(v.phase1_remarks, pp.phase1_remarks),
+        phase2_marks = COALESCE(v.phase2_marks, pp.phase2_marks),
+        phase2_remarks = COALESCE(v.phase2_remarks, pp.phase2_remarks),
+        phase3_marks = COALESCE(v.phase3_marks, pp.phase3_marks),
+        phase3_remarks = COALESCE(v.phase3_remarks, pp.phase3_remarks)
+    FROM unnest($1::int[], $2::int[], $3::text[], $4::int[], $5::text[], $6::int[], $7::text[])
+        AS v(submitted_project_id, phase1_marks, phase1_remarks, phase2_marks, phase2_remarks, phase3_marks, phase3_remarks)
+    WHERE pp.submitted_project_id = v.submitted_project_id
+    RETURNING pp.submitted_project_id
+"""
+
 # --- API ENDPOINT ---
 @router.put("/update-project-phases")
-def update_project_phases(data: ProjectPhaseUpdate):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    try:
-        # 1. Check if a phase record already exists
-        check_query = "SELECT submitted_project_id FROM project_phases WHERE submitted_project_id = %s"
-        cursor.execute(check_query, (data.submitted_project_id,))
-        exists = cursor.fetchone()
-
-        if exists:
-            # OPTION A: UPDATE (Preserve existing values if new ones are None)
-            update_query = """
-                UPDATE project_phases
-                SET 
-                    phase1_marks = COALESCE(%s, phase1_marks),
-                    phase1_remarks = COALESCE(%s, phase1_remarks),
-                    phase2_marks = COALESCE(%s, phase2_marks),
-                    phase2_remarks = COALESCE(%s, phase2_remarks),
-                    phase3_marks = COALESCE(%s, phase3_marks),
-                    phase3_remarks = COALESCE(%s, phase3_remarks)
-                WHERE submitted_project_id = %s
-            """
-            cursor.execute(update_query, (
+async def update_project_phases(data: ProjectPhaseUpdate):
+    async with async_db_connection() as conn:
+        try:
+            # Insert-or-update in one statement (uq_project_phases_submitted_project_id).
+            # New rows get the defaults; existing rows keep values sent as None.
+            created = await conn.fetchval(UPSERT_PHASES_QUERY,
+                data.submitted_project_id,
                 data.phase1_marks, data.phase1_remarks,
                 data.phase2_marks, data.phase2_remarks,
-                data.phase3_marks, data.phase3_remarks,
-                data.submitted_project_id
-            ))
-            message = "Project phases updated successfully."
+                data.phase3_marks, data.phase3_remarks
+            )
+            message = "Project phases created successfully." if created else "Project phases updated successfully."
 
-        else:
-            # OPTION B: INSERT (Create new record with defaults)
-            insert_query = """
-                INSERT INTO project_phases (
-                    submitted_project_id, 
-                    phase1_marks, phase1_remarks, 
-                    phase2_marks, phase2_remarks, 
-                    phase3_marks, phase3_remarks
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """
-            cursor.execute(insert_query, (
-                data.submitted_project_id,
-                data.phase1_marks or 0, data.phase1_remarks or "",
-                data.phase2_marks or 0, data.phase2_remarks or "",
-                data.phase3_marks or 0, data.phase3_remarks or ""
-            ))
-            message = "Project phases created successfully."
+            return {"message": message, "submitted_project_id": data.submitted_project_id}
+
+        except Exception as e:
+            print(f"Error updating project phases: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+@router.put("/update-project-phases/batch")
+async def update_project_phases_batch(data: ProjectPhaseBatch):
+    """Grades many projects in one transaction; returns a result per item."""
+    ids = [u.submitted_project_id for u in data.updates]
+    if len(ids) != len(set(ids)):
+        raise HTTPException(status_code=400, detail="Duplicate submitted_project_id in request.")
+
+    async with async_db_connection() as conn:
+        try:
+            async with conn.transaction():
+                # 1. Create the phase rows that don't exist yet (unknown projects are skipped)
+                created = {r['submitted_project_id'] for r in await conn.fetch(CREATE_MISSING_PHASES_QUERY, ids)}
 
-        conn.commit()
-        return {"message": message, "submitted_project_id": data.submitted_project_id}
+                # 2. Apply every update with one UPDATE ... FROM unnest(...)
+                columns = [[getattr(u, field) for u in data.updates] for field in PHASE_FIELDS]
+                applied = {r['submitted_project_id'] for r in await conn.fetch(APPLY_PHASES_QUERY, ids, *columns)}
+        except Exception as e:
+            print(f"Error updating project phases (batch): {e}")
+            raise HTTPException(status_code=500, detail=str(e))
 
-    except Exception as e:
-        conn.rollback()
-        print(f"Error updating project phases: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-        
-    finally:
-        conn.close()
+    results = []
+    for pid in ids:
+        result = "created" if pid in created else "updated" if pid in applied else "not_found"
+        results.append({"submitted_project_id": pid, "result": result})
+    return {
+        "message": f"{len(applied)} of {len(ids)} projects graded.",
+        "results": results
+    }
@@ -1,6 +1,13 @@
+from typing import List
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, field_validator
-from database import get_db_connection
+from pydantic import BaseModel, Field, field_validator
+from starlette.concurrency import run_in_threadpool
+from async_database import async_db_connection
+from project_phases import MAX_BATCH_ITEMS
+from similarity_service import (
+    index_submitted_project, unindex_submitted_project,
+    index_submitted_projects, unindex_submitted_projects
+)
 
 router = APIRouter()
 
@@ -17,43 +24,100 @@ class ProjectStatusUpdate(BaseModel):
             raise ValueError(f"Status must be one of: {allowed}")
         return v.lower()
 
-# --- API ENDPOINT ---
-@router.put("/update-project-status")
-def update_project_status(data: ProjectStatusUpdate):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
+class ProjectStatusBatch(BaseModel):
+    updates: List[ProjectStatusUpdate] = Field(..., min_length=1, max_length=MAX_BATCH_ITEMS)
+
+# One statement for the whole batch; returns what the index sync needs
+APPLY_STATUS_QUERY = """
+    UPDATE submitted_projects sp
+    SET status = v.status
+    FROM unnest($1::int[], $2::text[]) AS v(submitted_project_id, status)
+    WHERE sp.submitted_project_id = v.submitted_project_id
+    RETURNING sp.submitted_project_id, sp.project_title, sp.project_synopsis, sp.status
+"""
+
+def _sync_similarity_index(project, status):
+    try:
+        if status == 'approved':
+            index_submitted_project(project['submitted_project_id'], project['project_title'], project['project_synopsis'])
+        else:
+            unindex_submitted_project(project['submitted_project_id'])
+    except Exception as e:
+        # The status change is already committed; the index catches up on next warm-up
+        print(f"⚠️ Could not update similarity index: {e}")
+
+def _sync_similarity_index_batch(projects):
+    # Approvals go in with one encode + one delta insert, the rest in one delete pass
     try:
-        # 1. Check if the project exists
-        check_query = "SELECT submitted_project_id FROM submitted_projects WHERE submitted_project_id = %s"
-        cursor.execute(check_query, (data.submitted_project_id,))
-        project = cursor.fetchone()
-
-        if not project:
-            raise HTTPException(status_code=404, detail="Project not found")
-
-        # 2. Update the status
-        update_query = """
-            UPDATE submitted_projects
-            SET status = %s
-            WHERE submitted_project_id = %s
-        """
-        cursor.execute(update_query, (data.status, data.submitted_project_id))
-        
-        conn.commit()
-        
-        return {
-            "message": f"Project status updated to '{data.status}' successfully.",
-            "submitted_project_id": data.submitted_project_id,
-            "new_status": data.status
-        }
-
-    except HTTPException as he:
-        raise he
+        index_submitted_projects([p for p in projects if p['status'] == 'approved'])
+        unindex_submitted_projects([p['submitted_project_id'] for p in projects if p['status'] != 'approved'])
     except Exception as e:
-        conn.rollback()
-        print(f"Error updating project status: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-        
-    finally:
-        conn.close()
+        print(f"⚠️ Could not update similarity index: {e}")
+
+# --- API ENDPOINT ---
+@router.put("/update-project-status")
+async def update_project_status(data: ProjectStatusUpdate):
+    async with async_db_connection() as conn:
+        try:
+            # 1. Check if the project exists
+            check_query = "SELECT submitted_project_id, project_title, project_synopsis FROM submitted_projects WHERE submitted_project_id = $1"
+            project = await conn.fetchrow(check_query, data.submitted_project_id)
+
+            if not project:
+                raise HTTPException(status_code=404, detail="Project not found")
+
+            # 2. Update the status
+            update_query = """
+                UPDATE submitted_projects
+                SET status = $1
+                WHERE submitted_project_id = $2
+            """
+            await conn.execute(update_query, data.status, data.submitted_project_id)
+
+        except HTTPException as he:
+            raise he
+        except Exception as e:
+            print(f"Error updating project status: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+    # 3. Keep the similarity index in sync (approved projects are searchable).
+    #    Encoding is CPU work, so it runs off the event loop, with the
+    #    connection already back in the pool.
+    await run_in_threadpool(_sync_similarity_index, project, data.status)
+
+    return {
+        "message": f"Project status updated to '{data.status}' successfully.",
+        "submitted_project_id": data.submitted_project_id,
+        "new_status": data.status
+    }
+
+@router.put("/update-project-status/batch")
+async def update_project_status_batch(data: ProjectStatusBatch):
+    """Approves/rejects many projects in one transaction; returns a result per item."""
+    ids = [u.submitted_project_id for u in data.updates]
+    if len(ids) != len(set(ids)):
+        raise HTTPException(status_code=400, detail="Duplicate submitted_project_id in request.")
+
+    async with async_db_connection() as conn:
+        try:
+            # 1. Update every status with one UPDATE ... FROM unnest(...)
+            async with conn.transaction():
+                updated = await conn.fetch(APPLY_STATUS_QUERY, ids, [u.status for u in data.updates])
+        except Exception as e:
+            print(f"Error updating project status (batch): {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+    # 2. Keep the similarity index in sync, off the event loop
+    await run_in_threadpool(_sync_similarity_index_batch, updated)
+
+    new_status = {r['submitted_project_id']: r['status'] for r in updated}
+    results = []
+    for pid in ids:
+        if pid in new_status:
+            results.append({"submitted_project_id": pid, "result": "updated", "new_status": new_status[pid]})
+        else:
+            results.append({"submitted_project_id": pid, "result": "not_found"})
+    return {
+        "message": f"{len(updated)} of {len(ids)} project statuses updated.",
+        "results": results
+    }
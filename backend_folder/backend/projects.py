@@ -1,22 +1,66 @@
-from fastapi import APIRouter, HTTPException
-from database import get_db_connection
+import json
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from async_database import async_db_connection
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, EXPORT_CHUNK_ROWS, select_fields, set_next_cursor
 
 router = APIRouter()
 
+# Public field name -> column of the 'projects' archive
+PROJECT_FIELDS = {"project_id": "project_id", "title": "title", "synopsis": "synopsis"}
+
 @router.get("/projects")
-def get_all_projects():
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        # Fetch data from the 'projects' table exactly as shown in your terminal
-        query = "SELECT project_id, title, synopsis FROM projects"
-        
-        cursor.execute(query)
-        projects = cursor.fetchall()
-        
-        return projects
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        conn.close()
+async def get_all_projects(
+    request: Request,
+    response: Response,
+    after: Optional[int] = Query(None, description="project_id of the last row already received"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = Query(None, description="Comma-separated subset of project_id,title,synopsis")
+):
+    """One keyset page of the archive; the next cursor is in X-Next-Cursor."""
+    _, columns = select_fields(fields, PROJECT_FIELDS, required=["project_id"])
+
+    async with async_db_connection() as conn:
+        try:
+            # One extra row tells us whether another page exists
+            rows = await conn.fetch(f"""
+                SELECT {columns} FROM projects
+                WHERE project_id > $1
+                ORDER BY project_id
+                LIMIT $2
+            """, after if after is not None else -1, limit + 1)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    page = [dict(r) for r in rows[:limit]]
+    set_next_cursor(response, request, page[-1]['project_id'] if len(rows) > limit else None)
+    return page
+
+@router.get("/projects/export")
+async def export_projects(
+    fields: Optional[str] = Query(None, description="Comma-separated subset of project_id,title,synopsis")
+):
+    """
+    The whole archive as NDJSON (one project per line), read through a
+    server-side cursor so neither side ever holds more than a chunk.
+    """
+    _, columns = select_fields(fields, PROJECT_FIELDS, required=["project_id"])
+
+    async def stream():
+        # The connection is borrowed inside the generator, so it is only ever
+        # taken if the body is actually streamed, and always given back when
+        # the generator finishes, fails or is closed on client disconnect
+        async with async_db_connection() as conn:
+            # One snapshot for the whole export, even if rows change meanwhile
+            async with conn.transaction(isolation="repeatable_read", readonly=True):
+                chunk = []
+                async for record in conn.cursor(f"SELECT {columns} FROM projects ORDER BY project_id", prefetch=EXPORT_CHUNK_ROWS):
+                    chunk.append(json.dumps(dict(record)))
+                    if len(chunk) >= EXPORT_CHUNK_ROWS:
+                        yield "\n".join(chunk) + "\n"
+                        chunk = []
+                if chunk:
+                    yield "\n".join(chunk) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
@@ -0,0 +1,395 @@
+"""
+End-to-end load test: how many concurrent users one backend instance
+sustains before p99 degrades.
+
+Boots a throwaway Postgres (initdb/pg_ctl in a temp dir), seeds it with
+seed_data, builds the similarity index with the offline hashing encoder,
+starts the stub LLM and `uvicorn main:app`, then runs a mixed
+submission-week workload (logins, dashboards, team creation) at each
+concurrency step and reports throughput and latency percentiles per route.
+Everything is torn down afterwards.
+
+    python run_load_test.py --concurrency 10,25,50,100 --duration 20
+    python run_load_test.py --pg-bin /usr/lib/postgresql/16/bin --workers 2 --llm-latency 2 --output load.json
+    python run_load_test.py --existing-db   # use DB_* from the environment instead (it is wiped and reseeded!)
+
+initdb refuses to run as root; run as a normal user or pass --existing-db.
+"""
+import os
+import sys
+import glob
+import json
+import time
+import shutil
+import random
+import socket
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from collections import defaultdict
+import httpx
+import numpy as np
+from database import db_connection, close_pool
+from schema import apply_schema
+from seed_data import SEED_PASSWORD, project_text, seed, reset
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+SIMILARITY_DIR = os.path.join(os.path.dirname(BACKEND_DIR), "similarity_check")
+
+# Scenario -> weight. Submission week: mostly logins and dashboard loads, a steady stream of new teams.
+DEFAULT_MIX = "login_student=25,user_student=35,create_team=15,login_teacher=5,user_teacher=10,mentor_projects=10"
+
+# --------------------------
+# PROCESSES
+# --------------------------
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def _find_pg_bin(explicit):
+    candidates = [explicit, os.getenv("PG_BIN")]
+    initdb = shutil.which("initdb")
+    if initdb:
+        candidates.append(os.path.dirname(initdb))
+    candidates += sorted(glob.glob("/usr/lib/postgresql/*/bin"), reverse=True)
+    for path in candidates:
+        if path and os.path.exists(os.path.join(path, "initdb")):
+            return path
+    raise SystemExit("❌ initdb not found. Pass --pg-bin or set PG_BIN to the PostgreSQL bin directory.")
+
+class DisposablePostgres:
+    """A private cluster in a temp dir, reachable only over its own unix socket."""
+
+    def __init__(self, bin_dir, root, max_connections):
+        self.bin_dir = bin_dir
+        self.data_dir = os.path.join(root, "pgdata")
+        self.socket_dir = os.path.join(root, "pgsock")
+        self.log_path = os.path.join(root, "postgres.log")
+        self.port = _free_port()
+        self.max_connections = max_connections
+
+    def _run(self, tool, *args):
+        subprocess.run([os.path.join(self.bin_dir, tool), *args], check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+    def start(self):
+        if hasattr(os, "geteuid") and os.geteuid() == 0:
+            raise SystemExit("❌ initdb refuses to run as root. Run as a normal user or pass --existing-db.")
+        os.makedirs(self.socket_dir)
+        self._run("initdb", "-D", self.data_dir, "-U", "postgres", "-A", "trust", "-E", "UTF8", "--no-sync")
+        options = f"-p {self.port} -k {self.socket_dir} -c listen_addresses='' -c max_connections={self.max_connections}"
+        self._run("pg_ctl", "-D", self.data_dir, "-o", options, "-l", self.log_path, "-w", "start")
+        self._run("createdb", "-h", self.socket_dir, "-p", str(self.port), "-U", "postgres", "loadtest")
+        print(f"🐘 Postgres up on {self.socket_dir}:{self.port}")
+
+    def env(self):
+        return {"DB_NAME": "loadtest", "DB_USER": "postgres", "DB_PASSWORD": "",
+                "DB_HOST": self.socket_dir, "DB_PORT": str(self.port)}
+
+    def stop(self):
+        if os.path.exists(os.path.join(self.data_dir, "postmaster.pid")):
+            self._run("pg_ctl", "-D", self.data_dir, "-m", "fast", "-w", "stop")
+
+def _spawn(args, cwd, env, log_path):
+    log = open(log_path, "w")
+    return subprocess.Popen(args, cwd=cwd, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+def _stop(process):
+    if process and process.poll() is None:
+        process.terminate()
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+def _tail(path, lines=30):
+    with open(path, errors="replace") as f:
+        return "".join(f.readlines()[-lines:])
+
+def _wait_ready(base_url, process, log_path, timeout):
+    """Waits for /ready (similarity engine warm), so the first step doesn't measure start-up."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"❌ Backend exited during start-up:\n{_tail(log_path)}")
+        try:
+            if httpx.get(f"{base_url}/ready", timeout=2).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.5)
+    raise SystemExit(f"❌ Backend not ready after {timeout}s:\n{_tail(log_path)}")
+
+# --------------------------
+# DATA
+# --------------------------
+
+def seed_database(args):
+    """Schema + synthetic data + the unteamed students that create_team will use."""
+    with db_connection() as conn:
+        apply_schema(conn)
+        reset(conn)
+        started = time.perf_counter()
+        counts = seed(conn, students=args.students, teachers=args.teachers, team_size=args.team_size,
+                      teamed_ratio=args.teamed_ratio, archive=args.archive, seed=args.seed)
+        print(f"🌱 Seeded {counts} in {time.perf_counter() - started:.1f}s")
+
+        # Free students in single-department groups, one group per create-team request
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT s.name, s.usn, s.email, s.dept
+            FROM students s
+            WHERE NOT EXISTS (SELECT 1 FROM team_memberships tm WHERE tm.usn = s.usn)
+            ORDER BY s.dept, s.student_id
+        """)
+        free = defaultdict(list)
+        for row in cursor.fetchall():
+            free[row['dept']].append(dict(row))
+        conn.rollback()
+    close_pool()
+
+    groups = []
+    for members in free.values():
+        groups += [members[i:i + args.team_size] for i in range(0, len(members) - args.team_size + 1, args.team_size)]
+    random.Random(args.seed).shuffle(groups)
+    return counts, groups
+
+def build_index(env):
+    """The backend needs an index to warm up; build it from the seeded archive."""
+    result = subprocess.run([sys.executable, "run_indexer.py"], cwd=SIMILARITY_DIR, env=env,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise SystemExit(f"❌ Indexing failed:\n{result.stdout[-2000:]}{result.stderr[-2000:]}")
+
+# --------------------------
+# WORKLOAD
+# --------------------------
+
+class Workload:
+    """Builds one request per scenario. Routes are labelled by template, like /metrics."""
+
+    def __init__(self, counts, groups, run_id, seed_password):
+        self.students = counts["students"]
+        self.teachers = counts["teachers"]
+        self.groups = groups
+        self.run_id = run_id
+        self.password = seed_password
+        self.teams_created = 0
+
+    def build(self, scenario, rng):
+        student = f"student{rng.randint(1, self.students)}@seed.edu"
+        teacher = f"teacher{rng.randint(1, self.teachers)}@seed.edu"
+        if scenario == "login_student":
+            return "POST /login/student", "POST", "/login/student", {"email": student, "password": self.password}
+        if scenario == "login_teacher":
+            return "POST /login/teacher", "POST", "/login/teacher", {"email": teacher, "password": self.password}
+        if scenario == "user_student":
+            return "GET /user/{email}", "GET", f"/user/{student}", None
+        if scenario == "user_teacher":
+            return "GET /user/{email}", "GET", f"/user/{teacher}", None
+        if scenario == "mentor_projects":
+            return "GET /mentors/{email}/projects", "GET", f"/mentors/{teacher}/projects", None
+        if scenario == "create_team":
+            if not self.groups:
+                return None  # Out of free students; the slot goes to another scenario
+            members = self.groups.pop()
+            self.teams_created += 1
+            title, synopsis = project_text(rng)
+            return "POST /create-team", "POST", "/create-team", {
+                "team_name": f"Load {self.run_id} {self.teams_created}",
+                "team_size": len(members),
+                "team_members": members,
+                "project_title": title,
+                "project_synopsis": synopsis
+            }
+        raise ValueError(f"Unknown scenario '{scenario}'")
+
+def parse_mix(spec):
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+async def run_step(base_url, workload, mix, concurrency, duration, warmup, think, seed):
+    """Closed loop: `concurrency` users each send, wait for the answer, (think), repeat."""
+    names, weights = list(mix), list(mix.values())
+    samples = defaultdict(list)     # route -> [ms]
+    statuses = defaultdict(lambda: defaultdict(int))
+    measure_from = time.monotonic() + warmup
+    stop_at = measure_from + duration
+
+    async def user(i, client):
+        rng = random.Random(seed * 1000 + i)
+        while time.monotonic() < stop_at:
+            request = workload.build(rng.choices(names, weights)[0], rng)
+            if request is None:
+                await asyncio.sleep(0)
+                continue
+            route, method, path, body = request
+            started = time.monotonic()
+            try:
+                response = await client.request(method, path, json=body)
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            finished = time.monotonic()
+            if started >= measure_from and finished <= stop_at:
+                samples[route].append((finished - started) * 1000)
+                statuses[route][status] += 1
+            if think:
+                await asyncio.sleep(rng.expovariate(1 / think))
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        await asyncio.gather(*(user(i, client) for i in range(concurrency)))
+        pool = (await client.get("/db-pool")).json()
+
+    routes = {}
+    for route, latencies in sorted(samples.items()):
+        latencies = np.array(latencies)
+        ok = sum(n for status, n in statuses[route].items() if status.startswith("2"))
+        routes[route] = {
+            "requests": len(latencies),
+            "rps": round(len(latencies) / duration, 1),
+            "errors": len(latencies) - ok,
+            "statuses": dict(statuses[route]),
+            "p50_ms": round(float(np.percentile(latencies, 50)), 2),
+            "p95_ms": round(float(np.percentile(latencies, 95)), 2),
+            "p99_ms": round(float(np.percentile(latencies, 99)), 2),
+            "max_ms": round(float(latencies.max()), 2)
+        }
+    total = sum(r["requests"] for r in routes.values())
+    return {
+        "concurrency": concurrency,
+        "rps": round(total / duration, 1),
+        "errors": sum(r["errors"] for r in routes.values()),
+        "routes": routes,
+        "sync_pool": {k: pool["sync"].get(k) for k in ("waits", "timeouts", "max_size")},
+    }
+
+# --------------------------
+# REPORT
+# --------------------------
+
+def print_step(step):
+    print(f"\n📊 {step['concurrency']} users: {step['rps']} req/s, {step['errors']} errors, "
+          f"sync pool waits={step['sync_pool']['waits']} timeouts={step['sync_pool']['timeouts']}")
+    print(f"   {'route':<32} {'req/s':>8} {'err':>5} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+    for route, r in step["routes"].items():
+        print(f"   {route:<32} {r['rps']:>8} {r['errors']:>5} {r['p50_ms']:>7.1f}ms {r['p95_ms']:>7.1f}ms "
+              f"{r['p99_ms']:>7.1f}ms {r['max_ms']:>7.1f}ms")
+
+def find_knee(steps, factor, budget_ms):
+    """First step where some route's p99 exceeds `factor` x its first-step p99 (or the budget)."""
+    baseline = {route: r["p99_ms"] for route, r in steps[0]["routes"].items()}
+    for step in steps:
+        for route, r in step["routes"].items():
+            limit = baseline.get(route, r["p99_ms"]) * factor
+            if budget_ms:
+                limit = min(limit, budget_ms)
+            if r["p99_ms"] > limit or r["errors"]:
+                return step["concurrency"], route
+    return None, None
+
+def main():
+    parser = argparse.ArgumentParser(description="Submission-week load test against a disposable backend.")
+    parser.add_argument("--concurrency", default="5,10,25,50", help="Concurrent users per step")
+    parser.add_argument("--duration", type=float, default=20, help="Measured seconds per step")
+    parser.add_argument("--warmup", type=float, default=3, help="Unmeasured seconds at the start of each step")
+    parser.add_argument("--think-ms", type=float, default=0, help="Mean pause between a user's requests")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="scenario=weight,...")
+    parser.add_argument("--students", type=int, default=20000)
+    parser.add_argument("--teachers", type=int, default=2000)
+    parser.add_argument("--team-size", type=int, default=4)
+    parser.add_argument("--teamed-ratio", type=float, default=0.5, help="Seeded students already in a team")
+    parser.add_argument("--archive", type=int, default=2000, help="Past projects in the similarity index")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--encoder", default="hashing", help="ENCODER_BACKEND for the backend (hashing = offline)")
+    parser.add_argument("--llm-latency", type=float, default=1.0, help="Stub OpenRouter mean latency (s)")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--p99-factor", type=float, default=2.0, help="p99 growth vs the first step that counts as degraded")
+    parser.add_argument("--p99-budget-ms", type=float, help="Absolute p99 limit per route")
+    parser.add_argument("--pg-bin", help="PostgreSQL bin directory (default: $PG_BIN, PATH, /usr/lib/postgresql/*/bin)")
+    parser.add_argument("--existing-db", action="store_true", help="Use DB_* from the environment (WIPED and reseeded)")
+    parser.add_argument("--keep", action="store_true", help="Keep the temp dir (logs, cluster, index)")
+    parser.add_argument("--output", help="Write the results as JSON to this path")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    steps_wanted = [int(c) for c in args.concurrency.split(",")]
+    root = tempfile.mkdtemp(prefix="loadtest-")
+    postgres = backend = stub = None
+    print(f"--- 🏋️ LOAD TEST: users={steps_wanted}, {args.duration}s/step, {args.workers} worker(s), "
+          f"LLM {args.llm_latency}s, mix={args.mix} ---")
+
+    try:
+        # 1. Database
+        env = dict(os.environ)
+        if not args.existing_db:
+            # Per worker: sync pool + async pool + LISTEN connection, plus headroom for scripts
+            postgres = DisposablePostgres(_find_pg_bin(args.pg_bin), root, max_connections=50 + 40 * args.workers)
+            postgres.start()
+            env.update(postgres.env())
+        os.environ.update(env)
+
+        # 2. Data + similarity index (kept out of similarity_check/data)
+        counts, groups = seed_database(args)
+        env.update({"SIMILARITY_DATA_DIR": os.path.join(root, "similarity"), "ENCODER_BACKEND": args.encoder})
+        build_index(env)
+
+        # 3. Stub OpenRouter + backend
+        stub_port, api_port = _free_port(), _free_port()
+        stub = _spawn([sys.executable, "stub_llm_server.py", "--port", str(stub_port),
+                       "--latency", str(args.llm_latency), "--error-rate", str(args.llm_error_rate)],
+                      SIMILARITY_DIR, env, os.path.join(root, "stub_llm.log"))
+        env.update({"OPENROUTER_BASE_URL": f"http://127.0.0.1:{stub_port}/v1", "OPENROUTER_API_KEY": "stub"})
+        backend_log = os.path.join(root, "backend.log")
+        backend = _spawn([sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(api_port),
+                          "--workers", str(args.workers), "--log-level", "warning"],
+                         BACKEND_DIR, env, backend_log)
+        base_url = f"http://127.0.0.1:{api_port}"
+        _wait_ready(base_url, backend, backend_log, timeout=180)
+        print(f"🚀 Backend ready at {base_url} ({len(groups)} free teams for create-team)")
+
+        # 4. Steps
+        workload = Workload(counts, groups, run_id=int(time.time()) % 100000, seed_password=SEED_PASSWORD)
+        steps = []
+        for concurrency in steps_wanted:
+            step = asyncio.run(run_step(base_url, workload, mix, concurrency, args.duration,
+                                        args.warmup, args.think_ms / 1000, args.seed + concurrency))
+            steps.append(step)
+            print_step(step)
+            if not workload.groups and "create_team" in mix:
+                print("⚠️ Free students used up; later steps run without create-team (raise --students).")
+
+        # 5. Verdict
+        knee, route = find_knee(steps, args.p99_factor, args.p99_budget_ms)
+        print("\n📈 Throughput by step: " + ", ".join(f"{s['concurrency']}→{s['rps']} req/s" for s in steps))
+        if knee is None:
+            print(f"✅ p99 held up to {steps[-1]['concurrency']} concurrent users.")
+        else:
+            print(f"⚠️ p99 degraded at {knee} concurrent users ({route}).")
+
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump({"settings": {k: v for k, v in vars(args).items() if k != "output"},
+                           "seeded": counts, "teams_created": workload.teams_created,
+                           "degraded_at": knee, "degraded_route": route, "steps": steps}, f, indent=2)
+            print(f"💾 Results saved to {args.output}")
+    finally:
+        _stop(backend)
+        _stop(stub)
+        if postgres:
+            postgres.stop()
+        if args.keep:
+            print(f"📁 Logs and data kept in {root}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Concurrency stress test for mentor_allocator.
+
+Many threads allocate mentors in one department at once (some
+transactions roll back on purpose). Afterwards every teacher's
+total_projects must equal the committed allocations, nobody may exceed
+the cap, and "no mentor available" may only be reported once capacity
+is really used up. Exits 1 on any violation.
+
+    python run_mentor_stress.py --threads 32 --per-thread 10 --teachers 20
+    python run_mentor_stress.py --strategy legacy   # old ORDER BY teacher_id FOR UPDATE, for comparison
+"""
+import sys
+import time
+import random
+import argparse
+import statistics
+import threading
+from collections import Counter
+from database import ConnectionPool, POOL_CHECK_AFTER
+from mentor_allocator import allocate_mentor, allocate_mentors, NoMentorAvailable, MAX_PROJECTS_PER_MENTOR
+
+LEGACY_QUERY = """
+    SELECT teacher_id, name, total_projects
+    FROM teachers
+    WHERE dept = %s AND total_projects < %s
+    ORDER BY teacher_id ASC
+    LIMIT 1
+    FOR UPDATE
+"""
+
+def _legacy_allocate(cursor, dept, cap):
+    cursor.execute(LEGACY_QUERY, (dept, cap))
+    mentor = cursor.fetchone()
+    if not mentor:
+        raise NoMentorAvailable(f"No mentor available in {dept}.")
+    cursor.execute("UPDATE teachers SET total_projects = total_projects + 1 WHERE teacher_id = %s", (mentor['teacher_id'],))
+    return mentor
+
+def _setup(pool, dept, teachers):
+    conn = pool.getconn()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM teachers WHERE dept = %s", (dept,))
+        cursor.execute("""
+            INSERT INTO teachers (name, dept, email, password)
+            SELECT 'Stress ' || g, %s, lower(%s) || '-' || g || '@stress.local', 'x'
+            FROM generate_series(1, %s) AS g
+        """, (dept, dept, teachers))
+        conn.commit()
+    finally:
+        pool.putconn(conn)
+
+def _loads(pool, dept):
+    conn = pool.getconn()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT teacher_id, total_projects FROM teachers WHERE dept = %s", (dept,))
+        return {r['teacher_id']: r['total_projects'] for r in cursor.fetchall()}
+    finally:
+        conn.rollback()
+        pool.putconn(conn)
+
+def _cleanup(pool, dept):
+    conn = pool.getconn()
+    try:
+        conn.cursor().execute("DELETE FROM teachers WHERE dept = %s", (dept,))
+        conn.commit()
+    finally:
+        pool.putconn(conn)
+
+def run_single(pool, dept, args, cap):
+    """Each allocation is its own transaction, like create-team."""
+    committed = Counter()
+    outcomes = Counter()
+    latencies = []
+    lock = threading.Lock()
+
+    def worker(seed):
+        rng = random.Random(seed)
+        conn = pool.getconn()
+        try:
+            for _ in range(args.per_thread):
+                start = time.perf_counter()
+                cursor = conn.cursor()
+                try:
+                    if args.strategy == "legacy":
+                        mentor = _legacy_allocate(cursor, dept, cap)
+                    else:
+                        mentor = allocate_mentor(cursor, dept, cap=cap)
+                    # The rest of create-team runs while the slot is held
+                    time.sleep(args.hold_ms / 1000)
+                    if rng.random() < args.rollback_rate:
+                        conn.rollback()
+                        outcome = "rolled_back"
+                    else:
+                        conn.commit()
+                        outcome = "allocated"
+                except NoMentorAvailable:
+                    conn.rollback()
+                    mentor, outcome = None, "no_mentor"
+                elapsed = time.perf_counter() - start
+                with lock:
+                    outcomes[outcome] += 1
+                    latencies.append(elapsed)
+                    if outcome == "allocated":
+                        committed[mentor['teacher_id']] += 1
+        finally:
+            pool.putconn(conn)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.threads)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return committed, outcomes, latencies, time.perf_counter() - start
+
+def run_batch(pool, dept, args, cap):
+    """Concurrent bulk imports through allocate_mentors()."""
+    committed = Counter()
+    outcomes = Counter()
+    latencies = []
+    lock = threading.Lock()
+
+    def worker(index):
+        conn = pool.getconn()
+        try:
+            projects = [(-(index * args.per_thread + i + 1), dept) for i in range(args.per_thread)]
+            start = time.perf_counter()
+            assignments = allocate_mentors(conn.cursor(), projects, cap=cap)
+            conn.commit()
+            with lock:
+                latencies.append(time.perf_counter() - start)
+                for teacher_id in assignments.values():
+                    if teacher_id is None:
+                        outcomes["no_mentor"] += 1
+                    else:
+                        outcomes["allocated"] += 1
+                        committed[teacher_id] += 1
+        finally:
+            pool.putconn(conn)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.threads)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return committed, outcomes, latencies, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent mentor allocation stress test.")
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--per-thread", type=int, default=10)
+    parser.add_argument("--teachers", type=int, default=20)
+    parser.add_argument("--cap", type=int, default=MAX_PROJECTS_PER_MENTOR)
+    parser.add_argument("--hold-ms", type=float, default=5.0, help="Time each transaction keeps its slot before committing")
+    parser.add_argument("--rollback-rate", type=float, default=0.1)
+    parser.add_argument("--strategy", choices=["allocator", "legacy", "batch"], default="allocator")
+    parser.add_argument("--keep", action="store_true", help="Leave the stress teachers in the database")
+    args = parser.parse_args()
+
+    dept = f"STRESS-{args.strategy.upper()}"
+    capacity = args.teachers * args.cap
+    pool = ConnectionPool(0, args.threads + 1, 60, POOL_CHECK_AFTER)
+    _setup(pool, dept, args.teachers)
+
+    try:
+        runner = run_batch if args.strategy == "batch" else run_single
+        committed, outcomes, latencies, wall = runner(pool, dept, args, args.cap)
+        loads = _loads(pool, dept)
+    finally:
+        if not args.keep:
+            _cleanup(pool, dept)
+        pool.closeall()
+
+    # --- INVARIANTS ---
+    violations = []
+    over = {t: n for t, n in loads.items() if n > args.cap}
+    if over:
+        violations.append(f"over-allocated teachers: {over}")
+    drift = {t: (loads[t], committed.get(t, 0)) for t in loads if loads[t] != committed.get(t, 0)}
+    if drift:
+        violations.append(f"total_projects != committed allocations: {drift}")
+    if outcomes["no_mentor"] and sum(committed.values()) < capacity:
+        violations.append(f"'no mentor' reported with {capacity - sum(committed.values())} free slots")
+
+    # --- REPORT ---
+    used = sorted(loads.values())
+    p = sorted(latencies)
+    print(f"🧪 strategy={args.strategy} threads={args.threads} teachers={args.teachers} cap={args.cap}")
+    print(f"   outcomes: {dict(outcomes)}  ({len(latencies) / wall:.0f} tx/s over {wall:.2f}s)")
+    print(f"   latency: p50={p[len(p) // 2] * 1000:.1f}ms p99={p[min(len(p) - 1, int(len(p) * 0.99))] * 1000:.1f}ms")
+    print(f"   load: min={used[0]} max={used[-1]} stdev={statistics.pstdev(used):.2f} used={sum(used)}/{capacity}")
+
+    if violations:
+        for v in violations:
+            print(f"❌ {v}")
+        sys.exit(1)
+    print("✅ No over-allocation; counters match committed allocations.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Query-plan regression check for the hot API queries.
+
+Prepares each query (the API runs them as prepared statements) and runs
+EXPLAIN (ANALYZE, BUFFERS) EXECUTE against a seeded local database.
+Fails (exit 1) if any plan contains a sequential scan or its median
+execution time exceeds the budget.
+
+    python seed_data.py --reset            # once, on a disposable database
+    python run_query_plan_check.py [--budget-scale 2]
+"""
+import sys
+import json
+import argparse
+import statistics
+from database import db_connection
+from auth import STUDENT_LOGIN_QUERY, TEACHER_LOGIN_QUERY
+from users_data import STUDENT_PROFILE_QUERY
+from mentor_allocator import ALLOCATE_QUERY, MAX_PROJECTS_PER_MENTOR
+from mentored_projects import MENTORED_PAGE_QUERY, MENTORED_DETAIL_QUERY, MENTORED_FIELDS, DETAIL_FIELDS, DEFAULT_LIST_FIELDS
+from pagination import DEFAULT_PAGE_SIZE, select_fields
+from project_phases import UPSERT_PHASES_QUERY, APPLY_PHASES_QUERY
+from project_status import APPLY_STATUS_QUERY
+
+# name -> (sql with $n placeholders, params(sample), budget in ms)
+# Statements that write are executed and then rolled back.
+HOT_QUERIES = {
+    "login_student": (
+        STUDENT_LOGIN_QUERY,
+        lambda s: (s['student_email'], s['password']), 2.0
+    ),
+    "login_teacher": (
+        TEACHER_LOGIN_QUERY,
+        lambda s: (s['teacher_email'], s['password']), 2.0
+    ),
+    "student_profile": (
+        STUDENT_PROFILE_QUERY,
+        lambda s: (s['student_email'],), 5.0
+    ),
+    "teacher_mentored_projects": (
+        MENTORED_PAGE_QUERY.format(columns=select_fields(None, MENTORED_FIELDS, ["submitted_project_id"], DEFAULT_LIST_FIELDS)[1]),
+        lambda s: (s['mentor_id'], -1, None, DEFAULT_PAGE_SIZE + 1), 3.0
+    ),
+    "mentored_project_detail": (
+        MENTORED_DETAIL_QUERY.format(columns=select_fields(None, DETAIL_FIELDS, ["submitted_project_id"])[1]),
+        lambda s: (s['project_id'], s['mentor_email']), 2.0
+    ),
+    "team_member_conflicts": (
+        """
+        SELECT tm.usn, t.team_name
+        FROM team_memberships tm
+        JOIN teams t ON t.team_id = tm.team_id
+        WHERE tm.usn = ANY($1)
+        """,
+        lambda s: (s['usns'],), 2.0
+    ),
+    "allocate_mentor": (
+        ALLOCATE_QUERY.replace("%(dept)s", "$1").replace("%(cap)s", "$2"),
+        lambda s: (s['dept'], MAX_PROJECTS_PER_MENTOR), 2.0
+    ),
+    "project_by_id": (
+        "SELECT submitted_project_id, project_title, project_synopsis FROM submitted_projects WHERE submitted_project_id = $1",
+        lambda s: (s['project_id'],), 1.0
+    ),
+    "update_project_status": (
+        "UPDATE submitted_projects SET status = $1 WHERE submitted_project_id = $2",
+        lambda s: ('approved', s['project_id']), 2.0
+    ),
+    "upsert_project_phases": (
+        UPSERT_PHASES_QUERY,
+        lambda s: (s['phased_project_id'], 7, None, None, None, None, None), 2.0
+    ),
+    "apply_phases_batch": (
+        APPLY_PHASES_QUERY,
+        lambda s: ([s['phased_project_id']], [7], [None], [None], [None], [None], [None]), 2.0
+    ),
+    "apply_status_batch": (
+        APPLY_STATUS_QUERY,
+        lambda s: ([s['project_id']], ['approved']), 2.0
+    ),
+    "approved_for_index": (
+        "SELECT submitted_project_id, project_title, project_synopsis FROM submitted_projects WHERE status = 'approved'",
+        lambda s: (), 30.0
+    ),
+    "claim_similarity_job": (
+        """
+        SELECT job_id FROM similarity_jobs
+        WHERE status = 'queued'
+           OR (status = 'running' AND started_at < now() - make_interval(secs => $1) AND attempts < $2)
+        ORDER BY job_id
+        LIMIT 1
+        FOR UPDATE SKIP LOCKED
+        """,
+        lambda s: (300, 3), 1.0
+    ),
+}
+
+def sample_params(cursor):
+    """Real keys from the seeded data, so every query touches actual rows."""
+    cursor.execute("SELECT email, usn, dept FROM team_memberships ORDER BY team_id DESC LIMIT 4")
+    members = cursor.fetchall()
+    cursor.execute("""
+        SELECT sp.mentor_id, sp.submitted_project_id, te.email AS mentor_email
+        FROM submitted_projects sp JOIN teachers te ON te.teacher_id = sp.mentor_id
+        ORDER BY sp.submitted_project_id DESC LIMIT 1
+    """)
+    project = cursor.fetchone()
+    cursor.execute("SELECT submitted_project_id FROM project_phases ORDER BY submitted_project_id DESC LIMIT 1")
+    phased = cursor.fetchone()
+    cursor.execute("SELECT email, password FROM teachers ORDER BY teacher_id DESC LIMIT 1")
+    teacher = cursor.fetchone()
+    # Checked before members[0] is read, so an unseeded database exits cleanly
+    if not (members and project and phased and teacher):
+        raise SystemExit("❌ Database looks empty. Run seed_data.py first.")
+
+    cursor.execute("SELECT password FROM students WHERE email = %s", (members[0]['email'],))
+    student = cursor.fetchone()
+    if not student:
+        raise SystemExit(f"❌ No student account for {members[0]['email']}. Run seed_data.py first.")
+    return {
+        "student_email": members[0]['email'],
+        "password": student['password'],
+        "teacher_email": teacher['email'],
+        "usns": [m['usn'] for m in members],
+        "dept": members[0]['dept'],
+        "mentor_id": project['mentor_id'],
+        "project_id": project['submitted_project_id'],
+        "mentor_email": project['mentor_email'],
+        "phased_project_id": phased['submitted_project_id'],
+    }
+
+def _plan_nodes(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _plan_nodes(child)
+
+def explain(conn, sql, params, runs):
+    """Returns (median execution ms, seq-scanned relations, shared buffers hit+read)."""
+    cursor = conn.cursor()
+    times = []
+    plan = None
+    execute = "EXECUTE hot_query" + (f"({', '.join(['%s'] * len(params))})" if params else "")
+    for _ in range(runs):
+        cursor.execute("PREPARE hot_query AS " + sql)
+        cursor.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + execute, params)
+        result = cursor.fetchone()['QUERY PLAN']
+        plan = (json.loads(result) if isinstance(result, str) else result)[0]
+        times.append(plan["Execution Time"])
+        conn.rollback() # Writes are measured, never kept
+        cursor.execute("DEALLOCATE ALL")
+
+    root = plan["Plan"]
+    seq_scans = sorted({n.get("Relation Name", "?") for n in _plan_nodes(root) if n["Node Type"] == "Seq Scan"})
+    buffers = root.get("Shared Hit Blocks", 0) + root.get("Shared Read Blocks", 0)
+    return statistics.median(times), seq_scans, buffers
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail on sequential scans or slow hot queries.")
+    parser.add_argument("--runs", type=int, default=5, help="EXPLAIN ANALYZE runs per query (median is used)")
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="Multiply every latency budget (slow CI boxes)")
+    parser.add_argument("--only", help="Comma-separated query names")
+    parser.add_argument("--generic", action="store_true",
+                        help="Check generic plans (what long-lived prepared statements may switch to)")
+    args = parser.parse_args()
+
+    names = args.only.split(",") if args.only else list(HOT_QUERIES)
+    failures = []
+
+    with db_connection() as conn:
+        params = sample_params(conn.cursor())
+        conn.rollback()
+        if args.generic:
+            conn.cursor().execute("SET plan_cache_mode = force_generic_plan")
+            conn.commit()
+
+        print(f"{'query':<28} {'median ms':>10} {'budget':>8} {'buffers':>8}  plan")
+        for name in names:
+            sql, make_params, budget = HOT_QUERIES[name]
+            budget *= args.budget_scale
+            median_ms, seq_scans, buffers = explain(conn, sql, make_params(params), args.runs)
+
+            problems = []
+            if seq_scans:
+                problems.append(f"seq scan on {', '.join(seq_scans)}")
+            if median_ms > budget:
+                problems.append("over budget")
+            status = "❌ " + "; ".join(problems) if problems else "✅"
+            print(f"{name:<28} {median_ms:>10.3f} {budget:>8.1f} {buffers:>8}  {status}")
+            if problems:
+                failures.append(name)
+
+    if failures:
+        print(f"\n❌ {len(failures)} hot queries regressed: {', '.join(failures)}")
+        sys.exit(1)
+    print(f"\n✅ All {len(names)} hot queries use indexes and are within budget.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+"""
+Canonical database schema: tables, the indexes behind every hot query,
+the team_memberships sync trigger and the dashboard change notifications.
+
+Everything is idempotent (IF NOT EXISTS / ADD COLUMN IF NOT EXISTS), so
+apply_schema() both creates a fresh database and upgrades one created by
+an older init_db.
+"""
+import psycopg2
+
+SCHEMA_LOCK_ID = 715_001
+
+# --- TABLES ---
+TABLES = [
+    '''
+    CREATE TABLE IF NOT EXISTS students (
+        student_id SERIAL PRIMARY KEY,
+        name TEXT NOT NULL,
+        usn TEXT UNIQUE NOT NULL,
+        year INTEGER NOT NULL,
+        sem INTEGER NOT NULL,
+        dept TEXT NOT NULL,
+        email TEXT UNIQUE NOT NULL,
+        password TEXT NOT NULL
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS teachers (
+        teacher_id SERIAL PRIMARY KEY,
+        name TEXT NOT NULL,
+        dept TEXT NOT NULL,
+        email TEXT UNIQUE NOT NULL,
+        password TEXT NOT NULL,
+        total_projects INTEGER NOT NULL DEFAULT 0
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS teams (
+        team_id SERIAL PRIMARY KEY,
+        team_name TEXT UNIQUE NOT NULL,
+        team_size INTEGER NOT NULL,
+        team_members JSONB NOT NULL
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS submitted_projects (
+        submitted_project_id SERIAL PRIMARY KEY,
+        team_id INTEGER REFERENCES teams(team_id),
+        project_title TEXT NOT NULL,
+        project_synopsis TEXT NOT NULL,
+        status TEXT DEFAULT 'not approved',
+        mentor_id INTEGER REFERENCES teachers(teacher_id),
+        similarity_score DOUBLE PRECISION,
+        similar_projects_id JSONB,
+        similar_project_titles JSONB,
+        similarity_description TEXT
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS project_phases (
+        phase_id SERIAL PRIMARY KEY,
+        submitted_project_id INTEGER NOT NULL REFERENCES submitted_projects(submitted_project_id),
+        phase1_marks INTEGER DEFAULT 0,
+        phase1_remarks TEXT,
+        phase2_marks INTEGER DEFAULT 0,
+        phase2_remarks TEXT,
+        phase3_marks INTEGER DEFAULT 0,
+        phase3_remarks TEXT
+    )
+    ''',
+    # Archive of past projects the similarity index is built from
+    '''
+    CREATE TABLE IF NOT EXISTS projects (
+        project_id SERIAL PRIMARY KEY,
+        title TEXT NOT NULL,
+        synopsis TEXT NOT NULL
+    )
+    ''',
+    # Similarity job queue (durable; survives restarts)
+    '''
+    CREATE TABLE IF NOT EXISTS similarity_jobs (
+        job_id SERIAL PRIMARY KEY,
+        submitted_project_id INTEGER NOT NULL REFERENCES submitted_projects(submitted_project_id),
+        status TEXT NOT NULL DEFAULT 'queued',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        last_error TEXT,
+        created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+        started_at TIMESTAMPTZ,
+        finished_at TIMESTAMPTZ
+    )
+    ''',
+    # One row per student, mirrored from teams.team_members (see MEMBERSHIP_SYNC)
+    '''
+    CREATE TABLE IF NOT EXISTS team_memberships (
+        team_id INTEGER NOT NULL REFERENCES teams(team_id) ON DELETE CASCADE,
+        usn TEXT NOT NULL,
+        email TEXT,
+        name TEXT,
+        dept TEXT,
+        CONSTRAINT team_memberships_usn_key UNIQUE (usn)
+    )
+    ''',
+]
+
+# Columns older databases were created without
+COLUMNS = [
+    "ALTER TABLE teachers ADD COLUMN IF NOT EXISTS total_projects INTEGER NOT NULL DEFAULT 0",
+    "ALTER TABLE submitted_projects ADD COLUMN IF NOT EXISTS mentor_id INTEGER REFERENCES teachers(teacher_id)",
+    "ALTER TABLE submitted_projects ADD COLUMN IF NOT EXISTS similarity_score DOUBLE PRECISION",
+    "ALTER TABLE submitted_projects ADD COLUMN IF NOT EXISTS similar_projects_id JSONB",
+    "ALTER TABLE submitted_projects ADD COLUMN IF NOT EXISTS similar_project_titles JSONB",
+    "ALTER TABLE submitted_projects ADD COLUMN IF NOT EXISTS similarity_description TEXT",
+]
+
+# --- INDEXES ---
+# name -> (definition, the queries that rely on it)
+INDEXES = {
+    "idx_submitted_projects_mentor_page": (
+        "ON submitted_projects (mentor_id, submitted_project_id)",
+        "teacher dashboard: a mentor's projects, one keyset page at a time"
+    ),
+    "idx_submitted_projects_team_id": (
+        "ON submitted_projects (team_id)",
+        "student profile: the team's project"
+    ),
+    "idx_submitted_projects_approved": (
+        "ON submitted_projects (submitted_project_id) WHERE status = 'approved'",
+        "similarity warm-up: approved submissions to index"
+    ),
+    "idx_teachers_dept_load": (
+        "ON teachers (dept, total_projects, teacher_id)",
+        "create-team: least-loaded mentor in a department"
+    ),
+    "idx_team_memberships_email": (
+        "ON team_memberships (email)",
+        "student profile: a student's team"
+    ),
+    "idx_team_memberships_team_id": (
+        "ON team_memberships (team_id)",
+        "membership sync trigger"
+    ),
+    "idx_similarity_jobs_open": (
+        "ON similarity_jobs (job_id) WHERE status IN ('queued', 'running')",
+        "similarity workers: claim the oldest open job"
+    ),
+}
+
+# Superseded by a wider index above; dropped on upgrade
+RETIRED_INDEXES = [
+    "idx_submitted_projects_mentor_id",
+]
+
+# Unique so each project has at most one phases row (and upserts can use ON CONFLICT)
+UNIQUE_INDEXES = {
+    "uq_project_phases_submitted_project_id": "ON project_phases (submitted_project_id)",
+}
+
+# --- TRIGGERS ---
+MEMBERSHIP_SYNC = [
+    '''
+    CREATE OR REPLACE FUNCTION sync_team_memberships() RETURNS trigger AS $$
+    BEGIN
+        DELETE FROM team_memberships WHERE team_id = NEW.team_id;
+        INSERT INTO team_memberships (team_id, usn, email, name, dept)
+        SELECT NEW.team_id, m->>'usn', m->>'email', m->>'name', m->>'dept'
+        FROM jsonb_array_elements(NEW.team_members) AS m;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    ''',
+    "DROP TRIGGER IF EXISTS trg_sync_team_memberships ON teams",
+    '''
+    CREATE TRIGGER trg_sync_team_memberships
+    AFTER INSERT OR UPDATE OF team_members ON teams
+    FOR EACH ROW EXECUTE FUNCTION sync_team_memberships()
+    ''',
+    # Backfill teams created before the table existed (first writer wins on legacy duplicates)
+    '''
+    INSERT INTO team_memberships (team_id, usn, email, name, dept)
+    SELECT t.team_id, m->>'usn', m->>'email', m->>'name', m->>'dept'
+    FROM teams t, jsonb_array_elements(t.team_members) AS m
+    WHERE NOT EXISTS (SELECT 1 FROM team_memberships tm WHERE tm.team_id = t.team_id)
+    ORDER BY t.team_id
+    ON CONFLICT (usn) DO NOTHING
+    ''',
+]
+
+# Dashboards subscribe to these (see change_stream.py). The payload names
+# the affected project/team and every user who should hear about it.
+CHANGE_EVENTS_CHANNEL = "dashboard_changes"
+
+CHANGE_EVENTS = [
+    f'''
+    CREATE OR REPLACE FUNCTION notify_dashboard_change() RETURNS trigger AS $$
+    DECLARE
+        project_id INTEGER;
+        team INTEGER;
+        mentors INTEGER[];
+        project_status TEXT;
+        members JSONB;
+        recipients JSONB;
+    BEGIN
+        IF TG_OP = 'UPDATE' AND OLD IS NOT DISTINCT FROM NEW THEN
+            RETURN NULL;
+        END IF;
+
+        IF TG_TABLE_NAME = 'teams' THEN
+            team := NEW.team_id;
+            members := NEW.team_members;
+            IF TG_OP = 'UPDATE' THEN
+                members := members || OLD.team_members;
+            END IF;
+            SELECT sp.submitted_project_id, ARRAY[sp.mentor_id], sp.status
+            INTO project_id, mentors, project_status
+            FROM submitted_projects sp WHERE sp.team_id = team LIMIT 1;
+        ELSE
+            IF TG_TABLE_NAME = 'submitted_projects' THEN
+                project_id := NEW.submitted_project_id;
+                team := NEW.team_id;
+                mentors := ARRAY[NEW.mentor_id];
+                project_status := NEW.status;
+                IF TG_OP = 'UPDATE' THEN
+                    mentors := mentors || OLD.mentor_id;
+                END IF;
+            ELSE
+                SELECT sp.submitted_project_id, sp.team_id, ARRAY[sp.mentor_id], sp.status
+                INTO project_id, team, mentors, project_status
+                FROM submitted_projects sp WHERE sp.submitted_project_id = NEW.submitted_project_id;
+            END IF;
+            SELECT t.team_members INTO members FROM teams t WHERE t.team_id = team;
+        END IF;
+
+        SELECT COALESCE(jsonb_agg(DISTINCT r.email), '[]'::jsonb) INTO recipients
+        FROM (
+            SELECT m->>'email' AS email FROM jsonb_array_elements(COALESCE(members, '[]'::jsonb)) AS m
+            UNION
+            SELECT te.email FROM teachers te WHERE te.teacher_id = ANY(mentors)
+        ) r
+        WHERE r.email IS NOT NULL;
+
+        PERFORM pg_notify('{CHANGE_EVENTS_CHANNEL}', jsonb_build_object(
+            'table', TG_TABLE_NAME,
+            'op', lower(TG_OP),
+            'submitted_project_id', project_id,
+            'team_id', team,
+            'status', project_status,
+            'recipients', recipients
+        )::text);
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    ''',
+] + [
+    statement
+    for table in ("submitted_projects", "project_phases", "teams")
+    for statement in (
+        f"DROP TRIGGER IF EXISTS trg_notify_{table} ON {table}",
+        f"""
+        CREATE TRIGGER trg_notify_{table}
+        AFTER INSERT OR UPDATE ON {table}
+        FOR EACH ROW EXECUTE FUNCTION notify_dashboard_change()
+        """,
+    )
+]
+
+def apply_schema(conn):
+    """Creates / upgrades every table, index and trigger, then commits."""
+    cursor = conn.cursor()
+
+    # 0. Serialize concurrent starts (several workers/instances run init_db)
+    cursor.execute("SELECT pg_advisory_xact_lock(%s)", (SCHEMA_LOCK_ID,))
+
+    # 1. Tables and late-added columns
+    for statement in TABLES + COLUMNS:
+        cursor.execute(statement)
+
+    # 2. Indexes
+    for name, (definition, _) in INDEXES.items():
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} {definition}")
+    for name in RETIRED_INDEXES:
+        cursor.execute(f"DROP INDEX IF EXISTS {name}")
+
+    # 3. Unique indexes (existing duplicates are reported, not fatal)
+    for name, definition in UNIQUE_INDEXES.items():
+        fallback = name.replace('uq_', 'idx_', 1)
+        cursor.execute("SAVEPOINT unique_index")
+        try:
+            cursor.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {name} {definition}")
+            cursor.execute(f"DROP INDEX IF EXISTS {fallback}")
+        except psycopg2.errors.UniqueViolation:
+            cursor.execute("ROLLBACK TO SAVEPOINT unique_index")
+            print(f"⚠️ {name} not created: duplicate rows exist. Clean them up and restart.")
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {fallback} {definition}")
+        cursor.execute("RELEASE SAVEPOINT unique_index")
+
+    # 4. Membership sync trigger + backfill
+    for statement in MEMBERSHIP_SYNC:
+        cursor.execute(statement)
+
+    # 5. Change notifications for live dashboards
+    for statement in CHANGE_EVENTS:
+        cursor.execute(statement)
+
+    conn.commit()
@@ -0,0 +1,79 @@
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+from database import db_connection
+from similarity_service import get_similarity_components
+from similarity_jobs import enqueue_similarity_job, notify_workers
+
+router = APIRouter()
+
+# --- Pydantic Model ---
+class ScreeningRequest(BaseModel):
+    submitted_project_ids: Optional[List[int]] = None   # None = every submitted project
+    only_unchecked: bool = False                        # Skip projects that already have a score
+    top_k: int = 3
+    verdict_threshold: Optional[float] = None           # Queue LLM verdicts for scores >= this
+
+# --- API ENDPOINT ---
+@router.post("/screen-projects")
+def screen_projects(request: ScreeningRequest):
+    """Bulk vector screening: one batched search, one bulk write-back."""
+    from src.batch_screening import screen, write_results
+
+    # An explicit empty selection screens nothing (only None means "everyone")
+    if request.submitted_project_ids == []:
+        return {"screened": 0, "verdict_job_ids": [], "results": []}
+
+    try:
+        engine, _ = get_similarity_components()
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    # 1. Fetch the proposals (connection released before the slow part)
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        query = "SELECT submitted_project_id, project_title, project_synopsis FROM submitted_projects WHERE TRUE"
+        params = []
+        if request.submitted_project_ids is not None:
+            query += " AND submitted_project_id = ANY(%s)"
+            params.append(request.submitted_project_ids)
+        if request.only_unchecked:
+            query += " AND similarity_score IS NULL"
+        cursor.execute(query + " ORDER BY submitted_project_id", params)
+        rows = [(r['submitted_project_id'], r['project_title'], r['project_synopsis']) for r in cursor.fetchall()]
+
+    if not rows:
+        return {"screened": 0, "verdict_job_ids": [], "results": []}
+
+    # 2. Batched encode + search
+    try:
+        results = screen(engine, rows, top_k=request.top_k)
+    except Exception as e:
+        print(f"❌ Batch screening failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    # 3. Bulk write-back (+ LLM verdict jobs for suspicious ones)
+    with db_connection() as conn:
+        try:
+            cursor = conn.cursor()
+            write_results(cursor, results)
+
+            job_ids = []
+            if request.verdict_threshold is not None:
+                for r in results:
+                    if r['similarity_score'] >= request.verdict_threshold:
+                        job_ids.append(enqueue_similarity_job(cursor, r['submitted_project_id']))
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            print(f"Error saving screening results: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+    if job_ids:
+        notify_workers()
+
+    return {
+        "screened": len(results),
+        "verdict_job_ids": job_ids,
+        "results": results
+    }
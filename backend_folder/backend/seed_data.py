@@ -0,0 +1,161 @@
+"""
+Deterministic synthetic dataset for local performance work (query-plan
+checks, load tests). Never run against a real database: --reset wipes
+every table.
+
+    python seed_data.py --reset --students 20000 --teachers 2000
+
+Seeded logins follow a fixed pattern so harnesses can use them:
+    student<n>@seed.edu / teacher<n>@seed.edu, password SEED_PASSWORD
+"""
+import io
+import csv
+import json
+import time
+import random
+import argparse
+from database import db_connection
+from schema import apply_schema
+from mentor_allocator import MAX_PROJECTS_PER_MENTOR
+
+SEED_PASSWORD = "seed-password"
+DEPTS = ["CSE", "ISE", "ECE", "EEE", "MECH", "CIVIL", "AIML", "DS"]
+
+_TOPICS = ["traffic", "crop", "attendance", "parking", "energy", "waste", "health", "library",
+           "water", "campus", "retail", "air quality", "sign language", "fraud", "disaster"]
+_METHODS = ["deep learning", "IoT sensors", "computer vision", "blockchain", "NLP",
+            "reinforcement learning", "edge computing", "graph analytics", "AR", "drones"]
+_GOALS = ["monitoring", "prediction", "optimization", "automation", "detection", "recommendation"]
+
+SEEDED_TABLES = ["similarity_jobs", "project_phases", "submitted_projects", "team_memberships",
+                 "teams", "students", "teachers", "projects"]
+
+def project_text(rng):
+    """A (title, synopsis) pair from a small vocabulary, so similarity has something to find."""
+    topic, method, goal = rng.choice(_TOPICS), rng.choice(_METHODS), rng.choice(_GOALS)
+    title = f"{topic.title()} {goal.title()} using {method}"
+    synopsis = (f"This project applies {method} to {topic} {goal}. "
+                f"It collects {topic} data, trains a model for {goal} and "
+                f"presents results on a dashboard for {rng.choice(_TOPICS)} stakeholders.")
+    return title, synopsis
+
+def _copy(cursor, table, columns, rows):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+def reset(conn):
+    cursor = conn.cursor()
+    cursor.execute(f"TRUNCATE {', '.join(SEEDED_TABLES)} RESTART IDENTITY CASCADE")
+    conn.commit()
+
+def seed(conn, students=20000, teachers=2000, team_size=4, teamed_ratio=0.8,
+         approved_ratio=0.3, archive=2000, seed=42):
+    """Loads the dataset with COPY and returns row counts per table."""
+    rng = random.Random(seed)
+    cursor = conn.cursor()
+
+    # 1. Teachers and students (ids are explicit so teams can reference them)
+    teacher_rows = [(t, f"Teacher {t}", DEPTS[t % len(DEPTS)], f"teacher{t}@seed.edu", SEED_PASSWORD)
+                    for t in range(1, teachers + 1)]
+    _copy(cursor, "teachers", ["teacher_id", "name", "dept", "email", "password"], teacher_rows)
+
+    # Consecutive students share a department, so each seeded team is single-department
+    student_rows = [(s, f"Student {s}", f"SEED{s:06d}", rng.randint(1, 4), rng.randint(1, 8),
+                     DEPTS[(s - 1) // team_size % len(DEPTS)], f"student{s}@seed.edu", SEED_PASSWORD)
+                    for s in range(1, students + 1)]
+    _copy(cursor, "students", ["student_id", "name", "usn", "year", "sem", "dept", "email", "password"], student_rows)
+
+    # 2. Teams (the membership trigger fills team_memberships)
+    team_count = int(students * teamed_ratio) // team_size
+    team_rows = []
+    for t in range(1, team_count + 1):
+        members = [{"name": row[1], "usn": row[2], "email": row[6], "dept": row[5]}
+                   for row in student_rows[(t - 1) * team_size:t * team_size]]
+        team_rows.append((t, f"Seed Team {t}", len(members), json.dumps(members)))
+    _copy(cursor, "teams", ["team_id", "team_name", "team_size", "team_members"], team_rows)
+
+    # 3. One project per team, mentored within the lead's department under the cap
+    mentors_by_dept = {d: [row[0] for row in teacher_rows if row[2] == d] for d in DEPTS}
+    load = {row[0]: 0 for row in teacher_rows}
+    project_rows, phase_rows = [], []
+    for team_id, _, _, members_json in team_rows:
+        dept = json.loads(members_json)[0]["dept"]
+        candidates = [m for m in mentors_by_dept[dept] if load[m] < MAX_PROJECTS_PER_MENTOR]
+        mentor_id = min(candidates, key=lambda m: load[m]) if candidates else None
+        if mentor_id:
+            load[mentor_id] += 1
+
+        title, synopsis = project_text(rng)
+        roll = rng.random()
+        status = "approved" if roll < approved_ratio else "rejected" if roll < approved_ratio + 0.1 else "not approved"
+        project_rows.append((team_id, team_id, title, synopsis, status, mentor_id, round(rng.uniform(5, 95), 2),
+                             json.dumps([{"source": "archive", "id": rng.randint(1, max(1, archive))} for _ in range(3)]),
+                             json.dumps([project_text(rng)[0] for _ in range(3)]),
+                             json.dumps({"verdict": {"status": "Unique", "score": 10}})))
+        if status == "approved":
+            phase_rows.append((team_id, rng.randint(0, 10), "Seeded remark",
+                               rng.randint(0, 10), "Seeded remark", 0, "Seeded remark"))
+
+    _copy(cursor, "submitted_projects",
+          ["submitted_project_id", "team_id", "project_title", "project_synopsis", "status", "mentor_id",
+           "similarity_score", "similar_projects_id", "similar_project_titles", "similarity_description"],
+          project_rows)
+    _copy(cursor, "project_phases",
+          ["submitted_project_id", "phase1_marks", "phase1_remarks", "phase2_marks", "phase2_remarks",
+           "phase3_marks", "phase3_remarks"],
+          phase_rows)
+
+    # 4. Finished similarity jobs (the queue is mostly history in production)
+    _copy(cursor, "similarity_jobs", ["submitted_project_id", "status", "attempts"],
+          [(row[0], "done", 1) for row in project_rows])
+
+    # 5. Archive of past projects (what the similarity index is built from)
+    _copy(cursor, "projects", ["project_id", "title", "synopsis"],
+          [(p, *project_text(rng)) for p in range(1, archive + 1)])
+
+    # 6. Keep counters and sequences consistent with the explicit ids
+    cursor.execute("""
+        UPDATE teachers t SET total_projects = c.n
+        FROM (SELECT mentor_id, COUNT(*) AS n FROM submitted_projects WHERE mentor_id IS NOT NULL GROUP BY mentor_id) c
+        WHERE t.teacher_id = c.mentor_id
+    """)
+    for table, column in [("teachers", "teacher_id"), ("students", "student_id"), ("teams", "team_id"),
+                          ("submitted_projects", "submitted_project_id"), ("projects", "project_id")]:
+        cursor.execute(f"SELECT setval(pg_get_serial_sequence('{table}', '{column}'), "
+                       f"GREATEST((SELECT MAX({column}) FROM {table}), 1))")
+    conn.commit()
+
+    # 7. Fresh statistics, so plans reflect the seeded sizes
+    conn.autocommit = True
+    try:
+        cursor.execute("ANALYZE")
+    finally:
+        conn.autocommit = False
+
+    return {
+        "teachers": len(teacher_rows), "students": len(student_rows), "teams": len(team_rows),
+        "submitted_projects": len(project_rows), "project_phases": len(phase_rows),
+        "similarity_jobs": len(project_rows), "projects": archive
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a local database with synthetic data.")
+    parser.add_argument("--students", type=int, default=20000)
+    parser.add_argument("--teachers", type=int, default=2000)
+    parser.add_argument("--archive", type=int, default=2000, help="Rows in the projects archive")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="TRUNCATE every table first")
+    args = parser.parse_args()
+
+    with db_connection() as conn:
+        apply_schema(conn)
+        if args.reset:
+            reset(conn)
+        start = time.perf_counter()
+        counts = seed(conn, students=args.students, teachers=args.teachers, archive=args.archive, seed=args.seed)
+    print(f"🌱 Seeded {counts} in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from fastapi import APIRouter, HTTPException
+from database import get_pool
+from async_database import async_db_connection
+from similarity_service import perform_similarity_check
+
+router = APIRouter()
+
+# --- SETTINGS ---
+WORKER_COUNT = int(os.getenv("SIMILARITY_WORKERS", "2"))
+POLL_SECONDS = float(os.getenv("SIMILARITY_POLL_SECONDS", "2"))
+MAX_ATTEMPTS = int(os.getenv("SIMILARITY_MAX_ATTEMPTS", "3"))
+# A 'running' job older than this is assumed orphaned (worker/process died)
+LEASE_SECONDS = int(os.getenv("SIMILARITY_LEASE_SECONDS", "300"))
+
+_workers = []
+_stop = threading.Event()
+_wake = threading.Event()
+
+# --------------------------
+# QUEUE OPERATIONS
+# --------------------------
+
+def enqueue_similarity_job(cursor, submitted_project_id):
+    """Adds a job inside the caller's transaction, so it commits with the project."""
+    cursor.execute("""
+        INSERT INTO similarity_jobs (submitted_project_id)
+        VALUES (%s)
+        RETURNING job_id
+    """, (submitted_project_id,))
+    return cursor.fetchone()['job_id']
+
+def notify_workers():
+    """Wakes idle workers in this process instead of waiting for the next poll."""
+    _wake.set()
+
+def _claim_job(conn):
+    """Atomically takes the oldest runnable job. Returns None when the queue is empty."""
+    cursor = conn.cursor()
+
+    # 1. Expired leases that already used every attempt (e.g. the job keeps
+    #    crashing its worker process) are given up instead of reclaimed forever
+    cursor.execute("""
+        UPDATE similarity_jobs
+        SET status = 'failed', finished_at = now(),
+            last_error = COALESCE(last_error, 'Lease expired on every attempt (worker died?)')
+        WHERE status = 'running'
+          AND started_at < now() - make_interval(secs => %s)
+          AND attempts >= %s
+        RETURNING job_id
+    """, (LEASE_SECONDS, MAX_ATTEMPTS))
+    for row in cursor.fetchall():
+        print(f"❌ Similarity job {row['job_id']} failed: lease expired after {MAX_ATTEMPTS} attempts.")
+
+    # 2. Oldest queued job, or an orphaned one with attempts left
+    cursor.execute("""
+        UPDATE similarity_jobs
+        SET status = 'running', attempts = attempts + 1, started_at = now()
+        WHERE job_id = (
+            SELECT job_id FROM similarity_jobs
+            WHERE status = 'queued'
+               OR (status = 'running' AND started_at < now() - make_interval(secs => %s) AND attempts < %s)
+            ORDER BY job_id
+            LIMIT 1
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING job_id, submitted_project_id, attempts
+    """, (LEASE_SECONDS, MAX_ATTEMPTS))
+    job = cursor.fetchone()
+    conn.commit()
+    return job
+
+@contextmanager
+def _pooled_connection():
+    """Borrows a pool connection for one short step (db_connection() raises HTTPException)."""
+    conn = get_pool().getconn()
+    try:
+        yield conn
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        get_pool().putconn(conn)
+
+def _load_project(conn, submitted_project_id):
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT project_title, project_synopsis
+        FROM submitted_projects
+        WHERE submitted_project_id = %s
+    """, (submitted_project_id,))
+    project = cursor.fetchone()
+    conn.commit()
+    return project
+
+def _save_result(conn, job, results):
+    cursor = conn.cursor()
+    cursor.execute("""
+        UPDATE submitted_projects
+        SET similarity_score = %s,
+            similar_projects_id = %s,
+            similar_project_titles = %s,
+            similarity_description = %s
+        WHERE submitted_project_id = %s
+    """, (
+        results.get('similarity_score', 0),
+        json.dumps(results.get('similar_projects_id', [])),
+        json.dumps(results.get('similar_project_titles', [])),
+        results.get('similarity_description', ""),
+        job['submitted_project_id']
+    ))
+    cursor.execute("""
+        UPDATE similarity_jobs
+        SET status = 'done', finished_at = now(), last_error = NULL
+        WHERE job_id = %s
+    """, (job['job_id'],))
+    conn.commit()
+
+def _finish_job(conn, job_id, status, error):
+    cursor = conn.cursor()
+    cursor.execute("""
+        UPDATE similarity_jobs
+        SET status = %s, finished_at = now(), last_error = %s
+        WHERE job_id = %s
+    """, (status, error, job_id))
+    conn.commit()
+
+def _run_job(job):
+    # 1. Read the project, then give the connection back
+    with _pooled_connection() as conn:
+        project = _load_project(conn, job['submitted_project_id'])
+        if not project:
+            _finish_job(conn, job['job_id'], 'failed', "Project not found")
+            return
+
+    # 2. Slow part: embedding search + LLM verdict, holding no connection so
+    #    the API keeps the pool. Failures raise and the worker loop requeues
+    #    the job until MAX_ATTEMPTS.
+    results = perform_similarity_check(
+        project['project_title'], project['project_synopsis'],
+        submitted_project_id=job['submitted_project_id'], raise_errors=True
+    )
+
+    # 3. Borrow again only to write the result
+    with _pooled_connection() as conn:
+        _save_result(conn, job, results)
+
+# --------------------------
+# WORKER POOL
+# --------------------------
+
+def _worker_loop():
+    while not _stop.is_set():
+        job = None
+        try:
+            with _pooled_connection() as conn:
+                job = _claim_job(conn)
+            if job:
+                print(f"🧵 Similarity job {job['job_id']} (project {job['submitted_project_id']}) started.")
+                _run_job(job)
+                print(f"✅ Similarity job {job['job_id']} done.")
+        except Exception as e:
+            print(f"❌ Similarity job error: {e}")
+            if job:
+                try:
+                    # Retry later unless we are out of attempts
+                    status = 'failed' if job['attempts'] >= MAX_ATTEMPTS else 'queued'
+                    with _pooled_connection() as conn:
+                        _finish_job(conn, job['job_id'], status, str(e))
+                except Exception as inner:
+                    print(f"❌ Could not record job failure: {inner}")
+
+        if not job:
+            # Queue empty (or DB down): sleep until woken or the next poll
+            _wake.wait(POLL_SECONDS)
+            _wake.clear()
+
+def start_workers():
+    """Starts the background worker pool. Jobs left over from a restart are picked up."""
+    if _workers:
+        return
+    _stop.clear()
+    for i in range(WORKER_COUNT):
+        worker = threading.Thread(target=_worker_loop, name=f"similarity-worker-{i}", daemon=True)
+        worker.start()
+        _workers.append(worker)
+    print(f"🧵 Started {WORKER_COUNT} similarity workers.")
+
+def stop_workers(timeout=5):
+    _stop.set()
+    _wake.set()
+    for worker in _workers:
+        worker.join(timeout)
+    _workers.clear()
+
+# --------------------------
+# JOB STATUS ROUTE
+# --------------------------
+
+@router.get("/similarity-jobs/{job_id}")
+async def get_similarity_job(job_id: int):
+    async with async_db_connection() as conn:
+        try:
+            job = await conn.fetchrow("""
+                SELECT
+                    j.job_id, j.submitted_project_id, j.status, j.attempts, j.last_error,
+                    j.created_at, j.started_at, j.finished_at,
+                    sp.similarity_score, sp.similar_projects_id, sp.similar_project_titles
+                FROM similarity_jobs j
+                JOIN submitted_projects sp ON sp.submitted_project_id = j.submitted_project_id
+                WHERE j.job_id = $1
+            """, job_id)
+            if not job:
+                raise HTTPException(status_code=404, detail="Job not found")
+            return dict(job)
+        except HTTPException as he:
+            raise he
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
@@ -1,7 +1,10 @@
 import sys
 import os
 import json
+import time
+import threading
 from dotenv import load_dotenv
+from metrics import stage_timer
 
 # --- PATH SETUP ---
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -21,38 +24,238 @@ def remove_emojis(text):
     if not text: return ""
     return text.encode('ascii', 'ignore').decode('ascii')
 
-def perform_similarity_check(title: str, synopsis: str):
-    print(f"🔄 Starting Similarity Check for: {title}")
-    
-    try:
-        from src.vector_engine import VectorEngine
-        from src.llm_judge import GeminiJudge
-    except ImportError as e:
-        print(f"❌ Critical Import Error: {e}")
-        return {
-            "similarity_score": 0,
-            "similar_projects_id": [],
-            "similar_project_titles": [], # Added this
-            "similarity_description": json.dumps({"error": f"Import Failed: {e}"})
+# --- SHARED ENGINE ---
+# The embedding model, FAISS index and LLM client are loaded once per process
+# and reused by every request, so a check only pays for encode + search.
+_engine = None
+_judge = None
+_engine_lock = threading.Lock()
+_ready = threading.Event()
+_status = {"state": "cold", "error": None, "load_seconds": None, "index_size": 0}
+
+def warm_up():
+    """Loads the VectorEngine, its index and the judge. Safe to call repeatedly."""
+    global _engine, _judge
+
+    with _engine_lock:
+        if _ready.is_set():
+            return
+
+        _status.update(state="loading", error=None)
+        started = time.perf_counter()
+        print("🔥 Warming up similarity engine...")
+
+        try:
+            from src.vector_engine import VectorEngine
+            from src.llm_judge import BackgroundJudge
+
+            # The model is kept even if the index is missing, so a later
+            # retry (after run_indexer.py) only has to read the index files.
+            if _engine is None:
+                _engine = VectorEngine()
+            if _engine.index is None and not _engine.load_index():
+                raise FileNotFoundError("Index not found")
+            if _judge is None:
+                # Async client on its own loop: bounded concurrency, retries, circuit breaker
+                _judge = BackgroundJudge()
+
+            # First encode triggers lazy torch initialisation; pay it here.
+            _engine.encoder.encode(["warm up"])
+
+            # Approved submissions that aren't in the on-disk index yet
+            # (approved since the last compaction/restart) go into the delta.
+            _sync_approved_projects(_engine)
+            _engine.start_background_compaction()
+        except Exception as e:
+            _status.update(state="failed", error=str(e))
+            print(f"❌ Similarity engine warm-up failed: {e}")
+            return
+
+        _status.update(
+            state="ready",
+            load_seconds=round(time.perf_counter() - started, 3),
+            index_size=_engine.size()
+        )
+        _ready.set()
+        print(f"✅ Similarity engine ready ({_status['index_size']} vectors, {_status['load_seconds']}s).")
+
+def start_warm_up():
+    """Warms the engine on a background thread so app startup is not blocked."""
+    threading.Thread(target=warm_up, name="similarity-warm-up", daemon=True).start()
+
+def shut_down():
+    """Stops background compaction, persists any pending delta and stops the judge loop."""
+    if _engine is not None and _engine.index is not None:
+        _engine.stop_background_compaction()
+        _engine.compact()
+    if _judge is not None:
+        _judge.close()
+
+def get_similarity_components():
+    """Returns the shared (engine, judge) pair, loading them on first use."""
+    if not _ready.is_set():
+        warm_up()
+    if not _ready.is_set():
+        raise RuntimeError(_status["error"] or "Similarity engine not ready")
+    return _engine, _judge
+
+def readiness():
+    """Snapshot of the warm-up state for the /ready endpoint."""
+    return {"ready": _ready.is_set(), **_status}
+
+def telemetry_snapshot():
+    """Live index / cache / judge numbers for /metrics. Never triggers a load."""
+    snapshot = {"ready": _ready.is_set(), "load_seconds": _status["load_seconds"], "index": None, "judge": None}
+    if _ready.is_set():
+        snapshot["index"] = {
+            "vectors": _engine.size(),
+            "delta": len(_engine.delta_metadata),
+            "tombstones": len(_engine.tombstones),
+            "embedding_cache": _engine.cache.stats() if _engine.cache else None
         }
+        snapshot["judge"] = _judge.stats()
+    return snapshot
+
+# --- LIVE INDEX UPDATES ---
+# Approved submissions share the index with the legacy `projects` archive.
+# Their vector ids are offset so they can't collide with archive ids; the
+# metadata still carries the real submitted_project_id.
+SUBMITTED_ID_OFFSET = 1 << 32
 
+def _sync_approved_projects(engine):
     try:
-        # 1. Initialize Vector Engine
-        engine = VectorEngine()
-        if not engine.load_index():
-            print("⚠️ Index not found. Skipping check.")
-            return {
-                "similarity_score": 0,
-                "similar_projects_id": [],
-                "similar_project_titles": [], # Added this
-                "similarity_description": json.dumps({"error": "Index not found"})
+        from database import db_connection
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT submitted_project_id, project_title, project_synopsis
+                FROM submitted_projects
+                WHERE status = 'approved'
+            """)
+            rows = cursor.fetchall()
+    except Exception as e:
+        print(f"⚠️ Could not sync approved projects into the index: {e}")
+        return
+
+    # Reconcile both ways with the database, so a change that never reached
+    # this snapshot (e.g. made while no worker was up) is repaired here
+    missing = [r for r in rows if not engine.contains(SUBMITTED_ID_OFFSET + r['submitted_project_id'])]
+    if missing:
+        _upsert_submitted(engine, missing)
+        print(f"➕ Indexed {len(missing)} approved submissions.")
+
+    approved = {SUBMITTED_ID_OFFSET + r['submitted_project_id'] for r in rows}
+    stale = [pid for pid in engine.live_ids(SUBMITTED_ID_OFFSET) if pid not in approved]
+    if stale:
+        engine.delete_many(stale)
+        print(f"➖ Removed {len(stale)} submissions that are no longer approved.")
+
+def _upsert_submitted(engine, rows):
+    # One encode call and one delta insert for all rows
+    engine.upsert_many(
+        [(SUBMITTED_ID_OFFSET + r['submitted_project_id'], r['project_title'], r['project_synopsis']) for r in rows],
+        [{"id": r['submitted_project_id'], "source": "submitted"} for r in rows]
+    )
+
+def index_submitted_project(submitted_project_id, title, synopsis):
+    """Makes an approved submission searchable right away (delta segment)."""
+    engine, _ = get_similarity_components()
+    engine.upsert(
+        SUBMITTED_ID_OFFSET + submitted_project_id, title, synopsis,
+        {"id": submitted_project_id, "source": "submitted"}
+    )
+
+def unindex_submitted_project(submitted_project_id):
+    engine, _ = get_similarity_components()
+    return engine.delete(SUBMITTED_ID_OFFSET + submitted_project_id)
+
+def index_submitted_projects(rows):
+    """Batch form of index_submitted_project for rows with submitted_project_id, project_title, project_synopsis."""
+    if rows:
+        engine, _ = get_similarity_components()
+        _upsert_submitted(engine, rows)
+
+def unindex_submitted_projects(submitted_project_ids):
+    if not submitted_project_ids:
+        return 0
+    engine, _ = get_similarity_components()
+    return engine.delete_many([SUBMITTED_ID_OFFSET + pid for pid in submitted_project_ids])
+
+def _empty_result(error):
+    return {
+        "similarity_score": 0,
+        "similar_projects_id": [],
+        "similar_project_titles": [],
+        "similarity_description": json.dumps({"error": error})
+    }
+
+def _duplicate_result(duplicates):
+    from src.metadata_store import match_ref
+
+    top = duplicates[0]
+    verdict = {
+        "analysis": "The proposal is a verbatim or lightly edited copy of an existing project.",
+        "comparison": [
+            {
+                "match_name": d.get('name', 'Unknown Title'),
+                "similarity_note": f"{d['jaccard']:.0%} of word shingles are identical."
             }
-            
-        # 2. Initialize Judge
-        judge = GeminiJudge()
+            for d in duplicates
+        ],
+        "verdict": {
+            "status": "Plagiarized",
+            "score": round(top['similarity']),
+            "reasoning": f"Near-exact copy of '{top.get('name')}' detected before semantic review."
+        },
+        "stage": "near-duplicate"
+    }
+    return {
+        "similarity_score": float(top['similarity']),
+        "similar_projects_id": [match_ref(d) for d in duplicates],
+        "similar_project_titles": [d.get('name', 'Unknown Title') for d in duplicates],
+        "similarity_description": remove_emojis(json.dumps(verdict))
+    }
+
+class SimilarityCheckError(Exception):
+    """No real verdict could be produced (engine not loaded, LLM outage); worth retrying later."""
+
+def perform_similarity_check(title: str, synopsis: str, submitted_project_id: int = None, raise_errors: bool = False):
+    """
+    Returns the similarity payload. Pass the submission's id so that, once it
+    is approved and indexed, a re-check doesn't match the project itself.
+    Failures come back as an error payload, or raise SimilarityCheckError
+    with raise_errors=True (the job queue retries those instead of storing
+    the error as a result).
+    """
+    with stage_timer("similarity_check"):
+        return _similarity_check(title, synopsis, submitted_project_id, raise_errors)
+
+def _similarity_check(title, synopsis, submitted_project_id=None, raise_errors=False):
+    print(f"🔄 Starting Similarity Check for: {title}")
+
+    # 1. Get the resident engine & judge
+    try:
+        engine, judge = get_similarity_components()
+    except Exception as e:
+        print(f"⚠️ Similarity engine unavailable: {e}. Skipping check.")
+        if raise_errors:
+            raise SimilarityCheckError(f"Similarity engine unavailable: {e}") from e
+        return _empty_result(str(e))
+
+    from src.metadata_store import match_ref
+
+    # The submission's own vector (if approved) is never evidence against it
+    own_id = SUBMITTED_ID_OFFSET + submitted_project_id if submitted_project_id is not None else None
+
+    try:
+        # 2. Near-duplicate pre-stage: copies get a deterministic verdict, no model/LLM call
+        duplicates = engine.near_duplicates(title, synopsis, exclude=own_id)
+        if duplicates:
+            print(f"🚩 Near-duplicate of '{duplicates[0].get('name')}' ({duplicates[0]['jaccard']:.0%} shingle overlap).")
+            return _duplicate_result(duplicates[:3])
 
         # 3. Vector Search
-        matches = engine.search(title, synopsis)
+        matches = engine.search(title, synopsis, exclude=own_id)
         
         # 4. Extract IDs AND Titles directly from the matches
         top_score = float(matches[0].get('similarity', 0)) if matches else 0.0
@@ -62,14 +265,19 @@ def perform_similarity_check(title: str, synopsis: str):
         
         if matches:
             for m in matches:
-                # Get ID
-                match_ids.append(m.get('id'))
+                # Get ID (archive and submitted ids overlap, so keep the source)
+                match_ids.append(match_ref(m))
                 # Get Title (key is 'name' in vector engine metadata)
                 match_titles.append(m.get('name', 'Unknown Title'))
 
         # 5. Get AI Verdict
         print("⚖️ Asking AI Judge...")
-        raw_verdict = judge.get_verdict({"title": title, "synopsis": synopsis}, matches)
+        with stage_timer("llm_verdict"):
+            raw_verdict = judge.get_verdict({"title": title, "synopsis": synopsis}, matches)
+        if raise_errors:
+            from src.llm_judge import is_error_verdict
+            if is_error_verdict(raw_verdict):
+                raise SimilarityCheckError(json.loads(raw_verdict)["error"])
         clean_verdict = remove_emojis(raw_verdict)
 
         print("✅ Check Complete.")
@@ -81,11 +289,10 @@ def perform_similarity_check(title: str, synopsis: str):
             "similarity_description": clean_verdict 
         }
 
+    except SimilarityCheckError:
+        raise
     except Exception as e:
         print(f"❌ Check Failed: {e}")
-        return {
-            "similarity_score": 0,
-            "similar_projects_id": [],
-            "similar_project_titles": [],
-            "similarity_description": json.dumps({"error": str(e)})
-        }
\ No newline at end of file
+        if raise_errors:
+            raise SimilarityCheckError(str(e)) from e
+        return _empty_result(str(e))
@@ -26,9 +26,8 @@ if similarity_dir not in sys.path:
 
 # --- 2. IMPORT MODULES ---
 try:
-    from src.vector_engine import VectorEngine
-    from src.llm_judge import GeminiJudge
-    print("✅ Successfully imported VectorEngine and GeminiJudge")
+    from similarity_service import get_similarity_components, start_warm_up, readiness
+    print("✅ Successfully imported similarity service")
 except ImportError as e:
     print(f"❌ Critical Import Error: {e}")
     sys.exit(1) # Stop app if we can't import
@@ -46,9 +45,13 @@ class ProjectRequest(BaseModel):
     title: str
     synopsis: str
 
+@app.on_event("startup")
+def on_startup():
+    start_warm_up()
+
 @app.get("/")
 def health_check():
-    return {"status": "active", "message": "AI Test API is up and running"}
+    return {"status": "active", "message": "AI Test API is up and running", "engine": readiness()}
 
 @app.post("/test-similarity")
 def check_similarity_endpoint(request: ProjectRequest):
@@ -58,13 +61,11 @@ def check_similarity_endpoint(request: ProjectRequest):
     print(f"\n📨 Received Request: {request.title}")
     
     try:
-        # A. Initialize Engine
-        engine = VectorEngine()
-        if not engine.load_index():
-            raise HTTPException(status_code=500, detail="Vector Index not found in similarity_check folder")
-
-        # B. Initialize Judge
-        judge = GeminiJudge()
+        # A + B. Shared Engine & Judge (loaded once per process)
+        try:
+            engine, judge = get_similarity_components()
+        except RuntimeError as e:
+            raise HTTPException(status_code=503, detail=str(e))
 
         # C. Perform Search
         matches = engine.search(request.title, request.synopsis)
@@ -92,6 +93,8 @@ def check_similarity_endpoint(request: ProjectRequest):
             "ai_response": verdict_json
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"❌ Error processing request: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,47 @@
+import argparse
+import json
+from src.database import DatabaseHandler
+from src.vector_engine import VectorEngine
+from src.batch_screening import screen
+
+def main():
+    parser = argparse.ArgumentParser(description="Screen a whole semester of submitted projects in bulk.")
+    parser.add_argument("--ids", help="Comma-separated submitted_project_ids (default: all)")
+    parser.add_argument("--unchecked", action="store_true", help="Only projects without a similarity score yet")
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--dry-run", action="store_true", help="Print results instead of writing them")
+    args = parser.parse_args()
+
+    print("--- 🗂️  STARTING BATCH SCREENING ---")
+
+    # 1. Load engine
+    engine = VectorEngine()
+    if not engine.load_index():
+        print("❌ Error: Index files not found. Please run 'run_indexer.py' first.")
+        return
+
+    # 2. Fetch proposals
+    project_ids = [int(i) for i in args.ids.split(",")] if args.ids else None
+    rows = DatabaseHandler.fetch_submitted_projects(project_ids, only_unchecked=args.unchecked)
+    if not rows:
+        print("⚠️ Nothing to screen. Exiting.")
+        return
+
+    # 3. Batched vector search
+    results = screen(engine, rows, top_k=args.top_k)
+
+    flagged = [r for r in results if r['similarity_score'] > 30]
+    print(f"\n--- 🤖 {len(flagged)} of {len(results)} PROJECTS ABOVE 30% SIMILARITY ---")
+    for r in sorted(flagged, key=lambda r: -r['similarity_score'])[:20]:
+        print(f"   #{r['submitted_project_id']}: {r['similarity_score']}% ~ {r['similar_project_titles'][:1]}")
+
+    # 4. Write back in bulk
+    if args.dry_run:
+        print(json.dumps(results, indent=2))
+    else:
+        DatabaseHandler.save_screening_results(results)
+
+    print("\n✅ BATCH SCREENING COMPLETE.")
+
+if __name__ == "__main__":
+    main()
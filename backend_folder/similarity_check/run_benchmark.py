@@ -0,0 +1,234 @@
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+import faiss
+import numpy as np
+from src.config import Config
+from src import telemetry
+
+# --- SYNTHETIC CORPUS ---
+# Independent slots give ~millions of distinct proposals that still share
+# wording, so both FAISS neighbours and MinHash buckets look like real data.
+_TOPICS = ["traffic", "crop", "attendance", "parking", "energy", "waste", "health", "library", "water",
+           "campus", "retail", "air quality", "sign language", "fraud", "disaster", "hostel", "canteen",
+           "exam", "placement", "transport", "solar", "flood", "wildlife", "supply chain", "mental health"]
+_METHODS = ["deep learning", "IoT sensors", "computer vision", "blockchain", "NLP", "reinforcement learning",
+            "edge computing", "graph analytics", "AR", "drones", "federated learning", "RFID",
+            "time series forecasting", "speech recognition", "genetic algorithms", "microservices"]
+_GOALS = ["monitoring", "prediction", "optimization", "automation", "detection", "recommendation",
+          "scheduling", "verification", "classification", "tracking"]
+_USERS = ["students", "farmers", "city planners", "hospital staff", "shop owners", "faculty",
+          "commuters", "NGOs", "security teams", "small businesses", "parents", "researchers"]
+_FEATURES = ["a mobile app", "a web dashboard", "SMS alerts", "a chatbot", "voice commands", "offline mode",
+             "a REST API", "role-based access", "live maps", "weekly reports", "multilingual support", "QR codes"]
+
+def synthetic_project(rng):
+    topic, method, goal = rng.choice(_TOPICS), rng.choice(_METHODS), rng.choice(_GOALS)
+    title = f"{topic.title()} {goal.title()} using {method}"
+    synopsis = (f"This project applies {method} to {topic} {goal} for {rng.choice(_USERS)}. "
+                f"It collects {topic} data from {rng.randint(2, 60)} sources, trains a model for {goal} "
+                f"and delivers results through {rng.choice(_FEATURES)} and {rng.choice(_FEATURES)}. "
+                f"Evaluation uses {rng.randint(1, 12)} months of {rng.choice(_TOPICS)} records.")
+    return title, synopsis
+
+def synthetic_corpus(size, seed=42):
+    rng = random.Random(seed)
+    return [(pid, *synthetic_project(rng)) for pid in range(1, size + 1)]
+
+# --- HELPERS ---
+def parse_size(value):
+    value = value.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(value[-1:], 1)
+    return int(float(value[:-1] if scale > 1 else value) * scale)
+
+def use_data_dir(path):
+    """Points every persisted artefact (index, metadata, MinHash, embedding cache) at `path`."""
+    Config.DATA_DIR = path
+    Config.SNAPSHOT_DIR = os.path.join(path, "index")
+    Config.INDEX_PATH = os.path.join(path, "project_vectors.index")
+    Config.METADATA_PATH = os.path.join(path, "project_metadata.pkl")
+    Config.METADATA_DIR = os.path.join(path, "project_metadata")
+    Config.MINHASH_PATH = os.path.join(path, "project_minhash.npz")
+    Config.EMBEDDING_CACHE_PATH = os.path.join(path, "embedding_cache.sqlite3")
+
+def disk_bytes(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            total += os.path.getsize(os.path.join(root, name))
+    return total
+
+def percentiles(samples_ms):
+    samples = np.asarray(samples_ms)
+    return {
+        "p50_ms": round(float(np.percentile(samples, 50)), 4),
+        "p99_ms": round(float(np.percentile(samples, 99)), 4),
+        "mean_ms": round(float(samples.mean()), 4)
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+# --- ONE RUN ---
+def bench(size, index_type, encoder, queries, args):
+    from src.vector_engine import VectorEngine
+
+    data_dir = tempfile.mkdtemp(prefix=f"vecbench-{index_type}-{size}-", dir=args.work_dir)
+    use_data_dir(data_dir)
+    stages = {}
+    telemetry.set_observer(lambda stage, seconds: stages.__setitem__(stage, stages.get(stage, 0.0) + seconds))
+    try:
+        rows = synthetic_corpus(size, seed=args.seed)
+
+        # 1. Build (encode + MinHash + FAISS + save), encode time split out via the telemetry hook
+        engine = VectorEngine(index_type=index_type, encoder_backend=encoder)
+        started = time.perf_counter()
+        engine.build_index(rows)
+        build_seconds = time.perf_counter() - started
+        encode_seconds = stages.get("encode", 0.0)
+        del engine, rows
+
+        # 2. Load into a fresh engine, the way the API warms up
+        engine = VectorEngine(index_type=index_type, encoder_backend=encoder)
+        started = time.perf_counter()
+        if not engine.load_index():
+            raise RuntimeError(f"Index written to {data_dir} could not be loaded")
+        load_seconds = time.perf_counter() - started
+
+        # 3. Single queries (like /check-similarity), after a short warm-up
+        for title, synopsis in queries[:10]:
+            engine.search(title, synopsis, args.k)
+        single = []
+        for title, synopsis in queries:
+            started = time.perf_counter()
+            engine.search(title, synopsis, args.k)
+            single.append((time.perf_counter() - started) * 1000)
+
+        # 4. Batched queries (like the batch checker)
+        batched = []
+        for start in range(0, len(queries) - args.batch_size + 1, args.batch_size):
+            started = time.perf_counter()
+            engine.search_batch(queries[start:start + args.batch_size], args.k)
+            batched.append((time.perf_counter() - started) * 1000)
+
+        result = {
+            "size": size,
+            "index": index_type,
+            "encode_texts_per_s": round(size / encode_seconds, 1) if encode_seconds else None,
+            "encode_s": round(encode_seconds, 3),
+            "build_s": round(build_seconds, 3),
+            "disk_mb": round(disk_bytes(data_dir) / 2**20, 2),
+            "load_s": round(load_seconds, 4),
+            "mmapped": engine._base_mmapped,
+            "single": percentiles(single),
+            "batched": {**(percentiles(batched) if batched else {}), "batch_size": args.batch_size,
+                        "per_query_ms": round(float(np.mean(batched)) / args.batch_size, 4) if batched else None}
+        }
+        return result
+    finally:
+        telemetry.set_observer(None)
+        if not args.keep:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+# --- REPORTING ---
+def print_row(r):
+    print(f"   {r['index']:<5} {r['size']:>9,}  encode={r['encode_texts_per_s'] or 0:>9,.0f}/s  build={r['build_s']:>8.2f}s  "
+          f"disk={r['disk_mb']:>8.1f}MB  load={r['load_s'] * 1000:>8.1f}ms  "
+          f"single p50/p99={r['single']['p50_ms']:.2f}/{r['single']['p99_ms']:.2f}ms  "
+          f"batch({r['batched']['batch_size']}) p50/p99={r['batched'].get('p50_ms', 0):.2f}/{r['batched'].get('p99_ms', 0):.2f}ms")
+
+COMPARED = [("build_s", "build"), ("load_s", "load"), ("single.p50_ms", "single p50"),
+            ("single.p99_ms", "single p99"), ("batched.p50_ms", "batch p50"), ("disk_mb", "disk")]
+
+def _get(result, path):
+    for key in path.split("."):
+        result = (result or {}).get(key)
+    return result
+
+def compare(previous, results):
+    """Prints the change of each timing vs a saved run (positive = slower/bigger)."""
+    before = {(r["index"], r["size"]): r for r in previous["results"]}
+    print(f"\n📊 Compared with {previous.get('commit') or 'previous run'} ({previous.get('timestamp', '?')}):")
+    for r in results:
+        old = before.get((r["index"], r["size"]))
+        if old is None:
+            continue
+        changes = []
+        for path, label in COMPARED:
+            a, b = _get(old, path), _get(r, path)
+            if a and b is not None:
+                changes.append(f"{label} {(b - a) / a:+.0%}")
+        print(f"   {r['index']:<5} {r['size']:>9,}  " + "  ".join(changes))
+
+def main():
+    parser = argparse.ArgumentParser(description="Build / load / search benchmark for VectorEngine on a synthetic corpus.")
+    parser.add_argument("--sizes", default="1k,10k,100k", help="Corpus sizes, e.g. 1k,10k,100k,1m (1m needs ~3GB RAM)")
+    parser.add_argument("--index-types", default=Config.INDEX_TYPE, help="Comma-separated: flat,hnsw,ivf")
+    parser.add_argument("--encoder", default="hashing",
+                        help="Encoder backend (default: the offline hashing encoder; torch/onnx measure the model too)")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-minhash", action="store_true", help="Leave the MinHash stage out of build/load")
+    parser.add_argument("--embedding-cache", action="store_true", help="Keep the embedding cache on (off: encode is measured cold)")
+    parser.add_argument("--work-dir", help="Where the temporary index directories go (default: system temp)")
+    parser.add_argument("--keep", action="store_true", help="Keep the built index directories")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--compare", help="Previous --output file to diff against")
+    args = parser.parse_args()
+
+    Config.MINHASH_ENABLED = not args.no_minhash
+    Config.EMBEDDING_CACHE_ENABLED = args.embedding_cache
+    sizes = [parse_size(s) for s in args.sizes.split(",")]
+    index_types = [t.strip() for t in args.index_types.split(",")]
+
+    print(f"--- ⏱️  VECTOR ENGINE BENCHMARK: sizes={sizes}, index={index_types}, encoder={args.encoder} ---")
+    # Queries are fresh proposals (different seed), never exact copies of the corpus
+    rng = random.Random(args.seed + 1)
+    queries = [synthetic_project(rng) for _ in range(args.queries)]
+
+    results = []
+    for size in sizes:
+        for index_type in index_types:
+            print(f"\n⚙️  {index_type} @ {size:,} projects")
+            results.append(bench(size, index_type, args.encoder, queries, args))
+
+    print(f"\n📊 Results (k={args.k}, {args.queries} queries):")
+    for r in results:
+        print_row(r)
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "machine": {"platform": platform.platform(), "python": platform.python_version(),
+                    "cpus": os.cpu_count(), "faiss": faiss.__version__, "numpy": np.__version__},
+        "settings": {"encoder": args.encoder, "k": args.k, "queries": args.queries, "batch_size": args.batch_size,
+                     "seed": args.seed, "minhash": Config.MINHASH_ENABLED, "embedding_cache": Config.EMBEDDING_CACHE_ENABLED,
+                     "mmap": Config.INDEX_MMAP, "hnsw_m": Config.HNSW_M, "hnsw_ef_search": Config.HNSW_EF_SEARCH,
+                     "ivf_nprobe": Config.IVF_NPROBE},
+        "results": results
+    }
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Results saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import argparse
+import random
+import shutil
+import sys
+import tempfile
+import threading
+from src.config import Config
+from run_benchmark import use_data_dir, synthetic_corpus, synthetic_project
+
+def check(index_type, size, mmap):
+    """Load (mmapped) -> upsert/delete -> compact -> reload; returns a list of problems."""
+    from src.vector_engine import VectorEngine
+
+    data_dir = tempfile.mkdtemp(prefix=f"compaction-{index_type}-")
+    use_data_dir(data_dir)
+    Config.INDEX_MMAP = mmap
+    problems = []
+    try:
+        VectorEngine(index_type, "hashing").build_index(synthetic_corpus(size))
+        engine = VectorEngine(index_type, "hashing")
+        engine.load_index()
+
+        # 1. Mutate: new rows, a replaced row, a deleted row
+        rng = random.Random(7)
+        engine.upsert_many([(size + i, *synthetic_project(rng)) for i in range(1, 21)])
+        engine.upsert(1, "Replaced Title", "Replaced synopsis")
+        engine.delete(2)
+        expected = size + 20 - 1
+
+        # 2. Compact (this is what the background thread and shut_down do)
+        if not engine.compact():
+            problems.append("compact() reported nothing to do")
+        if engine.size() != expected:
+            problems.append(f"size after compaction {engine.size()} != {expected}")
+
+        # 3. A fresh worker sees the same state
+        reloaded = VectorEngine(index_type, "hashing")
+        reloaded.load_index()
+        if reloaded.size() != expected:
+            problems.append(f"size after reload {reloaded.size()} != {expected}")
+        if reloaded.contains(2):
+            problems.append("deleted row came back")
+        if not reloaded.contains(1) or reloaded.metadata[1]["name"] != "Replaced Title":
+            problems.append("replaced row lost its new title")
+        if not reloaded.search("Replaced Title", "Replaced synopsis", top_k=1)[0]["id"] == 1:
+            problems.append("replaced row is not its own nearest neighbour")
+    except Exception as e:
+        problems.append(f"{type(e).__name__}: {e}")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+    return problems
+
+def check_two_workers(index_type, size, mmap):
+    """
+    Two workers (own deltas, same snapshot) compact at the same time; returns
+    a list of problems. Neither may lose the other's upserts or deletes.
+    """
+    from src.vector_engine import VectorEngine
+
+    data_dir = tempfile.mkdtemp(prefix=f"compaction-2w-{index_type}-")
+    use_data_dir(data_dir)
+    Config.INDEX_MMAP = mmap
+    problems = []
+    try:
+        VectorEngine(index_type, "hashing").build_index(synthetic_corpus(size))
+        a, b = VectorEngine(index_type, "hashing"), VectorEngine(index_type, "hashing")
+        a.load_index()
+        b.load_index()
+
+        # 1. Each worker changes different rows
+        a.upsert(size + 1, "Added By A", "Only worker A saw this upsert")
+        a.delete(1)
+        b.upsert(size + 2, "Added By B", "Only worker B saw this upsert")
+        b.delete(2)
+        b.upsert(3, "Replaced By B", "Worker B replaced this row")
+        expected = size + 2 - 2
+
+        # 2. Both compact concurrently (the background threads of two processes)
+        threads = [threading.Thread(target=engine.compact) for engine in (a, b)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        # 3. The published snapshot has both workers' changes
+        reloaded = VectorEngine(index_type, "hashing")
+        reloaded.load_index()
+        if reloaded.size() != expected:
+            problems.append(f"size after reload {reloaded.size()} != {expected}")
+        for pid, label in ((size + 1, "A's upsert"), (size + 2, "B's upsert")):
+            if not reloaded.contains(pid):
+                problems.append(f"{label} was lost")
+        for pid, label in ((1, "A's delete"), (2, "B's delete")):
+            if reloaded.contains(pid):
+                problems.append(f"{label} was lost")
+        if reloaded.metadata[3]["name"] != "Replaced By B":
+            problems.append("B's replacement was lost")
+        if not reloaded.near_duplicates("Replaced By B", "Worker B replaced this row"):
+            problems.append("B's replacement is missing from the MinHash stage")
+
+        # 4. The worker that compacted first catches up on its next pass
+        a.compact()
+        if not a.contains(size + 2) or a.contains(2):
+            problems.append("first worker did not pick up the second worker's snapshot")
+    except Exception as e:
+        problems.append(f"{type(e).__name__}: {e}")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+    return problems
+
+def main():
+    parser = argparse.ArgumentParser(description="Compaction round-trip for every index type, mmapped and in memory.")
+    parser.add_argument("--index-types", default="flat,hnsw,ivf")
+    parser.add_argument("--size", type=int, default=2000)
+    args = parser.parse_args()
+
+    Config.EMBEDDING_CACHE_ENABLED = False
+    print("--- 🧹 COMPACTION CHECK ---")
+    failed = False
+    results = []
+    for index_type in args.index_types.split(","):
+        for mmap in (True, False):
+            for name, run in (("single", check), ("2 workers", check_two_workers)):
+                problems = run(index_type, args.size, mmap)
+                results.append((index_type, mmap, name, problems))
+                failed = failed or bool(problems)
+
+    print()
+    for index_type, mmap, name, problems in results:
+        label = f"{index_type:<5} {'mmap' if mmap else 'memory':<6} {name:<9}"
+        print(f"   {'❌' if problems else '✅'} {label} {'; '.join(problems)}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import argparse
+import sys
+import time
+import numpy as np
+from src.config import Config
+from src.encoders import make_encoder
+
+SAMPLE_TEXTS = [
+    "Smart Traffic Control System: A system that uses cameras and AI to change traffic lights based on vehicle density.",
+    "Hostel Management Portal: Room allocation, mess billing and complaint tracking for college hostels.",
+    "Crop Disease Detection: A mobile app that identifies plant diseases from leaf photos using a CNN.",
+    "Blockchain Certificate Verification: Tamper-proof academic certificates stored on a permissioned ledger.",
+    "Library Recommendation Engine: Suggests books to students based on borrowing history and course syllabus.",
+    "IoT Water Quality Monitor: Sensors report pH and turbidity of campus water tanks to a live dashboard.",
+    "Attendance via Face Recognition: Classroom camera marks attendance automatically.",
+    "Expense Splitter: A web app for roommates to track shared bills and settle debts."
+]
+
+def load_texts(args):
+    if args.corpus:
+        with open(args.corpus, encoding="utf-8") as f:
+            return [line.strip() for line in f if line.strip()][:args.limit]
+    if args.from_db:
+        from src.database import DatabaseHandler
+        rows = DatabaseHandler.fetch_projects()[:args.limit]
+        return [f"{title}: {synopsis or ''}" for _, title, synopsis in rows]
+    # Repeat the samples so throughput numbers aren't dominated by warm-up
+    return (SAMPLE_TEXTS * (args.limit // len(SAMPLE_TEXTS) + 1))[:args.limit]
+
+def throughput(encoder, texts, repeats):
+    encoder.encode(texts[:8]) # warm-up
+    started = time.perf_counter()
+    for _ in range(repeats):
+        encoder.encode(texts)
+    elapsed = time.perf_counter() - started
+    return len(texts) * repeats / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Parity + throughput of ONNX / int8 encoders vs PyTorch.")
+    parser.add_argument("--backends", default="onnx,onnx-int8")
+    parser.add_argument("--corpus", help="Text file, one proposal per line")
+    parser.add_argument("--from-db", action="store_true", help="Use titles/synopses from the projects table")
+    parser.add_argument("--limit", type=int, default=256)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--min-cosine", type=float, default=0.98, help="Fail if any text drifts below this")
+    args = parser.parse_args()
+
+    print(f"--- 🧪 ENCODER PARITY CHECK ({Config.EMBEDDING_MODEL}) ---")
+    texts = load_texts(args)
+
+    # 1. Reference embeddings
+    reference = make_encoder("torch")
+    ref_vectors = reference.encode(texts)
+    ref_vectors /= np.linalg.norm(ref_vectors, axis=1, keepdims=True)
+    ref_rate = throughput(reference, texts, args.repeats)
+    print(f"\n   torch       {ref_rate:8.1f} texts/s   (reference)")
+
+    # 2. Candidate backends
+    failed = False
+    for backend in args.backends.split(","):
+        try:
+            encoder = make_encoder(backend)
+        except ImportError as e:
+            print(f"❌ {e}. Run: pip install -r requirements.txt")
+            sys.exit(1)
+        vectors = encoder.encode(texts)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        cosine = (vectors * ref_vectors).sum(axis=1)
+
+        rate = throughput(encoder, texts, args.repeats)
+        ok = cosine.min() >= args.min_cosine
+        failed |= not ok
+        print(f"   {backend:<11} {rate:8.1f} texts/s   x{rate / ref_rate:.2f}   "
+              f"cosine min={cosine.min():.5f} mean={cosine.mean():.5f}   {'✅' if ok else '❌'}")
+
+    if failed:
+        print(f"\n❌ Drift above tolerance (min cosine < {args.min_cosine}). Keep ENCODER_BACKEND=torch.")
+        sys.exit(1)
+    print("\n✅ All backends within tolerance. Set ENCODER_BACKEND to switch "
+          "(queries should use the same backend the index was built with).")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import argparse
+import csv
+import json
+import time
+import numpy as np
+from src.config import Config
+from src.vector_engine import VectorEngine, build_faiss_index, apply_search_params
+
+def load_corpus(path):
+    """Reads (id, title, synopsis) rows from a CSV/JSONL file, or from the DB."""
+    if not path:
+        from src.database import DatabaseHandler
+        return DatabaseHandler.fetch_projects()
+
+    rows = []
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            for i, line in enumerate(f):
+                item = json.loads(line)
+                rows.append((item.get("id", i), item["title"], item.get("synopsis", "")))
+        else:
+            for i, item in enumerate(csv.DictReader(f)):
+                rows.append((item.get("id", i), item["title"], item.get("synopsis", "")))
+    return rows
+
+def timed_search(index, queries, k):
+    """Runs queries one at a time (like the API does) and returns (ids, per-query ms)."""
+    latencies = []
+    found = []
+    for q in queries:
+        started = time.perf_counter()
+        _, ids = index.search(q.reshape(1, -1), k)
+        latencies.append((time.perf_counter() - started) * 1000)
+        found.append(ids[0])
+    return np.array(found), np.array(latencies)
+
+def recall_at_k(found, truth, k):
+    hits = [len(set(f[:k]) & set(t[:k])) for f, t in zip(found, truth)]
+    return float(np.mean(hits)) / k
+
+def summarize(label, params, found, truth, latencies, k, build_seconds):
+    row = {
+        "index": label,
+        **params,
+        "recall_at_k": round(recall_at_k(found, truth, k), 4),
+        "p50_ms": round(float(np.percentile(latencies, 50)), 4),
+        "p99_ms": round(float(np.percentile(latencies, 99)), 4),
+        "build_s": round(build_seconds, 3)
+    }
+    extras = " ".join(f"{key}={value}" for key, value in params.items())
+    print(f"   {label:<5} {extras:<22} recall@{k}={row['recall_at_k']:.4f}  "
+          f"p50={row['p50_ms']:.3f}ms  p99={row['p99_ms']:.3f}ms  build={row['build_s']}s")
+    return row
+
+def main():
+    parser = argparse.ArgumentParser(description="Recall@k vs latency for flat / HNSW / IVF indexes.")
+    parser.add_argument("--corpus", help="CSV or JSONL with title,synopsis columns (default: projects table)")
+    parser.add_argument("--queries", type=int, default=200, help="Held-out proposals used as queries")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--hnsw-m", type=int, default=Config.HNSW_M)
+    parser.add_argument("--ef-search", default="16,32,64,128,256")
+    parser.add_argument("--nlist", type=int, default=Config.IVF_NLIST)
+    parser.add_argument("--nprobe", default="1,4,8,16,64")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    print("--- 📏 INDEX EVALUATION ---")
+    rows = load_corpus(args.corpus)
+    if len(rows) <= args.queries:
+        print(f"⚠️ Corpus has {len(rows)} rows; need more than --queries={args.queries}.")
+        return
+
+    # 1. Encode once, hold out the first N (shuffled) rows as queries
+    engine = VectorEngine()
+    order = np.random.default_rng(0).permutation(len(rows))
+    rows = [rows[i] for i in order]
+    print(f"⚙️  Encoding {len(rows)} texts...")
+    vectors = engine._encode([engine._text(title, synopsis) for _, title, synopsis in rows])
+    queries, corpus = vectors[:args.queries], vectors[args.queries:]
+    ids = np.arange(len(corpus), dtype='int64')
+    k = args.k
+
+    results = []
+
+    # 2. Ground truth: exact search
+    started = time.perf_counter()
+    flat = build_faiss_index("flat", corpus, ids)
+    build_seconds = time.perf_counter() - started
+    truth, latencies = timed_search(flat, queries, k)
+    print(f"\n📊 {len(corpus)} vectors, {len(queries)} queries, k={k}")
+    results.append(summarize("flat", {}, truth, truth, latencies, k, build_seconds))
+
+    # 3. HNSW sweep over efSearch
+    started = time.perf_counter()
+    hnsw = build_faiss_index("hnsw", corpus, ids, hnsw_m=args.hnsw_m)
+    build_seconds = time.perf_counter() - started
+    for ef in [int(v) for v in args.ef_search.split(",")]:
+        apply_search_params(hnsw, ef_search=ef)
+        found, latencies = timed_search(hnsw, queries, k)
+        results.append(summarize("hnsw", {"M": args.hnsw_m, "efSearch": ef}, found, truth, latencies, k, build_seconds))
+
+    # 4. IVF sweep over nprobe
+    started = time.perf_counter()
+    ivf = build_faiss_index("ivf", corpus, ids, nlist=args.nlist or None)
+    build_seconds = time.perf_counter() - started
+    nlist = ivf.nlist
+    for nprobe in [int(v) for v in args.nprobe.split(",")]:
+        if nprobe > nlist:
+            continue
+        apply_search_params(ivf, nprobe=nprobe)
+        found, latencies = timed_search(ivf, queries, k)
+        results.append(summarize("ivf", {"nlist": nlist, "nprobe": nprobe}, found, truth, latencies, k, build_seconds))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"corpus_size": len(corpus), "queries": len(queries), "k": k, "results": results}, f, indent=2)
+        print(f"\n💾 Results saved to {args.output}")
+
+    print("\n✅ Pick the cheapest setting whose recall is acceptable, then set "
+          "INDEX_TYPE / HNSW_EF_SEARCH / IVF_NPROBE and rerun run_indexer.py.")
+
+if __name__ == "__main__":
+    main()
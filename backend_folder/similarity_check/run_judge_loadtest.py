@@ -0,0 +1,62 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+import numpy as np
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput / failure behaviour of the async LLM judge against the local stub.")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8, help="Judge concurrency cap")
+    parser.add_argument("--latency", type=float, default=0.5, help="Stub mean latency (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--timeout", type=float, default=5.0)
+    parser.add_argument("--port", type=int, default=8099)
+    args = parser.parse_args()
+
+    # Point the client at the stub and keep the verdict cache out of the measurement
+    os.environ.setdefault("OPENROUTER_API_KEY", "stub")
+    os.environ["VERDICT_CACHE_ENABLED"] = "0"
+    from src.llm_judge import AsyncGeminiJudge
+    from stub_llm_server import serve
+
+    server = serve(port=args.port, latency=args.latency, error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate)
+    print(f"--- ⚖️  JUDGE LOAD TEST: {args.requests} verdicts, cap={args.concurrency}, "
+          f"stub latency={args.latency}s, 500s={args.error_rate:.0%}, 429s={args.rate_limit_rate:.0%} ---")
+
+    async def run():
+        judge = AsyncGeminiJudge(
+            base_url=f"http://127.0.0.1:{args.port}/v1", api_key="stub",
+            max_concurrency=args.concurrency, timeout=args.timeout
+        )
+        judge.cache = None
+        latencies = []
+
+        async def one(i):
+            started = time.perf_counter()
+            verdict = await judge.get_verdict(
+                {"title": f"Proposal {i}", "synopsis": "Load test synopsis."},
+                [{"id": i, "name": "Existing project", "synopsis": "Existing synopsis."}]
+            )
+            latencies.append(time.perf_counter() - started)
+            return "error" not in json.loads(verdict)
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(one(i) for i in range(args.requests)))
+        elapsed = time.perf_counter() - started
+        return judge, results, latencies, elapsed
+
+    judge, results, latencies, elapsed = asyncio.run(run())
+    server.shutdown()
+
+    ms = np.array(latencies) * 1000
+    print(f"\n   throughput : {len(results) / elapsed:.1f} verdicts/s ({elapsed:.1f}s total)")
+    print(f"   succeeded  : {sum(results)}/{len(results)}")
+    print(f"   latency    : p50={np.percentile(ms, 50):.0f}ms  p95={np.percentile(ms, 95):.0f}ms  p99={np.percentile(ms, 99):.0f}ms")
+    print(f"   judge      : {json.dumps(judge.stats()['outcomes'])}")
+    print(f"   breaker    : {json.dumps(judge.breaker.stats())}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import json
+from psycopg2.extras import execute_values
+from src.metadata_store import match_ref
+
+# Proposals encoded + searched per FAISS call; bounds memory for huge cohorts
+BATCH_SIZE = 256
+
+def screen(engine, rows, top_k=3, batch_size=BATCH_SIZE):
+    """
+    Vector-screens (submitted_project_id, title, synopsis) rows in batches.
+    A submission never counts as its own match (approved ones are indexed).
+    """
+    results = []
+    for start in range(0, len(rows), batch_size):
+        chunk = rows[start:start + batch_size]
+        # +1 so dropping a self-match still leaves top_k results
+        batch_matches = engine.search_batch([(title, synopsis) for _, title, synopsis in chunk], top_k + 1)
+
+        for (pid, _, _), matches in zip(chunk, batch_matches):
+            matches = [
+                m for m in matches
+                if not (m.get('source') == 'submitted' and m.get('id') == pid)
+            ][:top_k]
+            results.append({
+                "submitted_project_id": pid,
+                "similarity_score": float(matches[0]['similarity']) if matches else 0.0,
+                "similar_projects_id": [match_ref(m) for m in matches],
+                "similar_project_titles": [m.get('name', 'Unknown Title') for m in matches],
+                "similarity_description": describe(matches)
+            })
+        print(f"   ...screened {min(start + batch_size, len(rows))}/{len(rows)}")
+    return results
+
+def describe(matches):
+    """
+    Report for the dashboard in the same shape as the LLM verdict, so a
+    re-screen replaces any older description instead of leaving it stale.
+    """
+    return json.dumps({
+        "analysis": "Vector screening only; no LLM review was run for this result.",
+        "comparison": [
+            {
+                "match_name": m.get('name', 'Unknown Title'),
+                "similarity_note": f"{float(m['similarity']):.1f}% embedding similarity."
+            }
+            for m in matches
+        ],
+        "stage": "vector-screening"
+    })
+
+def write_results(cursor, results):
+    """Writes all screening results back with one UPDATE ... FROM (VALUES ...)."""
+    if not results:
+        return 0
+    execute_values(cursor, """
+        UPDATE submitted_projects AS sp
+        SET similarity_score = v.score,
+            similar_projects_id = v.ids::jsonb,
+            similar_project_titles = v.titles::jsonb,
+            similarity_description = v.description
+        FROM (VALUES %s) AS v (project_id, score, ids, titles, description)
+        WHERE sp.submitted_project_id = v.project_id
+    """, [
+        (
+            r['submitted_project_id'],
+            r['similarity_score'],
+            json.dumps(r['similar_projects_id']),
+            json.dumps(r['similar_project_titles']),
+            r['similarity_description']
+        )
+        for r in results
+    ], page_size=1000)
+    return len(results)
@@ -28,19 +28,74 @@ class Config:
 
     # API Config - OPENROUTER
     OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
-    OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+    OPENROUTER_BASE_URL = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
+
+    # LLM client resilience
+    LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+    LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+    LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+    LLM_RETRY_BASE_SECONDS = float(os.getenv("LLM_RETRY_BASE_SECONDS", "0.5"))
+    LLM_RETRY_MAX_SECONDS = float(os.getenv("LLM_RETRY_MAX_SECONDS", "8"))
+    LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+    LLM_BREAKER_RESET_SECONDS = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
     
     # Paths
-    DATA_DIR = os.path.join(BASE_DIR, "data")
+    # Index, metadata and caches; SIMILARITY_DATA_DIR points a disposable run elsewhere
+    DATA_DIR = os.getenv("SIMILARITY_DATA_DIR", os.path.join(BASE_DIR, "data"))
     os.makedirs(DATA_DIR, exist_ok=True) 
 
+    # Published index snapshots (index + metadata + MinHash per generation; see src/index_snapshot.py)
+    SNAPSHOT_DIR = os.path.join(DATA_DIR, "index")
+    SNAPSHOTS_KEPT = int(os.getenv("INDEX_SNAPSHOTS_KEPT", "2"))
+    # Pre-snapshot layout; only read when no snapshot has been published yet
     INDEX_PATH = os.path.join(DATA_DIR, "project_vectors.index")
-    METADATA_PATH = os.path.join(DATA_DIR, "project_metadata.pkl")
+    METADATA_PATH = os.path.join(DATA_DIR, "project_metadata.pkl")   # Legacy; converted on first load
+    METADATA_DIR = os.path.join(DATA_DIR, "project_metadata")
+    INDEX_MMAP = os.getenv("INDEX_MMAP", "1") == "1"
+
+    # Index type for the base segment: "flat" (exact), "hnsw" or "ivf" (approximate)
+    INDEX_TYPE = os.getenv("INDEX_TYPE", "flat")
+    HNSW_M = int(os.getenv("HNSW_M", "32"))
+    HNSW_EF_CONSTRUCTION = int(os.getenv("HNSW_EF_CONSTRUCTION", "200"))
+    HNSW_EF_SEARCH = int(os.getenv("HNSW_EF_SEARCH", "64"))
+    IVF_NLIST = int(os.getenv("IVF_NLIST", "0"))      # 0 = pick from corpus size
+    IVF_NPROBE = int(os.getenv("IVF_NPROBE", "8"))
+
+    # Near-duplicate pre-stage (MinHash LSH over word shingles)
+    MINHASH_ENABLED = os.getenv("MINHASH_ENABLED", "1") == "1"
+    MINHASH_PATH = os.path.join(DATA_DIR, "project_minhash.npz")   # Pre-snapshot layout
+    MINHASH_NUM_PERM = int(os.getenv("MINHASH_NUM_PERM", "128"))
+    MINHASH_BANDS = int(os.getenv("MINHASH_BANDS", "16"))
+    MINHASH_SHINGLE_SIZE = int(os.getenv("MINHASH_SHINGLE_SIZE", "3"))
+    MINHASH_MIN_SHINGLES = int(os.getenv("MINHASH_MIN_SHINGLES", "5"))   # Shorter texts skip the pre-stage
+    NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.8"))
+
+    # Live index updates: the in-memory delta segment is folded into the
+    # on-disk base when it reaches DELTA_MAX_SIZE or every COMPACT_INTERVAL_SECONDS
+    DELTA_MAX_SIZE = int(os.getenv("DELTA_MAX_SIZE", "256"))
+    COMPACT_INTERVAL_SECONDS = int(os.getenv("COMPACT_INTERVAL_SECONDS", "60"))
 
     # Models
     EMBEDDING_MODEL = 'all-MiniLM-L6-v2'
     LLM_MODEL = 'xiaomi/mimo-v2-flash:free'
 
+    # Encoder backend: "torch" (SentenceTransformer), "onnx" or "onnx-int8" (onnxruntime),
+    # or "hashing" (model-free, for offline runs and benchmarks only)
+    ENCODER_BACKEND = os.getenv("ENCODER_BACKEND", "torch")
+    ONNX_DIR = os.path.join(DATA_DIR, "onnx")
+    ONNX_THREADS = int(os.getenv("ONNX_THREADS", "0"))   # 0 = onnxruntime default
+
+    # Embedding cache (unchanged texts are never encoded twice)
+    EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "1") == "1"
+    EMBEDDING_CACHE_PATH = os.path.join(DATA_DIR, "embedding_cache.sqlite3")
+    EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "100000"))
+
+    # Verdict cache (same proposal + same evidence => reuse the LLM verdict)
+    VERDICT_CACHE_ENABLED = os.getenv("VERDICT_CACHE_ENABLED", "1") == "1"
+    VERDICT_CACHE_PATH = os.path.join(DATA_DIR, "verdict_cache.sqlite3")
+    VERDICT_CACHE_TTL_SECONDS = int(os.getenv("VERDICT_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+    VERDICT_CACHE_MAX_ENTRIES = int(os.getenv("VERDICT_CACHE_MAX_ENTRIES", "10000"))
+
 # --- DEBUG CHECK ---
 if not Config.OPENROUTER_API_KEY:
     print(f"❌ ERROR: Could not read OPENROUTER_API_KEY from {Config.ENV_PATH}")
@@ -27,3 +27,55 @@ class DatabaseHandler:
         finally:
             if conn:
                 conn.close()
+
+    @staticmethod
+    def fetch_submitted_projects(project_ids=None, only_unchecked=False):
+        """Fetches (submitted_project_id, title, synopsis) rows to screen."""
+        conn = None
+        try:
+            conn = psycopg2.connect(**Config.DB_PARAMS)
+            cur = conn.cursor()
+
+            query = "SELECT submitted_project_id, project_title, project_synopsis FROM submitted_projects WHERE TRUE"
+            params = []
+            if project_ids is not None:   # [] selects nothing, None selects everyone
+                query += " AND submitted_project_id = ANY(%s)"
+                params.append(list(project_ids))
+            if only_unchecked:
+                query += " AND similarity_score IS NULL"
+            cur.execute(query + " ORDER BY submitted_project_id", params)
+            rows = cur.fetchall()
+
+            print(f"✅ Fetched {len(rows)} submitted projects.")
+            return rows
+
+        except Exception as e:
+            print(f"❌ Database Error: {e}")
+            return []
+
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def save_screening_results(results):
+        """Bulk-writes batch screening results in one transaction."""
+        from src.batch_screening import write_results
+
+        conn = None
+        try:
+            conn = psycopg2.connect(**Config.DB_PARAMS)
+            written = write_results(conn.cursor(), results)
+            conn.commit()
+            print(f"✅ Saved {written} screening results.")
+            return written
+
+        except Exception as e:
+            print(f"❌ Database Error: {e}")
+            if conn:
+                conn.rollback()
+            return 0
+
+        finally:
+            if conn:
+                conn.close()
@@ -0,0 +1,107 @@
+import hashlib
+import sqlite3
+import threading
+import time
+import unicodedata
+import numpy as np
+
+class EmbeddingCache:
+    """
+    Disk-backed embedding cache (SQLite, float32 blobs).
+    Keys are sha256(model name + normalized text), so the same text is never
+    encoded twice by the same model. Least-recently-used rows are evicted
+    once the cache holds more than `max_entries` vectors.
+    """
+
+    def __init__(self, path, model_name, max_entries=100_000):
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key BLOB PRIMARY KEY,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings (last_used)")
+        self._conn.commit()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    @staticmethod
+    def normalize(text):
+        # Unicode + whitespace differences don't change what the proposal says
+        return " ".join(unicodedata.normalize("NFKC", text).split())
+
+    def key(self, text):
+        return hashlib.sha256(f"{self.model_name}\0{self.normalize(text)}".encode("utf-8")).digest()
+
+    def get_many(self, texts):
+        """Returns a list aligned with `texts`: a vector on hit, None on miss."""
+        keys = [self.key(t) for t in texts]
+        found = {}
+        with self._lock:
+            # SQLite caps bound parameters, so look keys up in chunks
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for key, blob in self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                ):
+                    found[key] = np.frombuffer(blob, dtype='float32')
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in found]
+                )
+                self._conn.commit()
+
+            results = [found.get(key) for key in keys]
+            hit_count = sum(v is not None for v in results)
+            self.hits += hit_count
+            self.misses += len(results) - hit_count
+        return results
+
+    def put_many(self, texts, vectors):
+        now = time.time()
+        rows = [(self.key(t), np.asarray(v, dtype='float32').tobytes(), now) for t, v in zip(texts, vectors)]
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany("INSERT OR IGNORE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)", rows)
+            self._count += self._conn.total_changes - before
+            if self._count > self.max_entries:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        # Trim to 90% so we don't evict on every insert once full
+        excess = self._count - int(self.max_entries * 0.9)
+        self._conn.execute("""
+            DELETE FROM embeddings WHERE key IN (
+                SELECT key FROM embeddings ORDER BY last_used LIMIT ?
+            )
+        """, (excess,))
+        self._count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": self._count,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
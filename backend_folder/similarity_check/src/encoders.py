@@ -0,0 +1,178 @@
+import os
+import re
+import zlib
+import numpy as np
+from src.config import Config
+
+class SentenceTransformerEncoder:
+    """Stock PyTorch SentenceTransformer (the reference implementation)."""
+
+    backend = "torch"
+
+    def __init__(self, model_name):
+        from sentence_transformers import SentenceTransformer
+        self.model_name = model_name
+        self.name = model_name
+        self.model = SentenceTransformer(model_name)
+
+    def encode(self, texts):
+        return np.array(self.model.encode(texts)).astype('float32')
+
+class OnnxEncoder:
+    """
+    The same MiniLM graph exported to ONNX and run with onnxruntime, with
+    optional dynamic int8 weight quantization. Reproduces the
+    SentenceTransformer pipeline: tokenize -> transformer -> mean pool -> L2 normalize.
+    """
+
+    def __init__(self, model_name, quantize=False, max_length=256, batch_size=64):
+        try:
+            import onnxruntime as ort
+            from transformers import AutoTokenizer
+        except ImportError as e:
+            raise ImportError(f"ONNX backend needs 'onnxruntime' and 'transformers' installed ({e})")
+
+        self.model_name = model_name
+        self.backend = "onnx-int8" if quantize else "onnx"
+        self.name = f"{model_name}@{self.backend}"
+        self.max_length = max_length
+        self.batch_size = batch_size
+
+        export_dir = os.path.join(Config.ONNX_DIR, model_name.replace("/", "__"))
+        fp32_path = os.path.join(export_dir, "model.onnx")
+        int8_path = os.path.join(export_dir, "model.int8.onnx")
+
+        if not os.path.exists(fp32_path):
+            export_onnx(model_name, export_dir)
+        if quantize and not os.path.exists(int8_path):
+            quantize_onnx(fp32_path, int8_path)
+
+        self.tokenizer = AutoTokenizer.from_pretrained(export_dir)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if Config.ONNX_THREADS:
+            options.intra_op_num_threads = Config.ONNX_THREADS
+        self.session = ort.InferenceSession(
+            int8_path if quantize else fp32_path, options, providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {i.name for i in self.session.get_inputs()}
+
+        # Output is last_hidden_state [batch, sequence, hidden]; only the first
+        # two axes are exported as dynamic, so the hidden size is a plain int.
+        # Anything else (a foreign export) is measured with one probe encode.
+        hidden = self.session.get_outputs()[0].shape[-1]
+        self.dimension = hidden if isinstance(hidden, int) else self.encode(["dimension probe"]).shape[1]
+
+    def encode(self, texts):
+        chunks = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = self.tokenizer(
+                texts[start:start + self.batch_size],
+                padding=True, truncation=True, max_length=self.max_length, return_tensors="np"
+            )
+            feeds = {k: v.astype('int64') for k, v in batch.items() if k in self._input_names}
+            token_embeddings = self.session.run(None, feeds)[0]
+
+            # Mean pooling over real (non-padding) tokens, then L2 normalize
+            mask = batch["attention_mask"][..., None].astype('float32')
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            chunks.append(pooled.astype('float32'))
+
+        return np.concatenate(chunks) if chunks else np.zeros((0, self.dimension), dtype='float32')
+
+class HashingEncoder:
+    """
+    Model-free encoder for offline runs and benchmarks: word unigrams and
+    bigrams are hashed (signed) into a fixed number of buckets, then L2
+    normalized. Deterministic across processes; no download, no torch.
+    Similar wording gives similar vectors, but there is no semantics.
+    """
+
+    backend = "hashing"
+    _TOKEN = re.compile(r"[a-z0-9]+")
+
+    def __init__(self, dimension=384):
+        self.dimension = dimension
+        self.model_name = f"hashing-{dimension}"
+        self.name = self.model_name
+        self._buckets = {}  # feature -> (bucket, sign); vocabularies are small, hashing isn't free
+
+    def _feature(self, feature):
+        cached = self._buckets.get(feature)
+        if cached is None:
+            h = zlib.crc32(feature.encode("utf-8"))
+            cached = self._buckets[feature] = (h % self.dimension, 1.0 if h & 0x80000000 else -1.0)
+        return cached
+
+    def encode(self, texts):
+        vectors = np.zeros((len(texts), self.dimension), dtype='float32')
+        for row, text in enumerate(texts):
+            words = self._TOKEN.findall(text.lower())
+            for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+                bucket, sign = self._feature(feature)
+                vectors[row, bucket] += sign
+        vectors /= np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+        return vectors
+
+def export_onnx(model_name, export_dir):
+    """Exports the SentenceTransformer's transformer module to ONNX (one-time)."""
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    print(f"📦 Exporting {model_name} to ONNX ({export_dir})...")
+    os.makedirs(export_dir, exist_ok=True)
+
+    transformer = SentenceTransformer(model_name, device="cpu")[0]
+    hf_model = transformer.auto_model.eval()
+    tokenizer = transformer.tokenizer
+    tokenizer.save_pretrained(export_dir)
+
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    dynamic = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    class _TokenEmbeddings(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, *args):
+            return self.model(**dict(zip(input_names, args))).last_hidden_state
+
+    with torch.no_grad():
+        torch.onnx.export(
+            _TokenEmbeddings(hf_model),
+            tuple(sample[name] for name in input_names),
+            os.path.join(export_dir, "model.onnx"),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic,
+            opset_version=14
+        )
+    print("✅ ONNX export complete.")
+
+def quantize_onnx(fp32_path, int8_path):
+    """Dynamic int8 quantization of the weights (activations stay float)."""
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    print(f"🗜️  Quantizing {fp32_path} to int8...")
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    print("✅ Quantization complete.")
+
+def make_encoder(backend=None, model_name=None):
+    """Builds the encoder selected by Config.ENCODER_BACKEND (torch | onnx | onnx-int8 | hashing)."""
+    backend = backend or Config.ENCODER_BACKEND
+    model_name = model_name or Config.EMBEDDING_MODEL
+
+    if backend == "torch":
+        return SentenceTransformerEncoder(model_name)
+    if backend == "onnx":
+        return OnnxEncoder(model_name)
+    if backend == "onnx-int8":
+        return OnnxEncoder(model_name, quantize=True)
+    if backend == "hashing":
+        return HashingEncoder()
+    raise ValueError(f"Unknown ENCODER_BACKEND '{backend}' (expected torch, onnx, onnx-int8 or hashing)")
@@ -0,0 +1,109 @@
+import os
+import shutil
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:     # Windows: no flock, single-process dev setups only
+    fcntl = None
+
+# Versioned on-disk index:
+#   <root>/CURRENT         name of the live snapshot
+#   <root>/<generation>/   vectors.index, metadata/, minhash.npz
+#
+# A snapshot is written in full to a hidden staging directory, fsynced and
+# renamed into place; it only becomes live when CURRENT is atomically
+# replaced. Readers resolve CURRENT once and open every file from that one
+# directory, so the index, metadata and MinHash signatures always belong to
+# the same generation, and nothing another worker has mmapped is ever
+# rewritten in place.
+
+INDEX_FILE = "vectors.index"
+METADATA_DIR = "metadata"
+MINHASH_FILE = "minhash.npz"
+POINTER = "CURRENT"
+LOCK_FILE = ".lock"
+
+def current_snapshot(root):
+    """Directory of the live snapshot, or None if nothing has been published."""
+    try:
+        with open(os.path.join(root, POINTER)) as f:
+            name = f.read().strip()
+    except FileNotFoundError:
+        return None
+    path = os.path.join(root, name)
+    return path if name and os.path.isdir(path) else None
+
+@contextmanager
+def writer_lock(root):
+    """
+    Exclusive lock for snapshot writers, across threads and worker processes
+    (flock on <root>/.lock). A writer holds it from resolving CURRENT until
+    its own snapshot is live, so nobody publishes from a stale base.
+    """
+    os.makedirs(root, exist_ok=True)
+    with open(os.path.join(root, LOCK_FILE), "a") as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+def _fsync(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def _fsync_tree(path):
+    for directory, _, files in os.walk(path):
+        for name in files:
+            _fsync(os.path.join(directory, name))
+        _fsync(directory)
+
+def publish(root, write, keep=2):
+    """
+    Calls write(directory) to fill a new snapshot, then makes it the live one.
+    Returns the published directory. Keeps the newest `keep` snapshots.
+    """
+    os.makedirs(root, exist_ok=True)
+    generation = f"{time.time_ns():020d}-{os.getpid()}"
+    staging = os.path.join(root, f".{generation}.tmp")
+    final = os.path.join(root, generation)
+
+    # 1. Write and flush the whole snapshot where no reader looks
+    os.makedirs(staging)
+    try:
+        write(staging)
+        _fsync_tree(staging)
+        os.rename(staging, final)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    _fsync(root)
+
+    # 2. Flip the pointer in one rename
+    pointer_tmp = os.path.join(root, f".{POINTER}.{os.getpid()}.tmp")
+    with open(pointer_tmp, "w") as f:
+        f.write(generation)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(pointer_tmp, os.path.join(root, POINTER))
+    _fsync(root)
+
+    _prune(root, keep, generation)
+    return final
+
+def _prune(root, keep, live):
+    # Workers that still map an older snapshot keep their open files (POSIX
+    # unlink semantics); keeping one extra generation covers readers that
+    # resolved CURRENT just before the flip.
+    generations = sorted(name for name in os.listdir(root)
+                         if not name.startswith(".") and os.path.isdir(os.path.join(root, name)))
+    for name in generations[:-keep] if keep > 0 else generations:
+        if name != live:
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
@@ -1,33 +1,31 @@
 import os
 import json
-from openai import OpenAI
+import asyncio
+import threading
+import openai
+from openai import OpenAI, AsyncOpenAI
 from src.config import Config
+from src.verdict_cache import VerdictCache
+from src.metadata_store import match_ref
+from src.resilience import CircuitBreaker, backoff_delay
+from src.telemetry import timed
 
-class GeminiJudge:
-    def __init__(self):
-        if not Config.OPENROUTER_API_KEY:
-            raise ValueError("OPENROUTER_API_KEY missing. Check src/config.py pathing.")
-        
-        self.client = OpenAI(
-            base_url=Config.OPENROUTER_BASE_URL,
-            api_key=Config.OPENROUTER_API_KEY,
-        )
-        self.model_name = Config.LLM_MODEL
+# Bump whenever the prompt below changes, so cached verdicts are not reused
+PROMPT_VERSION = "v1"
 
-    def get_verdict(self, new_project, similar_projects):
-        """Sends data to the LLM and returns a JSON string."""
-        
-        evidence_text = ""
-        for i, proj in enumerate(similar_projects):
-            evidence_text += f"\n[MATCH #{i+1}]\nTitle: {proj['name']}\nSynopsis: {proj['synopsis']}\n"
-
-        # --- UPDATED PROMPT FOR JSON OUTPUT ---
-        system_prompt = (
-            "You are an expert Project Reviewer. "
-            "Analyze the plagiarism risk and return the result strictly as a JSON object."
-        )
-        
-        user_prompt = f"""
+def build_messages(new_project, similar_projects):
+    """Builds the chat messages for one verdict."""
+    evidence_text = ""
+    for i, proj in enumerate(similar_projects):
+        evidence_text += f"\n[MATCH #{i+1}]\nTitle: {proj['name']}\nSynopsis: {proj['synopsis']}\n"
+
+    # --- UPDATED PROMPT FOR JSON OUTPUT ---
+    system_prompt = (
+        "You are an expert Project Reviewer. "
+        "Analyze the plagiarism risk and return the result strictly as a JSON object."
+    )
+
+    user_prompt = f"""
         Compare this NEW PROPOSAL against EXISTING MATCHES.
 
         === NEW PROPOSAL ===
@@ -55,23 +53,227 @@ class GeminiJudge:
         }}
         """
 
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt}
+    ]
+
+def error_verdict(message):
+    # Return a JSON error structure so the DB insert doesn't fail
+    return json.dumps({
+        "error": f"AI Check Failed: {message}",
+        "verdict": {"status": "Error", "score": 0}
+    })
+
+def is_error_verdict(text):
+    """True for error_verdict() output (the LLM call failed; nothing was judged)."""
+    try:
+        data = json.loads(text)
+    except (TypeError, ValueError):
+        return False
+    return isinstance(data, dict) and "error" in data and (data.get("verdict") or {}).get("status") == "Error"
+
+def _make_cache():
+    if not Config.VERDICT_CACHE_ENABLED:
+        return None
+    return VerdictCache(Config.VERDICT_CACHE_PATH, Config.VERDICT_CACHE_TTL_SECONDS, Config.VERDICT_CACHE_MAX_ENTRIES)
+
+def _cache_key(model_name, new_project, similar_projects):
+    return VerdictCache.key(
+        model_name, PROMPT_VERSION,
+        new_project['title'], new_project['synopsis'],
+        ["{source}:{id}".format(**match_ref(proj)) for proj in similar_projects]
+    )
+
+class GeminiJudge:
+    PROMPT_VERSION = PROMPT_VERSION
+
+    def __init__(self):
+        if not Config.OPENROUTER_API_KEY:
+            raise ValueError("OPENROUTER_API_KEY missing. Check src/config.py pathing.")
+
+        self.client = OpenAI(
+            base_url=Config.OPENROUTER_BASE_URL,
+            api_key=Config.OPENROUTER_API_KEY,
+            timeout=Config.LLM_TIMEOUT_SECONDS,
+        )
+        self.model_name = Config.LLM_MODEL
+        self.cache = _make_cache()
+
+    def get_verdict(self, new_project, similar_projects):
+        """Sends data to the LLM and returns a JSON string."""
+
+        # 0. Same proposal + same evidence => same verdict
+        cache_key = None
+        if self.cache is not None:
+            cache_key = _cache_key(self.model_name, new_project, similar_projects)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         try:
             response = self.client.chat.completions.create(
                 model=self.model_name,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
+                messages=build_messages(new_project, similar_projects),
                 response_format={"type": "json_object"}, # Hints to model to output JSON
                 extra_headers={"HTTP-Referer": "http://localhost:3000"}
             )
             content = response.choices[0].message.content
+            # Only real answers are cached; errors below are retried next time
+            if cache_key and content:
+                self.cache.put(cache_key, content)
             # Ensure it's valid JSON (or return raw if parsing fails)
             return content
-            
+
         except Exception as e:
-            # Return a JSON error structure so the DB insert doesn't fail
-            return json.dumps({
-                "error": f"AI Check Failed: {str(e)}",
-                "verdict": {"status": "Error", "score": 0}
-            })
\ No newline at end of file
+            return error_verdict(str(e))
+
+def _is_retryable(error):
+    """429s, 5xx, timeouts and dropped connections are worth another try."""
+    if isinstance(error, (asyncio.TimeoutError, openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return False
+
+def _retry_after(error):
+    response = getattr(error, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+class AsyncGeminiJudge:
+    """
+    Non-blocking judge client:
+      * at most `max_concurrency` calls in flight
+      * per-attempt timeout
+      * jittered exponential retries on 429 / 5xx / timeouts
+      * circuit breaker that fails fast while the provider is unhealthy
+    """
+
+    PROMPT_VERSION = PROMPT_VERSION
+
+    def __init__(self, base_url=None, api_key=None, max_concurrency=None, timeout=None, max_retries=None):
+        api_key = api_key or Config.OPENROUTER_API_KEY
+        if not api_key:
+            raise ValueError("OPENROUTER_API_KEY missing. Check src/config.py pathing.")
+
+        self.timeout = timeout or Config.LLM_TIMEOUT_SECONDS
+        self.max_retries = Config.LLM_MAX_RETRIES if max_retries is None else max_retries
+        # Retries are ours (jittered, breaker-aware), not the SDK's
+        self.client = AsyncOpenAI(
+            base_url=base_url or Config.OPENROUTER_BASE_URL,
+            api_key=api_key,
+            timeout=self.timeout,
+            max_retries=0,
+        )
+        self.model_name = Config.LLM_MODEL
+        self.cache = _make_cache()
+        self.breaker = CircuitBreaker(Config.LLM_BREAKER_FAILURES, Config.LLM_BREAKER_RESET_SECONDS)
+        self._semaphore = asyncio.Semaphore(max_concurrency or Config.LLM_MAX_CONCURRENCY)
+        self.outcomes = {"ok": 0, "cached": 0, "error": 0, "retried": 0, "short_circuited": 0}
+
+    async def get_verdict(self, new_project, similar_projects):
+        """Returns the verdict JSON string (an error verdict on failure, never raises)."""
+        cache_key = None
+        if self.cache is not None:
+            cache_key = _cache_key(self.model_name, new_project, similar_projects)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.outcomes["cached"] += 1
+                return cached
+
+        messages = build_messages(new_project, similar_projects)
+
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                ticket = self.breaker.acquire()
+                if ticket is None:
+                    self.outcomes["short_circuited"] += 1
+                    return error_verdict("LLM provider unavailable (circuit open)")
+
+                try:
+                    try:
+                        with timed("llm_call"):
+                            response = await asyncio.wait_for(
+                                self.client.chat.completions.create(
+                                    model=self.model_name,
+                                    messages=messages,
+                                    response_format={"type": "json_object"},
+                                    extra_headers={"HTTP-Referer": "http://localhost:3000"}
+                                ),
+                                self.timeout
+                            )
+                    except Exception as e:
+                        if not _is_retryable(e):
+                            # Our request was bad; the provider itself answered and is fine
+                            self.breaker.record_success()
+                            self.outcomes["error"] += 1
+                            return error_verdict(str(e) or type(e).__name__)
+
+                        self.breaker.record_failure()
+                        if attempt == self.max_retries:
+                            self.outcomes["error"] += 1
+                            return error_verdict(str(e) or type(e).__name__)
+
+                        self.outcomes["retried"] += 1
+                        delay = backoff_delay(
+                            attempt, Config.LLM_RETRY_BASE_SECONDS, Config.LLM_RETRY_MAX_SECONDS, _retry_after(e)
+                        )
+                    else:
+                        self.breaker.record_success()
+                        try:
+                            content = response.choices[0].message.content
+                        except (AttributeError, IndexError, TypeError):
+                            content = None
+                        if not content:
+                            self.outcomes["error"] += 1
+                            return error_verdict("Empty or malformed LLM response")
+
+                        self.outcomes["ok"] += 1
+                        if cache_key:
+                            self.cache.put(cache_key, content)
+                        return content
+                finally:
+                    # Cancellation (or anything unclassified) must not leave the probe claimed
+                    self.breaker.release(ticket)
+
+                await asyncio.sleep(delay)
+
+    def stats(self):
+        return {
+            "outcomes": dict(self.outcomes),
+            "breaker": self.breaker.stats(),
+            "cache": self.cache.stats() if self.cache else None
+        }
+
+class BackgroundJudge:
+    """
+    Runs an AsyncGeminiJudge on its own event loop thread and exposes the
+    same blocking get_verdict() as GeminiJudge. Every caller thread shares
+    one concurrency cap and one circuit breaker.
+    """
+
+    def __init__(self, judge=None):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="llm-judge-loop", daemon=True)
+        self._thread.start()
+        # Build the client on the loop so its semaphore/http pool belong to it
+        self.judge = judge or asyncio.run_coroutine_threadsafe(self._create(), self._loop).result()
+        self.model_name = self.judge.model_name
+
+    @staticmethod
+    async def _create():
+        return AsyncGeminiJudge()
+
+    def get_verdict(self, new_project, similar_projects):
+        future = asyncio.run_coroutine_threadsafe(self.judge.get_verdict(new_project, similar_projects), self._loop)
+        return future.result()
+
+    def stats(self):
+        return self.judge.stats()
+
+    def close(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
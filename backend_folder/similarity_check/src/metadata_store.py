@@ -0,0 +1,119 @@
+import json
+import mmap
+import os
+import numpy as np
+
+def match_ref(entry):
+    """
+    {"source", "id"} of a metadata entry / match. Archive projects and
+    approved submissions share the index, and their own ids can collide,
+    so an id is only meaningful together with its source.
+    """
+    return {"source": entry.get("source", "archive"), "id": entry.get("id")}
+
+class ColumnarMetadata:
+    """
+    Read-only, memory-mapped project metadata.
+
+    On disk (one directory):
+      ids.npy                  sorted int64 vector ids
+      <column>.offsets.npy     int64 start offsets, len(ids) + 1
+      <column>.bin             utf-8 strings, back to back
+
+    Nothing is parsed at open time; a row is decoded only when it is looked
+    up, and every worker process shares the same page-cache copy.
+    """
+
+    COLUMNS = ("name", "synopsis", "extra")    # extra = JSON for optional fields (source, id override)
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.ids = np.load(os.path.join(directory, "ids.npy"), mmap_mode="r")
+        self._offsets = {}
+        self._blobs = {}
+        self._files = []
+        for column in self.COLUMNS:
+            self._offsets[column] = np.load(os.path.join(directory, f"{column}.offsets.npy"), mmap_mode="r")
+            f = open(os.path.join(directory, f"{column}.bin"), "rb")
+            self._files.append(f)
+            size = os.fstat(f.fileno()).st_size
+            # mmap can't map an empty file
+            self._blobs[column] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    @staticmethod
+    def exists(directory):
+        return os.path.exists(os.path.join(directory, "ids.npy"))
+
+    @classmethod
+    def write(cls, directory, entries):
+        """Writes an iterable of (vector_id, entry dict) pairs."""
+        os.makedirs(directory, exist_ok=True)
+        rows = sorted(entries, key=lambda item: item[0])
+
+        ids = np.array([pid for pid, _ in rows], dtype="int64")
+        columns = {column: [] for column in cls.COLUMNS}
+        for pid, entry in rows:
+            extra = {k: v for k, v in entry.items() if k not in ("name", "synopsis") and not (k == "id" and v == pid)}
+            columns["name"].append(entry.get("name") or "")
+            columns["synopsis"].append(entry.get("synopsis") or "")
+            columns["extra"].append(json.dumps(extra) if extra else "")
+
+        # Write to temp names then rename, so no column file is ever seen half
+        # written. Consistency across columns (and with the FAISS index) comes
+        # from writing each generation into its own directory (index_snapshot).
+        staged = []
+        np.save(os.path.join(directory, "ids.npy.tmp.npy"), ids)
+        staged.append(("ids.npy.tmp.npy", "ids.npy"))
+        for column, values in columns.items():
+            encoded = [v.encode("utf-8") for v in values]
+            offsets = np.zeros(len(encoded) + 1, dtype="int64")
+            if encoded:
+                offsets[1:] = np.cumsum([len(b) for b in encoded])
+            np.save(os.path.join(directory, f"{column}.offsets.tmp.npy"), offsets)
+            with open(os.path.join(directory, f"{column}.bin.tmp"), "wb") as f:
+                f.write(b"".join(encoded))
+            staged.append((f"{column}.offsets.tmp.npy", f"{column}.offsets.npy"))
+            staged.append((f"{column}.bin.tmp", f"{column}.bin"))
+
+        for tmp_name, final_name in staged:
+            os.replace(os.path.join(directory, tmp_name), os.path.join(directory, final_name))
+
+    def _row(self, pid):
+        row = int(np.searchsorted(self.ids, pid))
+        if row < len(self.ids) and self.ids[row] == pid:
+            return row
+        return None
+
+    def _read(self, column, row):
+        offsets = self._offsets[column]
+        return self._blobs[column][int(offsets[row]):int(offsets[row + 1])].decode("utf-8")
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, pid):
+        return self._row(pid) is not None
+
+    def __iter__(self):
+        return (int(pid) for pid in self.ids)
+
+    def __getitem__(self, pid):
+        row = self._row(pid)
+        if row is None:
+            raise KeyError(pid)
+        entry = {"id": int(pid), "name": self._read("name", row), "synopsis": self._read("synopsis", row)}
+        extra = self._read("extra", row)
+        if extra:
+            entry.update(json.loads(extra))
+        return entry
+
+    def items(self):
+        for pid in self:
+            yield pid, self[pid]
+
+    def close(self):
+        for blob in self._blobs.values():
+            if isinstance(blob, mmap.mmap):
+                blob.close()
+        for f in self._files:
+            f.close()
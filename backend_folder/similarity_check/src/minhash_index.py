@@ -0,0 +1,142 @@
+import os
+import re
+import zlib
+from collections import defaultdict
+import numpy as np
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_WORD = re.compile(r"[a-z0-9]+")
+
+class MinHashIndex:
+    """
+    Word-shingle MinHash signatures with LSH banding, for catching verbatim
+    or lightly edited copies before any model or LLM call.
+
+    With `bands` x `rows` = `num_perm`, a pair with Jaccard similarity s
+    becomes a candidate with probability 1 - (1 - s^rows)^bands
+    (~0.7 is the 50% point for 16 x 8). Candidates are then scored by the
+    signature-estimated Jaccard.
+
+    Texts with fewer than `min_shingles` shingles (blank, a couple of words,
+    symbols only) get no signature: they are neither indexed nor queried,
+    since identical near-empty texts would all look like Jaccard-1.0 copies.
+    """
+
+    def __init__(self, num_perm=128, bands=16, shingle_size=3, seed=1, min_shingles=1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.min_shingles = max(1, min_shingles)
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, (1 << 61) - 1, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, (1 << 61) - 1, size=num_perm, dtype=np.uint64)
+
+        self.signatures = {}                                    # id -> uint32[num_perm]
+        self._buckets = [defaultdict(set) for _ in range(bands)]
+
+    # --------------------------
+    # SIGNATURES
+    # --------------------------
+
+    def shingles(self, text):
+        words = _WORD.findall(text.lower())
+        if len(words) < self.shingle_size:
+            return {" ".join(words)} if words else set()
+        return {" ".join(words[i:i + self.shingle_size]) for i in range(len(words) - self.shingle_size + 1)}
+
+    def signature(self, text):
+        """uint32[num_perm], or None if the text is too short to judge."""
+        shingles = self.shingles(text)
+        if len(shingles) < self.min_shingles:
+            return None
+        hashes = np.array([zlib.crc32(s.encode("utf-8")) for s in shingles], dtype=np.uint64)
+        # (a*x + b) mod p for every permutation x shingle, min over shingles
+        with np.errstate(over="ignore"):
+            permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def _band_keys(self, signature):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    # --------------------------
+    # MUTATIONS
+    # --------------------------
+
+    def upsert(self, pid, text):
+        self.delete(pid)
+        signature = self.signature(text)
+        if signature is None:
+            return
+        self.signatures[pid] = signature
+        for band, key in self._band_keys(signature):
+            self._buckets[band][key].add(pid)
+
+    def delete(self, pid):
+        signature = self.signatures.pop(pid, None)
+        if signature is None:
+            return False
+        for band, key in self._band_keys(signature):
+            bucket = self._buckets[band].get(key)
+            if bucket is not None:
+                bucket.discard(pid)
+                if not bucket:
+                    del self._buckets[band][key]
+        return True
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def __contains__(self, pid):
+        return pid in self.signatures
+
+    # --------------------------
+    # QUERY
+    # --------------------------
+
+    def query(self, text, threshold=0.8):
+        """Returns [(id, estimated_jaccard)] at or above `threshold`, best first."""
+        signature = self.signature(text)
+        if signature is None:
+            return []
+        candidates = set()
+        for band, key in self._band_keys(signature):
+            candidates.update(self._buckets[band].get(key, ()))
+
+        results = []
+        for pid in candidates:
+            jaccard = float(np.mean(self.signatures[pid] == signature))
+            if jaccard >= threshold:
+                results.append((pid, jaccard))
+        results.sort(key=lambda r: -r[1])
+        return results
+
+    # --------------------------
+    # PERSISTENCE
+    # --------------------------
+
+    def save(self, path):
+        ids = np.array(list(self.signatures), dtype=np.int64)
+        matrix = np.stack([self.signatures[pid] for pid in ids.tolist()]) if len(ids) else np.zeros((0, self.num_perm), dtype=np.uint32)
+        tmp_path = path + ".tmp.npz"
+        np.savez(tmp_path, ids=ids, signatures=matrix, params=np.array([self.num_perm, self.bands, self.shingle_size]))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, min_shingles=1):
+        data = np.load(path)
+        num_perm, bands, shingle_size = (int(v) for v in data["params"])
+        index = cls(num_perm, bands, shingle_size, min_shingles=min_shingles)
+        for pid, signature in zip(data["ids"].tolist(), data["signatures"]):
+            # Saved before empty texts were skipped: all-max signatures carry no information
+            if (signature == _MAX_HASH).all():
+                continue
+            index.signatures[pid] = signature
+            for band, key in index._band_keys(signature):
+                index._buckets[band][key].add(pid)
+        return index
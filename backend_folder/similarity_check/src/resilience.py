@@ -0,0 +1,79 @@
+import random
+import threading
+import time
+
+class CircuitOpenError(Exception):
+    pass
+
+class CircuitBreaker:
+    """
+    Classic three-state breaker.
+      closed    - calls flow; `failure_threshold` consecutive failures open it
+      open      - calls fail fast for `reset_timeout` seconds
+      half-open - one probe call is let through; success closes, failure re-opens
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        "call" or "probe" if a call may go out now, None if it must fail fast.
+        A probe must end in record_success/record_failure; release() it in a
+        finally so a cancelled or unclassified probe can't wedge the breaker.
+        """
+        with self._lock:
+            if self.state == "closed":
+                return "call"
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = "half-open"
+                self._probe_in_flight = False
+            if self.state == "half-open" and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return "probe"
+            return None
+
+    def allow(self):
+        """True if a call may go out now."""
+        return self.acquire() is not None
+
+    def release(self, ticket):
+        """Frees a probe that ended without a verdict on the provider's health."""
+        if ticket != "probe":
+            return
+        with self._lock:
+            if self.state == "half-open":
+                self._probe_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half-open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.times_opened += 1
+                self.state = "open"
+                self.opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def stats(self):
+        with self._lock:
+            return {"state": self.state, "consecutive_failures": self.failures, "times_opened": self.times_opened}
+
+def backoff_delay(attempt, base=0.5, cap=8.0, retry_after=None):
+    """Exponential backoff with full jitter; honours a server Retry-After if given."""
+    if retry_after is not None:
+        return min(cap, retry_after) + random.uniform(0, base)
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
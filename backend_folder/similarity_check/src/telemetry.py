@@ -0,0 +1,26 @@
+import threading
+import time
+from contextlib import contextmanager
+
+# Optional observer for stage timings. The API installs one that feeds its
+# /metrics endpoint; scripts run without it and only pay a None check.
+_observer = None
+_lock = threading.Lock()
+
+def set_observer(observer):
+    """observer(stage, seconds) is called after every timed() block. None disables timing."""
+    global _observer
+    with _lock:
+        _observer = observer
+
+@contextmanager
+def timed(stage):
+    observer = _observer
+    if observer is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observer(stage, time.perf_counter() - start)
@@ -1,20 +1,151 @@
 import os
 import pickle
+import threading
 import faiss
 import numpy as np
-from sentence_transformers import SentenceTransformer
 from src.config import Config
+from src.encoders import make_encoder
+from src.embedding_cache import EmbeddingCache
+from src.metadata_store import ColumnarMetadata
+from src.minhash_index import MinHashIndex
+from src.index_snapshot import current_snapshot, publish, writer_lock, INDEX_FILE, METADATA_DIR, MINHASH_FILE
+from src.telemetry import timed
+
+# --------------------------
+# INDEX FACTORY
+# --------------------------
+
+def _auto_nlist(n):
+    # ~4*sqrt(N) lists, but keep >= 39 training points per list
+    return max(1, min(int(4 * np.sqrt(n)), n // 39))
+
+def build_faiss_index(index_type, vectors, ids, hnsw_m=None, ef_construction=None, nlist=None):
+    """Builds an ID-addressable base index of the given type over `vectors`."""
+    dimension = vectors.shape[1]
+    ids = np.asarray(ids, dtype='int64')
+
+    if index_type == "flat":
+        index = faiss.IndexIDMap2(faiss.IndexFlatL2(dimension))
+    elif index_type == "hnsw":
+        hnsw = faiss.IndexHNSWFlat(dimension, hnsw_m or Config.HNSW_M)
+        hnsw.hnsw.efConstruction = ef_construction or Config.HNSW_EF_CONSTRUCTION
+        index = faiss.IndexIDMap2(hnsw)
+    elif index_type == "ivf":
+        nlist = nlist or Config.IVF_NLIST or _auto_nlist(len(vectors))
+        quantizer = faiss.IndexFlatL2(dimension)
+        index = faiss.IndexIVFFlat(quantizer, dimension, nlist)
+        index.train(vectors)
+    else:
+        raise ValueError(f"Unknown INDEX_TYPE '{index_type}' (expected flat, hnsw or ivf)")
+
+    if len(vectors):
+        index.add_with_ids(vectors, ids)
+    return index
+
+def index_type_of(index):
+    """Reports which of our index types a (possibly ID-mapped) FAISS index is."""
+    inner = faiss.downcast_index(index.index) if isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2)) else index
+    if isinstance(inner, faiss.IndexHNSW):
+        return "hnsw"
+    if isinstance(inner, faiss.IndexIVF):
+        return "ivf"
+    return "flat"
+
+def apply_search_params(index, ef_search=None, nprobe=None):
+    """Sets query-time knobs (efSearch for HNSW, nprobe for IVF)."""
+    kind = index_type_of(index)
+    if kind == "hnsw":
+        faiss.downcast_index(index.index).hnsw.efSearch = ef_search or Config.HNSW_EF_SEARCH
+    elif kind == "ivf":
+        faiss.extract_index_ivf(index).nprobe = nprobe or Config.IVF_NPROBE
 
 class VectorEngine:
-    def __init__(self):
+    """
+    Two-segment vector index:
+      * base  - ID-mapped FAISS index persisted to disk as a versioned snapshot
+                together with its metadata and MinHash signatures (built by run_indexer.py)
+      * delta - small in-memory segment holding recent adds/upserts
+    Deleted or superseded base entries are hidden by tombstones until
+    compact() folds the delta into the base and saves it.
+
+    Every API worker process has its own delta. Publishing is single-writer
+    (index_snapshot.writer_lock), and a worker first replays its pending
+    changes onto whatever another worker published meanwhile, so concurrent
+    compactions never drop each other's upserts or deletes.
+    """
+
+    def __init__(self, index_type=None, encoder_backend=None):
         # Create data directory if it doesn't exist
         if not os.path.exists(Config.DATA_DIR):
             os.makedirs(Config.DATA_DIR)
 
-        print(f"🧠 Loading Embedding Model ({Config.EMBEDDING_MODEL})...")
-        self.model = SentenceTransformer(Config.EMBEDDING_MODEL)
-        self.index = None
-        self.metadata = []
+        self.encoder = make_encoder(encoder_backend)
+        print(f"🧠 Loaded Embedding Model ({self.encoder.name})")
+        self.cache = None
+        if Config.EMBEDDING_CACHE_ENABLED:
+            # Keyed by encoder name, so ONNX/int8 vectors never mix with PyTorch ones
+            self.cache = EmbeddingCache(
+                Config.EMBEDDING_CACHE_PATH, self.encoder.name, Config.EMBEDDING_CACHE_MAX_ENTRIES
+            )
+        self.index_type = index_type or Config.INDEX_TYPE
+        self.minhash = self._new_minhash() if Config.MINHASH_ENABLED else None
+        self.index = None           # Base segment
+        self.metadata = {}          # id -> {"id", "name", "synopsis"} for the base segment (ColumnarMetadata once saved/loaded)
+        self._base_mmapped = False
+        self._base_path = None      # File the base was read from (re-read privately before compaction)
+        self._snapshot = None       # Snapshot directory the base belongs to (None = pre-snapshot files)
+        self.dimension = None
+
+        self.delta = None           # Delta segment
+        self.delta_vectors = {}     # id -> vector (kept so compaction never re-encodes)
+        self.delta_metadata = {}
+        self.tombstones = set()     # Base ids that were deleted or replaced
+
+        self._lock = threading.RLock()
+        self._compactor = None
+        self._stop_compactor = threading.Event()
+
+    # --------------------------
+    # HELPERS
+    # --------------------------
+
+    @staticmethod
+    def _text(title, synopsis):
+        return f"{title}: {synopsis if synopsis else ''}"
+
+    def _encode(self, texts):
+        if self.cache is None:
+            with timed("encode"):
+                return self.encoder.encode(texts)
+
+        # 1. Look everything up; only encode (unique) misses in one model call
+        with timed("embedding_cache"):
+            vectors = self.cache.get_many(texts)
+        missing = list(dict.fromkeys(t for t, v in zip(texts, vectors) if v is None))
+        if missing:
+            with timed("encode"):
+                encoded = self.encoder.encode(missing)
+            self.cache.put_many(missing, encoded)
+            fresh = dict(zip(missing, encoded))
+            vectors = [fresh[t] if v is None else v for t, v in zip(texts, vectors)]
+
+        return np.stack(vectors).astype('float32')
+
+    @staticmethod
+    def _new_minhash():
+        return MinHashIndex(Config.MINHASH_NUM_PERM, Config.MINHASH_BANDS, Config.MINHASH_SHINGLE_SIZE,
+                            min_shingles=Config.MINHASH_MIN_SHINGLES)
+
+    def _reset_delta(self):
+        # The delta stays small, so it is always an exact flat index
+        self.delta = faiss.IndexIDMap2(faiss.IndexFlatL2(self.dimension))
+        self.delta_vectors = {}
+        self.delta_metadata = {}
+        self.tombstones = set()
+
+    # --------------------------
+    # BUILD / SAVE / LOAD
+    # --------------------------
 
     def build_index(self, db_rows):
         """Creates vectors from DB rows and saves them."""
@@ -24,75 +155,428 @@ class VectorEngine:
 
         print("⚙️  Vectorizing projects...")
         texts = []
-        self.metadata = []
+        ids = []
+        metadata = {}
 
         for pid, title, synopsis in db_rows:
             clean_synopsis = synopsis if synopsis else ""
-            full_text = f"{title}: {clean_synopsis}"
-            
-            texts.append(full_text)
-            self.metadata.append({
-                "id": pid, 
-                "name": title, 
+            texts.append(self._text(title, clean_synopsis))
+            ids.append(pid)
+            metadata[pid] = {
+                "id": pid,
+                "name": title,
                 "synopsis": clean_synopsis
-            })
+            }
 
         # Generate Embeddings
-        embeddings = self.model.encode(texts)
-        embeddings = np.array(embeddings).astype('float32')
-        
-        # Build FAISS Index
-        dimension = embeddings.shape[1]
-        self.index = faiss.IndexFlatL2(dimension)
-        self.index.add(embeddings)
-
-        # Save to disk
-        self._save()
-
-    def _save(self):
-        """Internal method to save index and metadata."""
-        print(f"💾 Saving index to {Config.DATA_DIR}...")
-        faiss.write_index(self.index, Config.INDEX_PATH)
-        with open(Config.METADATA_PATH, "wb") as f:
-            pickle.dump(self.metadata, f)
-        print("✅ Index saved successfully.")
+        embeddings = self._encode(texts)
+
+        # Near-duplicate signatures, built alongside the FAISS index
+        minhash = None
+        if self.minhash is not None:
+            minhash = self._new_minhash()
+            for pid, text in zip(ids, texts):
+                minhash.upsert(pid, text)
+
+        # Build FAISS Index (file lock first, then the engine lock, as in compact())
+        with writer_lock(Config.SNAPSHOT_DIR), self._lock:
+            print(f"🏗️  Building '{self.index_type}' index over {len(ids)} vectors...")
+            self.dimension = embeddings.shape[1]
+            self.index = build_faiss_index(self.index_type, embeddings, ids)
+            apply_search_params(self.index)
+            self.minhash = minhash
+            self._reset_delta()
+
+            # Save to disk, then serve metadata from the memory-mapped copy
+            self._save(metadata.items())
+
+    def _save(self, entries):
+        """Publishes index, metadata and MinHash as one new snapshot; (re)opens the metadata store."""
+        print(f"💾 Saving index to {Config.SNAPSHOT_DIR}...")
+        snapshot = self._publish(self.index, entries, self.minhash)
+        self._snapshot = snapshot
+        self._base_path = os.path.join(snapshot, INDEX_FILE)
+        self._swap_metadata(ColumnarMetadata(os.path.join(snapshot, METADATA_DIR)))
+        print(f"✅ Index saved successfully ({os.path.basename(snapshot)}).")
+
+    @staticmethod
+    def _publish(index, entries, minhash):
+        # Never written in place: workers may have the live snapshot mmapped
+        def write(directory):
+            faiss.write_index(index, os.path.join(directory, INDEX_FILE))
+            ColumnarMetadata.write(os.path.join(directory, METADATA_DIR), entries)
+            if minhash is not None:
+                minhash.save(os.path.join(directory, MINHASH_FILE))
+        return publish(Config.SNAPSHOT_DIR, write, keep=Config.SNAPSHOTS_KEPT)
+
+    def _swap_metadata(self, store):
+        old = self.metadata
+        self.metadata = store
+        if isinstance(old, ColumnarMetadata):
+            old.close()
 
     def load_index(self):
-        """Loads the index from disk."""
-        if os.path.exists(Config.INDEX_PATH) and os.path.exists(Config.METADATA_PATH):
-            self.index = faiss.read_index(Config.INDEX_PATH)
-            with open(Config.METADATA_PATH, "rb") as f:
-                self.metadata = pickle.load(f)
+        """Loads the live snapshot (memory-mapped when possible); falls back to the pre-snapshot files."""
+        snapshot = current_snapshot(Config.SNAPSHOT_DIR)
+        if snapshot:
+            # Everything from one directory, so all parts are the same generation
+            index = self._read_base(os.path.join(snapshot, INDEX_FILE))
+            metadata = ColumnarMetadata(os.path.join(snapshot, METADATA_DIR))
+            minhash_path = os.path.join(snapshot, MINHASH_FILE)
+        elif not os.path.exists(Config.INDEX_PATH):
+            return False
+        elif ColumnarMetadata.exists(Config.METADATA_DIR):
+            index = self._read_base(Config.INDEX_PATH)
+            metadata = ColumnarMetadata(Config.METADATA_DIR)
+            minhash_path = Config.MINHASH_PATH
+        elif os.path.exists(Config.METADATA_PATH):
+            snapshot, index, metadata = self._migrate_pickle()
+            minhash_path = os.path.join(snapshot, MINHASH_FILE)
+        else:
+            return False
+
+        apply_search_params(index)
+        minhash = self._load_minhash(metadata, minhash_path) if self.minhash is not None else None
+
+        with self._lock:
+            self._snapshot = snapshot
+            self.index = index
+            self.index_type = index_type_of(index)
+            self._swap_metadata(metadata)
+            self.minhash = minhash
+            self.dimension = index.d
+            self._reset_delta()
+        return True
+
+    def _load_minhash(self, metadata, path):
+        if os.path.exists(path):
+            return MinHashIndex.load(path, min_shingles=Config.MINHASH_MIN_SHINGLES)
+
+        # Index built before the MinHash stage existed (or with it disabled):
+        # derive it from the metadata; the next compaction persists it.
+        print("🔁 Building MinHash signatures from existing metadata...")
+        minhash = self._new_minhash()
+        for pid, entry in metadata.items():
+            minhash.upsert(pid, self._text(entry['name'], entry['synopsis']))
+        return minhash
+
+    def _read_base(self, path):
+        self._base_path = path
+        if Config.INDEX_MMAP:
+            try:
+                # Pages are shared between worker processes via the page cache
+                index = faiss.read_index(path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+                self._base_mmapped = True
+                return index
+            except RuntimeError as e:
+                print(f"⚠️ mmap load not supported for this index ({e}); reading into memory.")
+        self._base_mmapped = False
+        return faiss.read_index(path)
+
+    def _migrate_pickle(self):
+        """One-time conversion of the old pickled metadata into a published snapshot."""
+        print("🔁 Converting pickled metadata to the columnar store...")
+        index = faiss.read_index(Config.INDEX_PATH)
+        with open(Config.METADATA_PATH, "rb") as f:
+            metadata = pickle.load(f)
+
+        # Older indexes were a plain IndexFlatL2 addressed by list position
+        if isinstance(metadata, list):
+            index, metadata = self._migrate_positional(index, metadata)
+
+        snapshot = self._publish(index, metadata.items(), None)
+        self._base_path = os.path.join(snapshot, INDEX_FILE)
+        self._base_mmapped = False
+        return snapshot, index, ColumnarMetadata(os.path.join(snapshot, METADATA_DIR))
+
+    def _migrate_positional(self, flat_index, rows):
+        print("🔁 Converting positional index to an ID-mapped index...")
+        vectors = flat_index.reconstruct_n(0, flat_index.ntotal)
+        ids = np.array([row['id'] for row in rows], dtype='int64')
+        index = build_faiss_index("flat", vectors, ids)
+        return index, {row['id']: row for row in rows}
+
+    # --------------------------
+    # MUTATIONS
+    # --------------------------
+
+    def contains(self, pid):
+        with self._lock:
+            return pid in self.delta_metadata or (pid in self.metadata and pid not in self.tombstones)
+
+    def live_ids(self, start=0):
+        """Searchable vector ids >= start, across both segments."""
+        with self._lock:
+            if isinstance(self.metadata, ColumnarMetadata):
+                ids = self.metadata.ids
+                base = (int(pid) for pid in ids[int(np.searchsorted(ids, start)):])
+            else:
+                base = (pid for pid in self.metadata if pid >= start)
+            live = [pid for pid in base if pid not in self.tombstones]
+            live.extend(pid for pid in self.delta_metadata if pid >= start)
+            return live
+
+    def size(self):
+        """Number of live (searchable) vectors across both segments."""
+        with self._lock:
+            return len(self.metadata) - len(self.tombstones) + len(self.delta_metadata)
+
+    def _remove(self, pid):
+        if self.minhash is not None:
+            self.minhash.delete(pid)
+        if pid in self.delta_metadata:
+            self.delta.remove_ids(np.array([pid], dtype='int64'))
+            del self.delta_vectors[pid]
+            del self.delta_metadata[pid]
+            return True
+        if pid in self.metadata and pid not in self.tombstones:
+            self.tombstones.add(pid)
             return True
         return False
 
-    def search(self, title, synopsis, top_k=3):
-        """Searches for similar projects."""
+    def upsert_many(self, rows, extras=None):
+        """Adds or replaces (pid, title, synopsis) rows. Searchable immediately."""
+        if not rows:
+            return
+        if self.index is None:
+            raise FileNotFoundError("Index not loaded. Run indexer first.")
+
+        # Encode outside the lock; searches keep running meanwhile
+        embeddings = self._encode([self._text(title, synopsis) for _, title, synopsis in rows])
+
+        with self._lock:
+            for i, (pid, title, synopsis) in enumerate(rows):
+                self._remove(pid)
+                entry = {"id": pid, "name": title, "synopsis": synopsis if synopsis else ""}
+                if extras:
+                    entry.update(extras[i])
+                self.delta.add_with_ids(embeddings[i:i + 1], np.array([pid], dtype='int64'))
+                self.delta_vectors[pid] = embeddings[i]
+                self.delta_metadata[pid] = entry
+                if self.minhash is not None:
+                    self.minhash.upsert(pid, self._text(title, synopsis))
+            full = len(self.delta_metadata) >= Config.DELTA_MAX_SIZE
+
+        # Outside the engine lock: compact() takes the snapshot file lock first
+        if full:
+            self.compact()
+
+    def upsert(self, pid, title, synopsis, extra=None):
+        self.upsert_many([(pid, title, synopsis)], [extra] if extra else None)
+
+    def add(self, pid, title, synopsis, extra=None):
+        if self.contains(pid):
+            raise ValueError(f"Project {pid} is already indexed")
+        self.upsert(pid, title, synopsis, extra)
+
+    def delete(self, pid):
+        """Removes a project. Returns False if it wasn't indexed."""
+        with self._lock:
+            return self._remove(pid)
+
+    def delete_many(self, pids):
+        """Removes several projects under one lock. Returns how many were indexed."""
+        with self._lock:
+            return sum(self._remove(pid) for pid in pids)
+
+    # --------------------------
+    # COMPACTION
+    # --------------------------
+
+    def compact(self):
+        """
+        Folds the delta segment and tombstones into the base and saves it.
+        Also picks up snapshots other workers published, even with nothing
+        of its own to fold in. Returns True if a snapshot was published.
+        """
+        # Lock order: snapshot file lock, then the engine lock (searches keep
+        # running while another worker is publishing)
+        with writer_lock(Config.SNAPSHOT_DIR), self._lock:
+            live = current_snapshot(Config.SNAPSHOT_DIR)
+            if live and live != self._snapshot:
+                self._rebase(live)
+
+            if not self.delta_metadata and not self.tombstones:
+                return False
+
+            print(f"🧹 Compacting index (+{len(self.delta_metadata)} / -{len(self.tombstones)})...")
+            if self._base_mmapped:
+                # Never mutate the shared read-only mapping; work on a private copy.
+                # Re-read instead of clone_index: mmapped IVF lists (OnDiskInvertedLists) can't be cloned.
+                self.index = faiss.read_index(self._base_path)
+                apply_search_params(self.index)
+                self._base_mmapped = False
+
+            if self.index_type == "hnsw" and self.tombstones:
+                # HNSW graphs can't drop nodes; rebuild from the stored vectors
+                self._rebuild_base()
+            else:
+                if self.tombstones:
+                    self.index.remove_ids(np.array(sorted(self.tombstones), dtype='int64'))
+                if self.delta_metadata:
+                    ids = list(self.delta_vectors)
+                    self.index.add_with_ids(
+                        np.stack([self.delta_vectors[pid] for pid in ids]),
+                        np.array(ids, dtype='int64')
+                    )
+
+            tombstones = self.tombstones
+            merged = [(pid, self.metadata[pid]) for pid in self.metadata if pid not in tombstones]
+            merged.extend(self.delta_metadata.items())
+
+            self._reset_delta()
+            self._save(merged)
+            return True
+
+    def _rebase(self, snapshot):
+        """Switches to a snapshot another worker published, keeping this worker's pending changes on top."""
+        print(f"🔄 Picking up snapshot {os.path.basename(snapshot)} published by another worker...")
+        index = self._read_base(os.path.join(snapshot, INDEX_FILE))
+        apply_search_params(index)
+        metadata = ColumnarMetadata(os.path.join(snapshot, METADATA_DIR))
+        minhash = None
+        if self.minhash is not None:
+            minhash = self._load_minhash(metadata, os.path.join(snapshot, MINHASH_FILE))
+            # Replay pending deletes, then pending upserts (a replaced id is in both)
+            for pid in self.tombstones:
+                minhash.delete(pid)
+            for pid, entry in self.delta_metadata.items():
+                minhash.upsert(pid, self._text(entry['name'], entry['synopsis']))
+
+        # Deleted or re-upserted ids must stay hidden in the new base too;
+        # ids it doesn't contain need no tombstone
+        pending = self.tombstones | set(self.delta_metadata)
+        self.tombstones = {pid for pid in pending if pid in metadata}
+
+        self.index = index
+        self.index_type = index_type_of(index)
+        self._swap_metadata(metadata)
+        self.minhash = minhash
+        self._snapshot = snapshot
+
+    def _rebuild_base(self):
+        live = [pid for pid in self.metadata if pid not in self.tombstones]
+        vectors = [self.index.reconstruct(pid) for pid in live]
+        for pid, vector in self.delta_vectors.items():
+            live.append(pid)
+            vectors.append(vector)
+        vectors = np.stack(vectors).astype('float32') if vectors else np.zeros((0, self.dimension), dtype='float32')
+        self.index = build_faiss_index(self.index_type, vectors, live)
+        apply_search_params(self.index)
+
+    def start_background_compaction(self, interval=None):
+        """Compacts every `interval` seconds on a daemon thread."""
+        if self._compactor:
+            return
+        interval = interval or Config.COMPACT_INTERVAL_SECONDS
+        self._stop_compactor.clear()
+
+        def loop():
+            while not self._stop_compactor.wait(interval):
+                try:
+                    self.compact()
+                except Exception as e:
+                    print(f"❌ Compaction failed: {e}")
+
+        self._compactor = threading.Thread(target=loop, name="vector-compactor", daemon=True)
+        self._compactor.start()
+
+    def stop_background_compaction(self):
+        self._stop_compactor.set()
+        self._compactor = None
+
+    # --------------------------
+    # SEARCH
+    # --------------------------
+
+    def near_duplicates(self, title, synopsis, threshold=None, exclude=None):
+        """
+        MinHash pre-stage: returns verbatim / lightly edited copies (estimated
+        word-shingle Jaccard >= threshold), best first. No model call.
+        `exclude` is a vector id to leave out (the proposal's own entry).
+        """
+        if self.minhash is None:
+            return []
+        threshold = Config.NEAR_DUPLICATE_THRESHOLD if threshold is None else threshold
+
+        with timed("minhash"), self._lock:
+            matches = []
+            for pid, jaccard in self.minhash.query(self._text(title, synopsis), threshold):
+                if pid == exclude:
+                    continue
+                entry = self.delta_metadata.get(pid)
+                if entry is None:
+                    entry = self.metadata[pid]
+                match = entry.copy()
+                match['jaccard'] = round(jaccard, 4)
+                match['similarity'] = round(jaccard * 100, 2)
+                matches.append(match)
+            return matches
+
+    def search(self, title, synopsis, top_k=3, exclude=None):
+        """Searches for similar projects, leaving out vector id `exclude`."""
+        return self.search_batch([(title, synopsis)], top_k, [exclude])[0]
+
+    def search_batch(self, proposals, top_k=3, exclude=None):
+        """
+        Searches many (title, synopsis) proposals at once: one encode call and
+        one FAISS search per segment over the whole query matrix.
+        `exclude` optionally gives, per proposal, a vector id that must not be
+        returned for it (e.g. an already indexed submission's own entry).
+        Returns one match list per proposal, in input order.
+        """
         if self.index is None:
             raise FileNotFoundError("Index not loaded. Run indexer first.")
+        if not proposals:
+            return []
+
+        query_vectors = self._encode([self._text(title, synopsis) for title, synopsis in proposals])
+
+        exclude = exclude or [None] * len(proposals)
+        # One spare hit per segment so dropping an excluded id still leaves top_k
+        spare = int(any(pid is not None for pid in exclude))
+
+        with timed("faiss_search"), self._lock:
+            base_hits = delta_hits = None
+
+            # 1. Base segment: over-fetch so tombstoned hits can be skipped
+            if self.index.ntotal:
+                k = min(top_k + len(self.tombstones) + spare, self.index.ntotal)
+                base_hits = self.index.search(query_vectors, k)
+
+            # 2. Delta segment
+            if self.delta.ntotal:
+                k = min(top_k + spare, self.delta.ntotal)
+                delta_hits = self.delta.search(query_vectors, k)
+
+            all_results = []
+            for row in range(len(proposals)):
+                candidates = []
+                if base_hits is not None:
+                    distances, ids = base_hits
+                    for dist, pid in zip(distances[row], ids[row].tolist()):
+                        if pid != -1 and pid != exclude[row] and pid not in self.tombstones and pid in self.metadata:
+                            candidates.append((float(dist), self.metadata[pid]))
+                if delta_hits is not None:
+                    distances, ids = delta_hits
+                    for dist, pid in zip(distances[row], ids[row].tolist()):
+                        if pid != -1 and pid != exclude[row]:
+                            candidates.append((float(dist), self.delta_metadata[pid]))
+
+                # 3. Merge (lower distance is better)
+                candidates.sort(key=lambda c: c[0])
+                all_results.append([self._to_match(entry, raw_score) for raw_score, entry in candidates[:top_k]])
+
+        return all_results
+
+    @staticmethod
+    def _to_match(entry, raw_score):
+        match = entry.copy()
+
+        # CONVERTED SCORE (0 to 100%, Higher is better)
+        # This is a simple estimation: 1.0 distance is "far", 0.0 is "exact copy"
+        similarity_percent = max(0, (1.5 - raw_score) / 1.5 * 100)
 
-        query_text = f"{title}: {synopsis}"
-        query_vector = self.model.encode([query_text])
-        query_vector = np.array(query_vector).astype('float32')
-
-        distances, indices = self.index.search(query_vector, k=top_k)
-        
-        results = []
-        for i in range(top_k):
-            idx = indices[0][i]
-            if idx != -1 and idx < len(self.metadata):
-                match = self.metadata[idx].copy()
-                
-                # RAW DISTANCE (Lower is better)
-                raw_score = float(distances[0][i])
-                
-                # CONVERTED SCORE (0 to 100%, Higher is better)
-                # This is a simple estimation: 1.0 distance is "far", 0.0 is "exact copy"
-                similarity_percent = max(0, (1.5 - raw_score) / 1.5 * 100)
-                
-                match['distance'] = raw_score
-                match['similarity'] = round(similarity_percent, 2)
-                
-                results.append(match)
-        
-        return results
\ No newline at end of file
+        match['distance'] = raw_score
+        match['similarity'] = round(similarity_percent, 2)
+        return match
@@ -0,0 +1,106 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from src.embedding_cache import EmbeddingCache
+
+class VerdictCache:
+    """
+    Persistent cache of LLM judge verdicts (SQLite).
+    A verdict is reused only when the model, prompt version, proposal text
+    and the ordered list of matched project ids are all identical.
+    Entries expire after `ttl_seconds`; least-recently-used rows are
+    evicted beyond `max_entries`.
+    """
+
+    def __init__(self, path, ttl_seconds=7 * 24 * 3600, max_entries=10_000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS verdicts (
+                key TEXT PRIMARY KEY,
+                verdict TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_verdicts_last_used ON verdicts (last_used)")
+        self._conn.commit()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM verdicts").fetchone()[0]
+
+    @staticmethod
+    def key(model, prompt_version, title, synopsis, match_ids):
+        text_hash = hashlib.sha256(EmbeddingCache.normalize(f"{title}: {synopsis}").encode("utf-8")).hexdigest()
+        evidence = ",".join(str(i) for i in match_ids)
+        return hashlib.sha256(f"{model}\0{prompt_version}\0{text_hash}\0{evidence}".encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT verdict, created_at FROM verdicts WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            verdict, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM verdicts WHERE key = ?", (key,))
+                self._conn.commit()
+                self._count -= 1
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE verdicts SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return verdict
+
+    def put(self, key, verdict):
+        now = time.time()
+        with self._lock:
+            before = self._conn.total_changes
+            existed = self._conn.execute("SELECT 1 FROM verdicts WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO verdicts (key, verdict, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, verdict, now, now)
+            )
+            if not existed and self._conn.total_changes > before:
+                self._count += 1
+            if self._count > self.max_entries:
+                self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now):
+        # Expired rows go first, then least-recently-used down to 90% of the cap
+        self._conn.execute("DELETE FROM verdicts WHERE created_at < ?", (now - self.ttl_seconds,))
+        self._count = self._conn.execute("SELECT COUNT(*) FROM verdicts").fetchone()[0]
+        excess = self._count - int(self.max_entries * 0.9)
+        if excess > 0:
+            self._conn.execute("""
+                DELETE FROM verdicts WHERE key IN (
+                    SELECT key FROM verdicts ORDER BY last_used LIMIT ?
+                )
+            """, (excess,))
+            self._count -= excess
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": self._count,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
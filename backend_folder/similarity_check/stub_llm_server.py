@@ -0,0 +1,121 @@
+"""
+Local OpenAI-compatible stand-in for OpenRouter, for offline load and
+failure testing. Point the judge at it with:
+
+    OPENROUTER_BASE_URL=http://127.0.0.1:8099/v1 OPENROUTER_API_KEY=stub
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STUB_VERDICT = {
+    "analysis": "Stub analysis generated offline.",
+    "comparison": [],
+    "verdict": {"status": "Unique", "score": 10, "reasoning": "Stub verdict."}
+}
+
+class StubSettings:
+    latency = 1.0          # mean seconds per completion
+    jitter = 0.2           # +/- uniform seconds
+    error_rate = 0.0       # fraction answered with HTTP 500
+    rate_limit_rate = 0.0  # fraction answered with HTTP 429
+    retry_after = 1        # Retry-After seconds sent with 429s
+
+_counts = {"requests": 0, "ok": 0, "500": 0, "429": 0}
+_counts_lock = threading.Lock()
+
+def _count(key):
+    with _counts_lock:
+        _counts[key] += 1
+
+class StubHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass # Keep load-test output readable
+
+    def _send(self, status, body, headers=None):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        # Counters, so harnesses can see what the judge actually sent
+        with _counts_lock:
+            self._send(200, dict(_counts))
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        _count("requests")
+
+        if not self.path.endswith("/chat/completions"):
+            self._send(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+
+        roll = random.random()
+        if roll < StubSettings.rate_limit_rate:
+            _count("429")
+            self._send(429, {"error": {"message": "Rate limited (stub)"}}, {"Retry-After": str(StubSettings.retry_after)})
+            return
+
+        time.sleep(max(0.0, StubSettings.latency + random.uniform(-StubSettings.jitter, StubSettings.jitter)))
+
+        if roll < StubSettings.rate_limit_rate + StubSettings.error_rate:
+            _count("500")
+            self._send(500, {"error": {"message": "Upstream error (stub)"}})
+            return
+
+        _count("ok")
+        self._send(200, {
+            "id": f"stub-{int(time.time() * 1000)}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": json.dumps(STUB_VERDICT)}
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        })
+
+def serve(host="127.0.0.1", port=8099, latency=1.0, jitter=0.2, error_rate=0.0, rate_limit_rate=0.0):
+    """Starts the stub on a daemon thread and returns the server (call .shutdown() to stop)."""
+    StubSettings.latency = latency
+    StubSettings.jitter = jitter
+    StubSettings.error_rate = error_rate
+    StubSettings.rate_limit_rate = rate_limit_rate
+
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="stub-llm", daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake OpenAI-compatible chat completions server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=1.0)
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    serve(args.host, args.port, args.latency, args.jitter, args.error_rate, args.rate_limit_rate)
+    print(f"🤖 Stub LLM listening on http://{args.host}:{args.port}/v1 "
+          f"(latency={args.latency}s, 500s={args.error_rate:.0%}, 429s={args.rate_limit_rate:.0%})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -139,6 +139,13 @@ const MentorDashboardSkeleton = () => {
   );
 };
 
+// similar_projects_id entries are {source, id}; archive and submission ids
+// overlap, so the source is part of the label. Older rows hold bare ids.
+const matchLabel = (ref) =>
+  ref && typeof ref === "object"
+    ? `${ref.source === "submitted" ? "Submission" : "Archive"} #${ref.id}`
+    : `ID ${ref}`;
+
 const MentorDashboard = () => {
   const [activeTab, setActiveTab] = useState("dashboard");
   const [expandedRow, setExpandedRow] = useState(null);
@@ -172,7 +179,21 @@ const MentorDashboard = () => {
         }
 
         setMentorData(data);
-        setMyTeams(data.mentored_projects || []);
+
+        // Mentored projects are paged; follow X-Next-Cursor until the last page
+        const projectsUrl = `${import.meta.env.VITE_BACKEND_BASE_URL}/mentors/${email}/projects?limit=1000`;
+        let projects = [];
+        let url = projectsUrl;
+        while (url) {
+          const projectsResponse = await fetch(url);
+          if (!projectsResponse.ok)
+            throw new Error("Failed to fetch mentored projects");
+          projects = projects.concat(await projectsResponse.json());
+          const next = projectsResponse.headers.get("X-Next-Cursor");
+          url = next ? `${projectsUrl}&after=${next}` : null;
+        }
+
+        setMyTeams(projects);
         setLoading(false);
       } catch (err) {
         console.error("Error:", err);
@@ -190,8 +211,32 @@ const MentorDashboard = () => {
     navigate("/login");
   };
 
-  const toggleRow = (id) => {
-    setExpandedRow(expandedRow === id ? null : id);
+  const toggleRow = async (id) => {
+    const opening = expandedRow !== id;
+    setExpandedRow(opening ? id : null);
+
+    // Synopsis, matches and the AI report are loaded the first time a row is opened
+    const project = myTeams.find((p) => p.submitted_project_id === id);
+    if (!opening || !project || project.details_loaded) return;
+
+    try {
+      const email =
+        localStorage.getItem("userEmail") || "kavita.patil@rvce.edu.in";
+      const response = await fetch(
+        `${import.meta.env.VITE_BACKEND_BASE_URL}/mentors/${email}/projects/${id}?fields=project_synopsis,similar_projects_id,similar_project_titles,similarity_description`
+      );
+      if (!response.ok) throw new Error("Failed to fetch project details");
+      const details = await response.json();
+      setMyTeams((teams) =>
+        teams.map((p) =>
+          p.submitted_project_id === id
+            ? { ...p, ...details, details_loaded: true }
+            : p
+        )
+      );
+    } catch (err) {
+      console.error("Error loading project details:", err);
+    }
   };
 
   // Helper: Format JSON Report
@@ -607,7 +652,7 @@ const MentorDashboard = () => {
                                                       color: "#555",
                                                     }}
                                                   >
-                                                    ID {pid}:
+                                                    {matchLabel(pid)}:
                                                   </span>{" "}
                                                   {title}
                                                 </li>
@@ -634,8 +679,12 @@ const MentorDashboard = () => {
                                   {/* ROW 3: Formatted AI Report */}
                                   <div className="detail-card full-width">
                                     <h4>🤖 AI Similarity Analysis Report</h4>
-                                    {renderSimilarityReport(
-                                      project.similarity_description
+                                    {project.details_loaded ? (
+                                      renderSimilarityReport(
+                                        project.similarity_description
+                                      )
+                                    ) : (
+                                      <p>Loading analysis...</p>
                                     )}
                                   </div>
 
@@ -14,11 +14,18 @@ const ProjectList = () => {
       try {
         const API_BASE_URL = import.meta.env.VITE_BACKEND_BASE_URL;
         console.log("API BASE URL =", API_BASE_URL);
-        const response = await fetch(`${API_BASE_URL}/projects`);
-        if (!response.ok) {
-          throw new Error("Failed to fetch projects");
+        // The API pages the archive; follow X-Next-Cursor until the last page
+        let data = [];
+        let url = `${API_BASE_URL}/projects?limit=1000`;
+        while (url) {
+          const response = await fetch(url);
+          if (!response.ok) {
+            throw new Error("Failed to fetch projects");
+          }
+          data = data.concat(await response.json());
+          const next = response.headers.get("X-Next-Cursor");
+          url = next ? `${API_BASE_URL}/projects?limit=1000&after=${next}` : null;
         }
-        const data = await response.json();
         setProjects(data);
         setLoading(false);
       } catch (err) {
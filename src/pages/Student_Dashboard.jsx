@@ -103,6 +103,16 @@ const StudentDashboard = () => {
     };
 
     fetchStudentData();
+
+    // Refetch only when the backend reports a change to this student's team/project
+    const email = localStorage.getItem("userEmail") || "rahul.rv@example.com";
+    const events = new EventSource(`${import.meta.env.VITE_BACKEND_BASE_URL}/events/${email}`);
+    events.onmessage = (message) => {
+      const event = JSON.parse(message.data);
+      if (event.type === "change" || event.type === "resync") fetchStudentData();
+    };
+
+    return () => events.close();
   }, []);
 
   // --- SIGN OUT FUNCTION ---